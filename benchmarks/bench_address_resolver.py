@@ -0,0 +1,90 @@
+"""분양공고 주소 → 법정동코드 변환 마이크로벤치마크.
+
+분양공고 로컬 저장소(announcement_store, RTMS_CACHE_PATH)에 쌓인 모든 공급위치 주소에 대해
+기존 방식(앞 2~3 토큰을 합쳐 AREA_CODE 조회)과 address_resolver.resolve_address 의
+처리 시간과 변환 성공률을 비교합니다. 저장소가 비어 있으면 오프라인 픽스처 주소와
+constants.AREA_CODE 로 만든 표기 변형(시/도 약칭, 시군구 접미사 생략 등)을 사용합니다.
+
+    python benchmarks/bench_address_resolver.py
+    RTMS_CACHE_PATH=.cache/rtms.sqlite3 python benchmarks/bench_address_resolver.py
+"""
+
+import json
+import sqlite3
+import time
+
+from offline.fixtures import ANNOUNCEMENTS
+
+from retrieval_graph.address_resolver import PROVINCE_ALIASES, resolve_address
+from retrieval_graph.constants import AREA_CODE
+from retrieval_graph.rtms_cache import cache_path
+
+REPEAT = 20
+SHORT_PROVINCE = {province: alias for alias, province in PROVINCE_ALIASES.items() if len(alias) == 2}
+
+
+def archive_addresses() -> list:
+    try:
+        conn = sqlite3.connect(f"file:{cache_path()}?mode=ro", uri=True)
+        rows = conn.execute("SELECT item FROM announcement").fetchall()
+    except sqlite3.Error:
+        return []
+    return [json.loads(item)["공급위치"] for (item,) in rows]
+
+
+def synthetic_addresses() -> list:
+    addresses = [address for _, address, _, _ in ANNOUNCEMENTS]
+    for name in AREA_CODE:
+        province, *rest = name.split()
+        short = [token[:-1] if len(token) >= 3 else token for token in rest]
+        addresses += [
+            f"{name} 중앙동 123-4번지 일원",
+            f"{SHORT_PROVINCE.get(province, province)} {' '.join(rest)} 중앙동 123",
+            f"{SHORT_PROVINCE.get(province, province)} {' '.join(short)} 중앙동 123",
+            f"{name} 중앙로 45",
+        ]
+    return addresses
+
+
+def legacy_area_code(address: str):
+    # 기존 get_apt_list 동작 (앞 2~3 토큰을 합쳐 조회)
+    area = address.split()
+    if " ".join(area[:2]) in AREA_CODE.keys():
+        return AREA_CODE.get(" ".join(area[:2]))
+    elif " ".join(area[:3]) in AREA_CODE.keys():
+        return AREA_CODE.get(" ".join(area[:3]))
+    return None
+
+
+def measure(func, addresses: list):
+    start = time.process_time()
+    for _ in range(REPEAT):
+        results = [func(address) for address in addresses]
+    return (time.process_time() - start) / REPEAT / len(addresses) * 1e6, results
+
+
+def main() -> None:
+    addresses = archive_addresses()
+    source = "announcement archive"
+    if not addresses:
+        addresses = synthetic_addresses()
+        source = "fixtures + AREA_CODE variants"
+
+    legacy_us, legacy = measure(legacy_area_code, addresses)
+    trie_us, resolved = measure(resolve_address, addresses)
+    for address, old, (new, _) in zip(addresses, legacy, resolved):
+        assert old is None or old == new, address
+
+    found_legacy = sum(code is not None for code in legacy)
+    found_trie = sum(code is not None for code, _ in resolved)
+    found_umd = sum(umd is not None for _, umd in resolved)
+    print(f"{len(addresses)} addresses ({source})")
+    print(f"  legacy (join + dict)  {legacy_us:6.2f} us/addr  시군구 {found_legacy / len(addresses):6.1%}")
+    print(
+        f"  resolver (trie)       {trie_us:6.2f} us/addr  시군구 {found_trie / len(addresses):6.1%}"
+        f"  읍면동 {found_umd / len(addresses):6.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""청약홈 분양공고 상세 페이지 파싱 마이크로벤치마크.
+
+저장된 상세 페이지(benchmarks/fixtures/applyhome_detail.html)에 대해
+기존 방식(BeautifulSoup html.parser 전체 파싱 + 셀 반복 추출)과
+<body> 부터 마지막 테이블까지만 lxml 로 파싱하는 applyhome_parser.parse_supply_detail 을 비교합니다.
+실제 페이지 크기를 흉내 내기 위해 메뉴/스크립트 마크업을 덧붙인 페이지도 함께 측정합니다.
+
+    python benchmarks/bench_applyhome_parser.py
+"""
+
+import os
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from retrieval_graph.applyhome_parser import parse_supply_detail
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "applyhome_detail.html")
+REPEAT = 50
+PADDING_BLOCKS = 400  # 약 150KB
+
+
+def load_pages():
+    with open(FIXTURE, encoding="utf-8") as f:
+        html = f.read()
+    menu = '<li><a href="/ai/aia/selectAPTLttotPblancListView.do" class="menu">APT 분양정보</a></li>' * PADDING_BLOCKS
+    script = "<script>var menuData = " + '{"id": "menu", "url": "/ai/aia/"},' * PADDING_BLOCKS + "{};</script>"
+    padded = html.replace('<div id="wrap">', f'<div id="wrap"><ul class="all_menu">{menu}</ul>{script}', 1)
+    padded = padded.replace("</body>", f'<div class="footer"><ul>{menu}</ul></div></body>', 1)
+    return {"fixture": html, "padded": padded}
+
+
+def legacy_parse(html: str) -> dict:
+    # 기존 get_apt_list 동작 (BeautifulSoup 전체 파싱, 셀 텍스트 반복 추출)
+    units = {}
+    tables = BeautifulSoup(html, "html.parser").find_all("tbody")
+    if len(tables) == 6:
+        supply_all = tables[2].find_all("tr")[:-1]
+        supply_special = tables[3].find_all("tr")
+        supply_costs = tables[4].find_all("tr")
+    else:
+        supply_all = tables[2].find_all("tr")[:-1]
+        supply_special = []
+        supply_costs = tables[3].find_all("tr")
+
+    for supply_item in supply_all:
+        supply_columns = supply_item.find_all("td")[-6:]
+        units[supply_columns[0].text.strip()] = {
+            "주택형": supply_columns[0].text.strip(),
+            "주택공급면적": supply_columns[1].text.strip(),
+            "전체 공급세대수": supply_columns[4].text.strip(),
+            "특별 공급세대수": {"전체": supply_columns[3].text.strip()},
+            "일반 공급세대수": supply_columns[2].text.strip(),
+        }
+
+    names = ["다자녀가구", "신혼부부", "생애최초", "청년", "노부모부양", "신생아(일반형)", "기관추천", "이전기관", "기타"]
+    for supply_item in supply_special:
+        supply_columns = supply_item.find_all("td")
+        for i, name in enumerate(names, 1):
+            units[supply_columns[0].text.strip()]["특별 공급세대수"][name] = supply_columns[i].text.strip()
+
+    for supply_item in supply_costs:
+        supply_columns = supply_item.find_all("td")
+        units[supply_columns[0].text.strip()]["분양가(최고가 기준)"] = f"{supply_columns[1].text.strip()} 만원"
+    return units
+
+
+def measure(func, html: str):
+    start = time.process_time()
+    for _ in range(REPEAT):
+        func(html)
+    cpu_ms = (time.process_time() - start) / REPEAT * 1000
+
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_ms, peak / 1024 / 1024
+
+
+def main() -> None:
+    for name, html in load_pages().items():
+        assert legacy_parse(html) == parse_supply_detail(html)
+
+        legacy_ms, legacy_mb = measure(legacy_parse, html)
+        lxml_ms, lxml_mb = measure(parse_supply_detail, html)
+        print(f"{name} ({len(html.encode('utf-8')) / 1024:.0f} KiB)")
+        print(f"  legacy (bs4)     {legacy_ms:8.2f} ms  peak {legacy_mb:6.2f} MiB")
+        print(f"  lxml (targeted)  {lxml_ms:8.2f} ms  peak {lxml_mb:6.2f} MiB  ({legacy_ms / lxml_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""graph_final 종단간 지연시간 벤치마크 (오프라인).
+
+외부 호출을 모두 대역으로 바꾼 상태에서 대표 대화 시나리오를 실행하고
+노드/도구별 소요시간, 외부 의존성별 호출 수와 송수신 바이트를 측정합니다.
+
+- data.go.kr / odcloud / applyhome / Perplexity: requests 카세트 재생 (offline.cassette)
+- OpenAI / Elasticsearch: 로컬 대역 서버 (offline.standin)
+- Google Calendar: FakeCalendarService
+
+    python benchmarks/bench_graph_final.py                      # 기본 카세트, 실제 지연시간
+    python benchmarks/bench_graph_final.py --latency-scale 0    # 순수 처리 시간
+    python benchmarks/bench_graph_final.py --json > base.json   # 결과 저장
+    python benchmarks/bench_graph_final.py --baseline base.json --tolerance 0.2
+    python benchmarks/bench_graph_final.py --record cassette.json  # 실제 API 응답 녹화 (키 필요)
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from offline.cassette import Cassette, CassetteAdapter, use_cassette
+from offline.fixtures import (
+    EXTERNAL_HOSTS,
+    LATENCY,
+    PERPLEXITY_TEXT,
+    POLICY_DOCUMENTS,
+    REPORT_TEXT,
+    default_cassette,
+)
+from offline.standin import FakeCalendarService, StandInServer
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    # README 흐름: 순위 판단 → 분양정보 → 시세 → 가치 분석 → 리포트 → 캘린더 등록
+    "full": {
+        "message": "신혼부부이고 무주택자야. 경기 지역 청약 정보를 알려주고 분석 리포트를 만들어 캘린더에 등록해줘.",
+        "script": [
+            {"tool": "retrieve_appropriate_rank", "args": {"queries": ["신혼부부", "무주택 세대구성원", "혼인기간 7년"]}},
+            {"tool": "get_apt_list", "args": {"city": "경기"}},
+            {"tool": "calc_avg_pyung_price", "args": {"area_code": 41220, "umd_name": "진위면"}},
+            {"tool": "query_perplexity_tool", "args": {"query": "경기도 평택시 진위면 진위역 서희스타힐스 더 파크뷰(3차)"}},
+            {"tool": "create_apartment_report_tool", "args": {
+                "complex_name": "진위역 서희스타힐스 더 파크뷰(3차)",
+                "location": "경기도 평택시 진위면 갈곶리 239-60번지 일원",
+                "total_units": 53,
+                "perplexity_result": PERPLEXITY_TEXT[:200],
+                "subscription_rank": "특별공급 - 신혼부부",
+            }},
+            {"tool": "create_event_tool", "args": {
+                "summary": "진위역 서희스타힐스 더 파크뷰(3차) 특별공급 청약",
+                "start_datetime": "2025-06-16T09:00:00",
+                "end_datetime": "2025-06-16T17:30:00",
+                "description": REPORT_TEXT[:500],
+            }},
+            {"content": "청약 순위 판단, 분양정보 조회, 시세 분석, 리포트 작성, 캘린더 등록을 완료했습니다."},
+        ],
+    },
+    "price": {
+        "message": "경기 평택시 진위면 최근 실거래가 시세를 알려줘.",
+        "script": [
+            {"tool": "calc_avg_pyung_price", "args": {"area_code": 41220, "umd_name": "진위면"}},
+            {"tool": "calc_market_stats", "args": {"area_code": 41220, "umd_name": "진위면"}},
+            {"content": "진위면 최근 3개월 평균 평당가입니다."},
+        ],
+    },
+    "rank": {
+        "message": "만 65세 부모님을 5년째 모시고 있는 무주택 세대주야. 어떤 순위로 청약할 수 있어?",
+        "script": [
+            {"tool": "retrieve_appropriate_rank", "args": {"queries": ["노부모 부양", "무주택 세대주"]}},
+            {"content": "노부모 부양 특별공급 대상입니다."},
+        ],
+    },
+}
+
+
+def configure_environment(server_url: str, cache_dir: str) -> None:
+    """retrieval_graph 를 import 하기 전에 대역 서버와 임시 캐시 경로를 지정"""
+    os.environ.update({
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "sk-offline"),
+        "OPENAI_BASE_URL": f"{server_url}/v1",
+        "OPENAI_API_BASE": f"{server_url}/v1",
+        "ELASTICSEARCH_URL": server_url,
+        "ELASTICSEARCH_API_KEY": "offline",
+        "DATA_GO_KR_SERVICE_KEY": os.environ.get("DATA_GO_KR_SERVICE_KEY", "offline"),
+        "PERPLEXITY_API_KEY": os.environ.get("PERPLEXITY_API_KEY", "offline"),
+        "RTMS_CACHE_PATH": os.path.join(cache_dir, "rtms.sqlite3"),
+    })
+
+
+def patch_offline_dependencies() -> None:
+    """네트워크가 필요한 부분(구글 인증, tiktoken 인코딩 다운로드)을 대역으로 교체"""
+    import functools
+
+    from langchain_openai import OpenAIEmbeddings
+
+    from retrieval_graph import calendar_tools, embedding_cache
+
+    calendar_tools.get_calendar_service = FakeCalendarService
+
+    try:
+        import tiktoken
+
+        tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # 인코딩 파일을 받을 수 없으면 토큰 분할 없이 문자열 그대로 임베딩 요청
+        embedding_cache.OpenAIEmbeddings = functools.partial(OpenAIEmbeddings, check_embedding_ctx_length=False)
+
+
+def make_timing_handler(timings: Dict[str, List[float]]):
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class TimingHandler(BaseCallbackHandler):
+        """langgraph 노드(node:*)와 도구(tool:*) 단위 소요시간 수집"""
+
+        def __init__(self) -> None:
+            self.started: Dict[Any, tuple] = {}
+
+        def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, name=None, **kwargs) -> None:
+            node = (metadata or {}).get("langgraph_node")
+            if node and node == (name or kwargs.get("name")):
+                self.started[run_id] = (f"node:{node}", time.perf_counter())
+
+        def on_chain_end(self, outputs, *, run_id, **kwargs) -> None:
+            self._finish(run_id)
+
+        def on_chain_error(self, error, *, run_id, **kwargs) -> None:
+            self._finish(run_id)
+
+        def on_tool_start(self, serialized, input_str, *, run_id, name=None, **kwargs) -> None:
+            self.started[run_id] = (f"tool:{name or (serialized or {}).get('name')}", time.perf_counter())
+
+        def on_tool_end(self, output, *, run_id, **kwargs) -> None:
+            self._finish(run_id)
+
+        def on_tool_error(self, error, *, run_id, **kwargs) -> None:
+            self._finish(run_id)
+
+        def _finish(self, run_id) -> None:
+            started = self.started.pop(run_id, None)
+            if started:
+                timings[started[0]].append(time.perf_counter() - started[1])
+
+    return TimingHandler()
+
+
+def run_scenario(graph, name: str, scenario: Dict[str, Any], server: StandInServer, adapter: CassetteAdapter) -> Dict[str, Any]:
+    from langchain_core.messages import ToolMessage
+
+    timings: Dict[str, List[float]] = defaultdict(list)
+    server.load_script(scenario["script"])
+    server.reset_stats()
+    adapter.stats.clear()
+
+    started = time.perf_counter()
+    state = graph.invoke(
+        {"messages": [("user", scenario["message"])]},
+        config={"configurable": {"user_id": "bench"}, "callbacks": [make_timing_handler(timings)], "recursion_limit": 50},
+    )
+    total = time.perf_counter() - started
+
+    tool_errors = [
+        message.name
+        for message in state["messages"]
+        if isinstance(message, ToolMessage) and '"status": "error"' in message.content
+    ]
+    calls = {route: stats.__dict__.copy() for route, stats in {**server.stats, **adapter.stats}.items()}
+    return {
+        "scenario": name,
+        "total_s": round(total, 4),
+        "steps": {key: {"count": len(values), "total_s": round(sum(values), 4)} for key, values in sorted(timings.items())},
+        "calls": dict(sorted(calls.items())),
+        "tool_errors": tool_errors,
+    }
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    for result in results:
+        print(f"== {result['scenario']}: {result['total_s'] * 1000:.0f} ms")
+        for key, step in result["steps"].items():
+            print(f"   {key:<40} x{step['count']:<3} {step['total_s'] * 1000:>9.1f} ms")
+        for route, stats in result["calls"].items():
+            print(f"   {route:<40} x{stats['calls']:<3} req {stats['request_bytes']:>9,} B  resp {stats['response_bytes']:>9,} B")
+        if result["tool_errors"]:
+            print(f"   ! 오류 응답 도구: {', '.join(result['tool_errors'])}")
+
+
+def compare_baseline(results: List[Dict[str, Any]], baseline_path: str, tolerance: float) -> bool:
+    """기준 결과 대비 시나리오 총 소요시간이 tolerance 비율 이상 늘었으면 False"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {result["scenario"]: result for result in json.load(f)["results"]}
+
+    ok = True
+    for result in results:
+        base = baseline.get(result["scenario"])
+        if base is None:
+            continue
+        ratio = result["total_s"] / base["total_s"] if base["total_s"] else 1.0
+        status = "OK" if ratio <= 1 + tolerance else "REGRESSION"
+        ok &= status == "OK"
+        print(f"{result['scenario']:<10} {base['total_s'] * 1000:>9.0f} ms -> {result['total_s'] * 1000:>9.0f} ms ({ratio:.2f}x) {status}", file=sys.stderr)
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="graph_final 종단간 지연시간 벤치마크 (오프라인)")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="실행할 시나리오 (기본: 전체)")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="녹화된 외부 지연시간 배율 (0 이면 지연 없음)")
+    parser.add_argument("--cassette", help="재생할 카세트 파일 (기본: 합성 카세트)")
+    parser.add_argument("--record", metavar="PATH", help="실제 외부 API를 호출하여 카세트로 저장")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--baseline", help="비교할 기준 결과(JSON)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 지연 증가 비율")
+    args = parser.parse_args()
+
+    cassette = Cassette() if args.record else (Cassette.load(args.cassette) if args.cassette else default_cassette())
+    adapter = CassetteAdapter(cassette, record=bool(args.record), latency_scale=args.latency_scale)
+    server = StandInServer(
+        documents=POLICY_DOCUMENTS,
+        structured_outputs={"Rank": {"appropriate_rank": "특별공급 - 신혼부부"}},
+        completion_text=REPORT_TEXT,
+        latency=LATENCY,
+        latency_scale=args.latency_scale,
+    ).start()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        configure_environment(server.url, cache_dir)
+        patch_offline_dependencies()
+        from retrieval_graph.graph_final import graph_final
+
+        results = []
+        try:
+            # 도구들의 print 출력이 --json 결과와 섞이지 않도록 stderr 로 보냄
+            with use_cassette(adapter, hosts=EXTERNAL_HOSTS), contextlib.redirect_stdout(sys.stderr):
+                for name in args.scenario or list(SCENARIOS):
+                    results.append(run_scenario(graph_final, name, SCENARIOS[name], server, adapter))
+        finally:
+            server.stop()
+
+    if args.record:
+        cassette.save(args.record)
+
+    if args.json:
+        print(json.dumps({"latency_scale": args.latency_scale, "results": results}, ensure_ascii=False, indent=1))
+    else:
+        print_report(results)
+
+    if args.baseline and not compare_baseline(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
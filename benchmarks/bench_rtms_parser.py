@@ -0,0 +1,96 @@
+"""RTMS 실거래가 XML 파싱 마이크로벤치마크.
+
+1000건짜리 페이지에 대해 기존 방식(ET.fromstring 2회 + findall)과
+단일 패스 iterparse 파서(rtms_parser.parse_page)의 CPU 시간과 최대 메모리를 비교합니다.
+
+    python benchmarks/bench_rtms_parser.py
+"""
+
+import random
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from retrieval_graph.rtms_parser import parse_page, pyung_prices
+
+ROWS = 1000
+REPEAT = 20
+UMD_NAMES = ["잠실동", "신천동", "가락동", "문정동", "방이동", "오금동", "송파동", "석촌동"]
+
+
+def make_page(rows: int = ROWS) -> str:
+    rng = random.Random(0)
+    items = []
+    for _ in range(rows):
+        items.append(
+            "<item>"
+            "<aptDong>102</aptDong><aptNm>인왕산아이파크</aptNm>"
+            f"<buildYear>{rng.randint(1980, 2024)}</buildYear><buyerGbn>개인</buyerGbn>"
+            "<cdealDay> </cdealDay><cdealType> </cdealType>"
+            f"<dealAmount>{rng.randint(20000, 400000):,}</dealAmount>"
+            f"<dealDay>{rng.randint(1, 28)}</dealDay><dealMonth>1</dealMonth><dealYear>2025</dealYear>"
+            "<dealingGbn>중개거래</dealingGbn><estateAgentSggNm>서울 송파구</estateAgentSggNm>"
+            f"<excluUseAr>{rng.uniform(30, 200):.3f}</excluUseAr><floor>{rng.randint(-1, 40)}</floor>"
+            "<jibun>60</jibun><landLeaseholdGbn>N</landLeaseholdGbn><rgstDate> </rgstDate>"
+            "<sggCd>11710</sggCd><slerGbn>개인</slerGbn>"
+            f"<umdNm>{rng.choice(UMD_NAMES)}</umdNm>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8" standalone="yes"?>'
+        "<response><header><resultCode>000</resultCode><resultMsg>OK</resultMsg></header>"
+        f"<body><items>{''.join(items)}</items><numOfRows>{rows}</numOfRows>"
+        f"<pageNo>1</pageNo><totalCount>{rows}</totalCount></body></response>"
+    )
+
+
+def legacy_parse(xml_text: str, target_umd: str):
+    # 기존 get_all_items_for_month + parse_items 동작 (페이지당 2회 DOM 파싱)
+    root = ET.fromstring(xml_text)
+    total_count = int(root.findtext(".//totalCount", "0"))
+
+    root = ET.fromstring(xml_text)
+    prices = []
+    for item in root.findall(".//item"):
+        if item.findtext("umdNm", "").strip() != target_umd:
+            continue
+        try:
+            area = float(item.findtext("excluUseAr", "0").strip())
+            amount = int(item.findtext("dealAmount", "0").replace(",", "").strip())
+            prices.append(amount / (area / 3.3))
+        except (ValueError, ZeroDivisionError):
+            continue
+    return total_count, prices
+
+
+def streaming_parse(xml_text: str, target_umd: str):
+    total_count, trades = parse_page(xml_text)
+    return total_count, pyung_prices(trades, target_umd)
+
+
+def measure(func, xml_text: str):
+    start = time.process_time()
+    for _ in range(REPEAT):
+        func(xml_text, "잠실동")
+    cpu_ms = (time.process_time() - start) / REPEAT * 1000
+
+    tracemalloc.start()
+    func(xml_text, "잠실동")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_ms, peak / 1024
+
+
+def main() -> None:
+    xml_text = make_page()
+    assert legacy_parse(xml_text, "잠실동") == streaming_parse(xml_text, "잠실동")
+
+    print(f"RTMS page: {ROWS} rows, {len(xml_text.encode('utf-8')) / 1024:.0f} KiB")
+    print(f"{'parser':<12}{'cpu ms/page':>14}{'peak KiB':>12}")
+    for name, func in (("legacy", legacy_parse), ("streaming", streaming_parse)):
+        cpu_ms, peak_kib = measure(func, xml_text)
+        print(f"{name:<12}{cpu_ms:>14.2f}{peak_kib:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""외부 의존성 없이 그래프를 실행하기 위한 녹화/재생 카세트와 로컬 대역 서버."""
@@ -0,0 +1,156 @@
+"""requests 기반 외부 호출(data.go.kr, odcloud, applyhome, Perplexity)의 녹화/재생.
+
+모든 requests.Session 의 어댑터 조회를 가로채므로, 공용 http_client 세션과
+모듈 수준 requests.get/post 호출이 모두 카세트를 거칩니다.
+등록되지 않은 호스트(tiktoken 인코딩 파일 등)는 실제 네트워크로 전달합니다.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+@dataclass
+class Interaction:
+    """녹화된 요청/응답 한 쌍. params 는 일치해야 하는 쿼리 파라미터의 부분집합."""
+
+    method: str
+    host: str
+    path: str
+    status: int = 200
+    body: str = ""
+    headers: Dict[str, str] = field(default_factory=dict)
+    params: Dict[str, str] = field(default_factory=dict)
+    latency: float = 0.0
+
+    def matches(self, method: str, host: str, path: str, params: Dict[str, str]) -> bool:
+        return (
+            self.method == method
+            and self.host == host
+            and self.path == path
+            and all(params.get(k) == v for k, v in self.params.items())
+        )
+
+
+@dataclass
+class Stats:
+    calls: int = 0
+    request_bytes: int = 0
+    response_bytes: int = 0
+
+
+class Cassette:
+    """인터랙션 목록. 더 구체적인(params 가 많은) 인터랙션이 우선 일치합니다."""
+
+    # 카세트에 저장하지 않는 쿼리 파라미터 (인증키)
+    SECRET_PARAMS = {"serviceKey"}
+
+    def __init__(self, interactions: Optional[List[Interaction]] = None) -> None:
+        self.interactions = list(interactions or [])
+
+    @property
+    def hosts(self) -> set:
+        return {interaction.host for interaction in self.interactions}
+
+    def find(self, method: str, url: str) -> Optional[Interaction]:
+        parts = urlsplit(url)
+        params = dict(parse_qsl(parts.query))
+        candidates = [i for i in self.interactions if i.matches(method, parts.hostname, parts.path, params)]
+        return max(candidates, key=lambda i: len(i.params), default=None)
+
+    def record(self, method: str, url: str, response: requests.Response, latency: float) -> None:
+        parts = urlsplit(url)
+        params = {k: v for k, v in parse_qsl(parts.query) if k not in self.SECRET_PARAMS}
+        self.interactions.append(Interaction(
+            method=method,
+            host=parts.hostname,
+            path=parts.path,
+            status=response.status_code,
+            body=response.text,
+            headers={"Content-Type": response.headers.get("Content-Type", "")},
+            params=params,
+            latency=round(latency, 3),
+        ))
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with open(path, encoding="utf-8") as f:
+            return cls([Interaction(**item) for item in json.load(f)])
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([i.__dict__ for i in self.interactions], f, ensure_ascii=False, indent=1)
+
+
+class CassetteAdapter(BaseAdapter):
+    """카세트 재생(또는 녹화) 어댑터. 재생 시 녹화된 지연시간 × latency_scale 만큼 대기합니다."""
+
+    def __init__(self, cassette: Cassette, record: bool = False, latency_scale: float = 1.0) -> None:
+        super().__init__()
+        self.cassette = cassette
+        self.record = record
+        self.latency_scale = latency_scale
+        self.real = HTTPAdapter()
+        self.stats: Dict[str, Stats] = defaultdict(Stats)
+        self.lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        host = urlsplit(request.url).hostname
+        if self.record:
+            started = time.perf_counter()
+            response = self.real.send(request, **kwargs)
+            self.cassette.record(request.method, request.url, response, time.perf_counter() - started)
+        else:
+            interaction = self.cassette.find(request.method, request.url)
+            if interaction is None:
+                raise requests.ConnectionError(f"카세트에 없는 요청: {request.method} {request.url}")
+            time.sleep(interaction.latency * self.latency_scale)
+            response = self._build_response(request, interaction)
+
+        with self.lock:
+            stats = self.stats[host]
+            stats.calls += 1
+            stats.request_bytes += len(request.body or b"") + len(request.url)
+            stats.response_bytes += len(response.content)
+        return response
+
+    @staticmethod
+    def _build_response(request, interaction: Interaction) -> requests.Response:
+        response = requests.Response()
+        response.status_code = interaction.status
+        response.headers = CaseInsensitiveDict(interaction.headers)
+        response._content = interaction.body.encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        self.real.close()
+
+
+@contextmanager
+def use_cassette(adapter: CassetteAdapter, hosts: Optional[set] = None) -> Iterator[CassetteAdapter]:
+    """hosts(기본: 카세트에 등록된 호스트)로 가는 모든 requests 호출을 adapter 로 보냅니다."""
+    original = requests.sessions.Session.get_adapter
+    hosts = hosts or adapter.cassette.hosts
+
+    def get_adapter(session, url):
+        if urlsplit(url).hostname in hosts:
+            return adapter
+        return original(session, url)
+
+    requests.sessions.Session.get_adapter = get_adapter
+    try:
+        yield adapter
+    finally:
+        requests.sessions.Session.get_adapter = original
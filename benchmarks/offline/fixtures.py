@@ -0,0 +1,146 @@
+"""오프라인 벤치마크 기본 카세트와 대역 데이터.
+
+실제 응답을 녹화한 카세트(bench_graph_final.py --record)가 없을 때 사용하는 합성 데이터입니다.
+지연시간은 운영 환경에서 관측되는 대략적인 값이며 --latency-scale 로 조정합니다.
+"""
+
+import json
+import os
+import random
+from typing import Any, Dict, List
+
+from offline.cassette import Cassette, Interaction
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+
+ODCLOUD_HOST = "api.odcloud.kr"
+RTMS_HOST = "apis.data.go.kr"
+APPLYHOME_HOST = "www.applyhome.co.kr"
+PERPLEXITY_HOST = "api.perplexity.ai"
+EXTERNAL_HOSTS = {ODCLOUD_HOST, RTMS_HOST, APPLYHOME_HOST, PERPLEXITY_HOST}
+
+# 외부 의존성별 응답 지연(초)
+LATENCY = {
+    ODCLOUD_HOST: 0.6,
+    RTMS_HOST: 0.4,
+    APPLYHOME_HOST: 0.5,
+    PERPLEXITY_HOST: 3.0,
+    "openai/chat/completions": 0.8,
+    "openai/embeddings": 0.25,
+    "es/_search": 0.05,
+    "es/_msearch": 0.06,
+    "es/_stats": 0.02,
+}
+
+ANNOUNCEMENTS = [
+    ("진위역 서희스타힐스 더 파크뷰(3차)", "경기도 평택시 진위면 갈곶리 239-60번지 일원", "경기", 2025000199),
+    ("서울대방 신혼희망타운", "서울특별시 영등포구 신길동 1499번지", "서울", 2025000201),
+    ("고척 푸르지오 힐스테이트", "서울특별시 구로구 고척동 148번지", "서울", 2025000202),
+    ("잠실 르엘", "서울특별시 송파구 신천동 17-6번지", "서울", 2025000203),
+    ("힐스테이트 평택 센트럴", "경기도 평택시 세교동 592번지", "경기", 2025000204),
+]
+
+POLICY_DOCUMENTS = [
+    {"id": "faq-01", "text": "신혼부부 특별공급 은 혼인기간 7년 이내 무주택 세대구성원 에게 공급합니다.", "metadata": {"page": 12}},
+    {"id": "faq-02", "text": "생애최초 특별공급 은 세대구성원 모두 과거 주택 소유 사실이 없는 무주택 세대주 대상입니다.", "metadata": {"page": 15}},
+    {"id": "faq-03", "text": "다자녀가구 특별공급 은 미성년 자녀 2명 이상을 둔 무주택 세대구성원 대상입니다.", "metadata": {"page": 18}},
+    {"id": "faq-04", "text": "청년 특별공급 은 만 19세 이상 39세 이하 미혼 무주택자 를 대상으로 합니다.", "metadata": {"page": 21}},
+    {"id": "faq-05", "text": "노부모 부양 특별공급 은 만 65세 이상 직계존속을 3년 이상 부양한 무주택 세대주 대상입니다.", "metadata": {"page": 23}},
+    {"id": "faq-06", "text": "1순위 는 청약통장 가입기간과 납입횟수 요건을 충족한 세대주 에게 부여됩니다.", "metadata": {"page": 30}},
+    {"id": "faq-07", "text": "2순위 는 1순위 요건을 충족하지 못한 청약통장 가입자 입니다.", "metadata": {"page": 31}},
+    {"id": "faq-08", "text": "투기과열지구 에서는 세대주 가 아닌 경우 1순위 청약이 제한됩니다.", "metadata": {"page": 33}},
+]
+
+REPORT_TEXT = "# 분양공고 분석 리포트\n\n## 단지 개요\n- 단지명: 진위역 서희스타힐스 더 파크뷰(3차)\n" + "- 평형별 정보 ...\n" * 40
+
+PERPLEXITY_TEXT = "부동산 가치 평가 결과\n📈 종합 투자 점수: 72점 (B+)\n\n🚇 입지 분석 (B)\n" + "교통 접근성 ...\n" * 30
+
+
+def rtms_page(rows: int = 300, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    umd_names = ["진위면", "세교동", "신길동", "고척동", "신천동", "잠실동"]
+    items = "".join(
+        "<item>"
+        f"<aptNm>샘플아파트{rng.randint(1, 30)}</aptNm><buildYear>{rng.randint(1985, 2024)}</buildYear>"
+        f"<dealAmount>{rng.randint(20000, 250000):,}</dealAmount><dealDay>{rng.randint(1, 28)}</dealDay>"
+        f"<excluUseAr>{rng.choice([59.97, 84.93, 101.2, 114.8]):.2f}</excluUseAr><floor>{rng.randint(1, 30)}</floor>"
+        f"<umdNm>{rng.choice(umd_names)}</umdNm>"
+        "</item>"
+        for _ in range(rows)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8" standalone="yes"?>'
+        "<response><header><resultCode>000</resultCode><resultMsg>OK</resultMsg></header>"
+        f"<body><items>{items}</items><numOfRows>1000</numOfRows><pageNo>1</pageNo>"
+        f"<totalCount>{rows}</totalCount></body></response>"
+    )
+
+
+def odcloud_page(city: str) -> Dict[str, Any]:
+    data: List[Dict[str, Any]] = []
+    for name, address, area, manage_no in ANNOUNCEMENTS:
+        if area != city:
+            continue
+        data.append({
+            "HOUSE_MANAGE_NO": str(manage_no),
+            "PBLANC_NO": str(manage_no),
+            "HOUSE_NM": name,
+            "HSSPLY_ADRES": address,
+            "SUBSCRPT_AREA_CODE_NM": area,
+            "TOT_SUPLY_HSHLDCO": 53,
+            "MDHS_TELNO": "18006366",
+            "RCRIT_PBLANC_DE": "2025-06-05",
+            "RCEPT_BGNDE": "2025-06-16",
+            "RCEPT_ENDDE": "2025-06-18",
+            "SPSPLY_RCEPT_BGNDE": "2025-06-16",
+            "SPSPLY_RCEPT_ENDDE": "2025-06-16",
+            "GNRL_RNK1_CRSPAREA_RCPTDE": "2025-06-17",
+            "GNRL_RNK1_CRSPAREA_ENDDE": "2025-06-17",
+            "GNRL_RNK1_ETC_AREA_RCPTDE": "2025-06-17",
+            "GNRL_RNK1_ETC_AREA_ENDDE": "2025-06-17",
+            "GNRL_RNK2_CRSPAREA_RCPTDE": "2025-06-18",
+            "GNRL_RNK2_CRSPAREA_ENDDE": "2025-06-18",
+            "GNRL_RNK2_ETC_AREA_RCPTDE": "2025-06-18",
+            "GNRL_RNK2_ETC_AREA_ENDDE": "2025-06-18",
+            "PRZWNER_PRESNATN_DE": "2025-06-24",
+            "CNTRCT_CNCLS_BGNDE": "2025-07-07",
+            "CNTRCT_CNCLS_ENDDE": "2025-07-09",
+            "BSNS_MBY_NM": "엘지로 지역주택조합",
+            "CNSTRCT_ENTRPS_NM": "(주)서희건설",
+            "HMPG_ADRES": "http://www.starhills-jinwi.co.kr",
+            "PBLANC_URL": f"https://{APPLYHOME_HOST}/ai/aia/selectAPTLttotPblancDetail.do?houseManageNo={manage_no}&pblancNo={manage_no}",
+        })
+    return {"page": 1, "perPage": 100, "currentCount": len(data), "matchCount": len(data), "totalCount": len(data), "data": data}
+
+
+def default_cassette() -> Cassette:
+    with open(os.path.join(FIXTURE_DIR, "applyhome_detail.html"), encoding="utf-8") as f:
+        detail_html = f.read()
+
+    interactions = [
+        Interaction(
+            method="GET", host=RTMS_HOST, path="/1613000/RTMSDataSvcAptTrade/getRTMSDataSvcAptTrade",
+            body=rtms_page(), headers={"Content-Type": "application/xml"}, latency=LATENCY[RTMS_HOST],
+        ),
+        Interaction(
+            method="GET", host=APPLYHOME_HOST, path="/ai/aia/selectAPTLttotPblancDetail.do",
+            body=detail_html, headers={"Content-Type": "text/html;charset=UTF-8"}, latency=LATENCY[APPLYHOME_HOST],
+        ),
+        Interaction(
+            method="POST", host=PERPLEXITY_HOST, path="/chat/completions",
+            body=json.dumps({
+                "choices": [{"message": {"role": "assistant", "content": PERPLEXITY_TEXT}}],
+                "citations": ["https://www.molit.go.kr/", "https://land.seoul.go.kr/"],
+                "search_results": [{"title": "신길뉴타운 개발 현황", "url": "https://news.example.com/1", "date": "2025-05-01"}],
+            }, ensure_ascii=False),
+            headers={"Content-Type": "application/json"}, latency=LATENCY[PERPLEXITY_HOST],
+        ),
+    ]
+    for city in ("서울", "경기"):
+        interactions.append(Interaction(
+            method="GET", host=ODCLOUD_HOST, path="/api/ApplyhomeInfoDetailSvc/v1/getAPTLttotPblancDetail",
+            params={"cond[SUBSCRPT_AREA_CODE_NM::EQ]": city},
+            body=json.dumps(odcloud_page(city), ensure_ascii=False),
+            headers={"Content-Type": "application/json"}, latency=LATENCY[ODCLOUD_HOST],
+        ))
+    return Cassette(interactions)
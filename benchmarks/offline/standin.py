@@ -0,0 +1,286 @@
+"""OpenAI / Elasticsearch 로컬 대역 서버와 Google Calendar 대역.
+
+OpenAI(httpx)와 Elasticsearch(urllib3) 클라이언트는 requests 를 쓰지 않으므로
+로컬 HTTP 서버를 띄우고 OPENAI_BASE_URL / ELASTICSEARCH_URL 을 이 서버로 지정합니다.
+
+채팅 모델은 대본(script)을 따라 응답합니다.
+- 도구 목록과 함께 호출되면(에이전트) 대본의 다음 단계를 도구 호출 또는 최종 응답으로 반환
+- tool_choice 로 특정 함수가 강제되면(구조화 출력) structured_outputs 의 값을 인자로 반환
+- 도구 없이 호출되면(리포트 생성 등) completion_text 를 반환
+"""
+
+import base64
+import gzip
+import hashlib
+import itertools
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from offline.cassette import Stats
+
+EMBEDDING_DIM = 1536
+
+
+def fake_embedding(value: Any) -> np.ndarray:
+    """입력(문자열 또는 토큰 목록)으로부터 결정적인 단위 벡터 생성"""
+    seed = int.from_bytes(hashlib.sha256(json.dumps(value, ensure_ascii=False).encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(EMBEDDING_DIM).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class StandInServer:
+    def __init__(
+        self,
+        documents: Iterable[Dict[str, Any]] = (),
+        structured_outputs: Optional[Dict[str, Dict[str, Any]]] = None,
+        completion_text: str = "",
+        latency: Optional[Dict[str, float]] = None,
+        latency_scale: float = 1.0,
+    ) -> None:
+        self.documents = list(documents)
+        self.structured_outputs = structured_outputs or {}
+        self.completion_text = completion_text
+        self.latency = latency or {}
+        self.latency_scale = latency_scale
+        self.script: deque = deque()
+        self.stats: Dict[str, Stats] = defaultdict(Stats)
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def load_script(self, steps: Iterable[Dict[str, Any]]) -> None:
+        """에이전트 대본: {"tool": 이름, "args": {...}} 또는 {"content": 최종 응답} 목록"""
+        self.script = deque(steps)
+
+    def reset_stats(self) -> None:
+        self.stats = defaultdict(Stats)
+
+    # region OpenAI
+    def chat_completion(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        tool_choice = request.get("tool_choice")
+        if isinstance(tool_choice, dict):
+            name = tool_choice["function"]["name"]
+            message = self._tool_call_message(name, self.structured_outputs.get(name, {}))
+        elif request.get("tools"):
+            step = self.script.popleft() if self.script else {"content": "요청하신 작업을 모두 완료했습니다."}
+            if "tool" in step:
+                message = self._tool_call_message(step["tool"], step.get("args", {}))
+            else:
+                message = {"role": "assistant", "content": step["content"]}
+        else:
+            message = {"role": "assistant", "content": self.completion_text}
+
+        prompt_chars = len(json.dumps(request.get("messages", []), ensure_ascii=False))
+        return {
+            "id": f"chatcmpl-{next(self._ids)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", ""),
+            "choices": [{
+                "index": 0,
+                "message": message,
+                "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+            }],
+            "usage": {"prompt_tokens": prompt_chars // 4, "completion_tokens": 10, "total_tokens": prompt_chars // 4 + 10},
+        }
+
+    def _tool_call_message(self, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": f"call_{next(self._ids)}",
+                "type": "function",
+                "function": {"name": name, "arguments": json.dumps(args, ensure_ascii=False)},
+            }],
+        }
+
+    def embeddings(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        inputs = request["input"]
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+
+        data = []
+        for i, value in enumerate(inputs):
+            vector = fake_embedding(value)
+            if request.get("encoding_format") == "base64":
+                embedding: Any = base64.b64encode(vector.tobytes()).decode("ascii")
+            else:
+                embedding = vector.tolist()
+            data.append({"object": "embedding", "index": i, "embedding": embedding})
+        return {"object": "list", "data": data, "model": request.get("model", ""), "usage": {"prompt_tokens": 0, "total_tokens": 0}}
+    # endregion
+
+    # region Elasticsearch
+    def search(self, index: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        query = _find_match_query(body) or ""
+        terms = set(query.split())
+        scored = sorted(
+            ((len(terms & set(doc["text"].split())), i, doc) for i, doc in enumerate(self.documents)),
+            key=lambda item: (-item[0], item[1]),
+        )
+        size = _find_knn_k(body) or body.get("size") or 10
+        hits = [
+            {"_index": index, "_id": doc.get("id", str(i)), "_score": float(score) + 1.0, "_source": {"text": doc["text"], "metadata": doc.get("metadata", {})}}
+            for score, i, doc in scored[:size]
+        ]
+        return {
+            "took": 1,
+            "timed_out": False,
+            "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+            "hits": {"total": {"value": len(hits), "relation": "eq"}, "max_score": hits[0]["_score"] if hits else None, "hits": hits},
+        }
+
+    def stats_for(self, index: str) -> Dict[str, Any]:
+        docs = {"count": len(self.documents), "deleted": 0}
+        info = {"uuid": f"standin-{index}", "primaries": {"docs": docs, "indexing": {"index_total": len(self.documents)}}}
+        return {"_shards": {"total": 1, "successful": 1, "failed": 0}, "indices": {index: info}}
+
+    def msearch(self, default_index: Optional[str], lines: List[Dict[str, Any]]) -> Dict[str, Any]:
+        responses = []
+        for header, body in zip(lines[::2], lines[1::2]):
+            result = self.search(header.get("index") or default_index or "", body)
+            result["status"] = 200
+            responses.append(result)
+        return {"took": 1, "responses": responses}
+    # endregion
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_HEAD(self) -> None:
+                self._reply(200, b"", route="es")
+
+            def do_GET(self) -> None:
+                self._dispatch(b"")
+
+            def do_POST(self) -> None:
+                self._dispatch(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+
+            def _dispatch(self, raw: bytes) -> None:
+                path = self.path.split("?", 1)[0]
+                request_bytes = len(raw)
+                if self.headers.get("Content-Encoding") == "gzip":
+                    raw = gzip.decompress(raw)
+                if path.startswith("/v1/"):
+                    route = f"openai{path[3:]}"
+                    request = json.loads(raw or b"{}")
+                    if path.endswith("/chat/completions"):
+                        payload = server.chat_completion(request)
+                    elif path.endswith("/embeddings"):
+                        payload = server.embeddings(request)
+                    else:
+                        return self._reply(404, b"{}", route)
+                elif path.endswith("/_msearch"):
+                    route = "es/_msearch"
+                    index = path[1:-len("/_msearch")] or None
+                    lines = [json.loads(line) for line in raw.splitlines() if line.strip()]
+                    payload = server.msearch(index, lines)
+                elif "/_stats" in path:
+                    route = "es/_stats"
+                    index = path[1:path.index("/_stats")]
+                    payload = server.stats_for(index)
+                elif path.endswith("/_search"):
+                    route = "es/_search"
+                    payload = server.search(path[1:-len("/_search")], json.loads(raw or b"{}"))
+                elif path == "/":
+                    route = "es"
+                    payload = {"name": "stand-in", "version": {"number": "8.15.1"}, "tagline": "You Know, for Search"}
+                else:
+                    return self._reply(404, b"{}", "es")
+
+                time.sleep(server.latency.get(route, 0.0) * server.latency_scale)
+                self._reply(200, json.dumps(payload, ensure_ascii=False).encode("utf-8"), route, request_bytes)
+
+            def _reply(self, status: int, body: bytes, route: str, request_bytes: int = 0) -> None:
+                with server.lock:
+                    stats = server.stats[route]
+                    stats.calls += 1
+                    stats.request_bytes += request_bytes
+                    stats.response_bytes += len(body)
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("X-Elastic-Product", "Elasticsearch")
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def _find_match_query(node: Any) -> Optional[str]:
+    if isinstance(node, dict):
+        match = node.get("match")
+        if isinstance(match, dict):
+            for value in match.values():
+                return value.get("query") if isinstance(value, dict) else value
+        for value in node.values():
+            found = _find_match_query(value)
+            if found:
+                return found
+    elif isinstance(node, list):
+        for value in node:
+            found = _find_match_query(value)
+            if found:
+                return found
+    return None
+
+
+def _find_knn_k(node: Any) -> Optional[int]:
+    if isinstance(node, dict):
+        if isinstance(node.get("knn"), dict):
+            return node["knn"].get("k")
+        for value in node.values():
+            found = _find_knn_k(value)
+            if found:
+                return found
+    elif isinstance(node, list):
+        for value in node:
+            found = _find_knn_k(value)
+            if found:
+                return found
+    return None
+
+
+class FakeCalendarService:
+    """googleapiclient 캘린더 서비스 대역: events().insert(...).execute()"""
+
+    def __init__(self) -> None:
+        self.events_created: List[Dict[str, Any]] = []
+
+    def events(self) -> "FakeCalendarService":
+        return self
+
+    def insert(self, calendarId: str, body: Dict[str, Any]) -> "FakeCalendarService":
+        self.events_created.append(body)
+        return self
+
+    def execute(self) -> Dict[str, Any]:
+        return {"htmlLink": f"https://calendar.google.com/calendar/event?eid=standin{len(self.events_created)}"}
@@ -0,0 +1,104 @@
+"""지역명/주소 문자열 → 시군구 법정동 코드 변환."""
+
+# region    '기본 라이브러리'
+import re
+from typing import Dict, Optional, Tuple
+
+# endregion
+# region    'LangGraph 라이브러리'
+from retrieval_graph.constants import AREA_CODE
+
+# endregion
+
+
+# 주소에서 흔히 쓰는 시/도 약칭 → constants.AREA_CODE 의 정식 명칭 (정식 명칭은 자동으로 추가)
+PROVINCE_ALIASES = {
+    '서울'    : '서울특별시'     , '서울시'    : '서울특별시',
+    '부산'    : '부산광역시'     , '부산시'    : '부산광역시',
+    '대구'    : '대구광역시'     , '대구시'    : '대구광역시',
+    '인천'    : '인천광역시'     , '인천시'    : '인천광역시',
+    '광주'    : '광주광역시'     , '광주시'    : '광주광역시',
+    '대전'    : '대전광역시'     , '대전시'    : '대전광역시',
+    '울산'    : '울산광역시'     , '울산시'    : '울산광역시',
+    '세종'    : '세종특별자치시' , '세종시'    : '세종특별자치시',
+    '경기'    : '경기도'         ,
+    '강원'    : '강원특별자치도' , '강원도'    : '강원특별자치도',
+    '충북'    : '충청북도'       ,
+    '충남'    : '충청남도'       ,
+    '전북'    : '전북특별자치도' , '전라북도'  : '전북특별자치도',
+    '전남'    : '전라남도'       ,
+    '경북'    : '경상북도'       ,
+    '경남'    : '경상남도'       ,
+    '제주'    : '제주특별자치도' , '제주도'    : '제주특별자치도',
+}
+UMD_NAME = re.compile(r'^[가-힣0-9.·]+(?:읍|면|동|가)$')
+CODE     = ''   # 트라이 노드에서 시군구 코드를 담는 키 (토큰은 빈 문자열이 될 수 없음)
+
+
+def _build_trie(area_code: Dict[str, int]) -> Tuple[dict, dict]:
+    """'시도 시군구 [구]' 토큰 트라이. 시/도 약칭과 '평택시' → '평택' 같은 접미사 생략형도 같은 노드를 가리킵니다.
+
+    시/도 없이 시군구부터 시작하는 주소를 위해, 전국에서 이름이 유일한 시군구는 시/도 없는 루트에도 등록합니다.
+    """
+    provinces = {}
+    for name, code in area_code.items():
+        province, *tokens = name.split()
+        node = provinces.setdefault(province, {})
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[CODE] = code
+
+    # region    '접미사 생략형 (평택시 → 평택, 수원시 장안구 → 수원 장안)'
+    def add_short_names(node: dict) -> None:
+        for token, child in list(node.items()):
+            if token == CODE:
+                continue
+            if len(token) >= 3 and token[-1] in '시군구':
+                node.setdefault(token[:-1], child)
+            add_short_names(child)
+
+    for node in provinces.values():
+        add_short_names(node)
+    # endregion
+
+    # region    '시/도 없는 주소용 루트 (전국에서 유일한 시군구만)'
+    owners = {}
+    for node in provinces.values():
+        for token, child in node.items():
+            if token != CODE:
+                owners.setdefault(token, []).append(child)
+    bare = {token: children[0] for token, children in owners.items() if len(children) == 1}
+    # endregion
+
+    for alias, province in PROVINCE_ALIASES.items():
+        provinces.setdefault(alias, provinces[province])
+    return provinces, bare
+
+
+PROVINCE_TRIE, SIGUNGU_TRIE = _build_trie(AREA_CODE)
+
+
+def resolve_address(address: str) -> Tuple[Optional[int], Optional[str]]:
+    """자유 형식 주소(HSSPLY_ADRES)를 (시군구 법정동 코드, 읍면동 이름)으로 변환 (토큰 한 번 순회).
+
+    '경기 평택시 진위면 갈곶리' → (41220, '진위면'), 찾지 못한 값은 None
+    """
+    tokens = address.replace(',', ' ').split()
+    if not tokens:
+        return None, None
+
+    if tokens[0] in PROVINCE_TRIE:
+        node, i = PROVINCE_TRIE[tokens[0]], 1
+    else:
+        node, i = SIGUNGU_TRIE, 0
+
+    code = node.get(CODE)
+    while i < len(tokens) and tokens[i] in node:
+        node = node[tokens[i]]
+        code = node.get(CODE, code)
+        i += 1
+
+    if code is None:
+        return None, None
+    umd_nm = tokens[i] if i < len(tokens) and UMD_NAME.match(tokens[i]) else None
+    return code, umd_nm
@@ -0,0 +1,86 @@
+"""청약홈 분양공고 상세 페이지 캐시."""
+
+# region    '기본 라이브러리'
+import json
+import time
+import zlib
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# endregion
+# region    'LangGraph 라이브러리'
+from retrieval_graph.rtms_cache import get_connection
+
+# endregion
+
+
+# 게시된 분양공고 상세 페이지는 변경되지 않으므로 만료 없이 보관합니다.
+# 원본 HTML을 압축 저장하여, 파서가 바뀌면(parser_version) 네트워크 없이 다시 파싱할 수 있습니다.
+
+
+def _ensure_detail_schema(conn) -> None:
+    conn.execute(
+        '''
+        CREATE TABLE IF NOT EXISTS applyhome_detail (
+            house_manage_no TEXT    NOT NULL,
+            pblanc_no       TEXT    NOT NULL,
+            html            BLOB    NOT NULL,
+            units           TEXT    NOT NULL,
+            parser_version  INTEGER NOT NULL,
+            fetched_at      REAL    NOT NULL,
+            PRIMARY KEY (house_manage_no, pblanc_no)
+        )
+        '''
+    )
+
+
+def detail_key(url: str) -> Optional[Tuple[str, str]]:
+    """분양공고 URL 의 (houseManageNo, pblancNo), 둘 중 하나라도 없으면 None."""
+    query = parse_qs(urlsplit(url).query)
+    house_manage_no = query.get('houseManageNo', [''])[0]
+    pblanc_no       = query.get('pblancNo', [''])[0]
+    if not house_manage_no or not pblanc_no:
+        return None
+    return house_manage_no, pblanc_no
+
+
+def get_cached_units(key: Tuple[str, str], parser_version: int) -> Optional[list]:
+    """저장된 평형별 공급대상 및 분양가, 없거나 다른 파서 버전으로 파싱된 경우 None."""
+    conn = get_connection()
+    _ensure_detail_schema(conn)
+    row = conn.execute(
+        'SELECT units, parser_version FROM applyhome_detail WHERE house_manage_no=? AND pblanc_no=?', key
+    ).fetchone()
+    if row is None or row[1] != parser_version:
+        return None
+    return json.loads(row[0])
+
+
+def get_cached_html(key: Tuple[str, str]) -> Optional[str]:
+    """저장된 원본 HTML, 없으면 None."""
+    conn = get_connection()
+    _ensure_detail_schema(conn)
+    row = conn.execute('SELECT html FROM applyhome_detail WHERE house_manage_no=? AND pblanc_no=?', key).fetchone()
+    return zlib.decompress(row[0]).decode('utf-8') if row else None
+
+
+def put_cached_detail(key: Tuple[str, str], html: str, units: list, parser_version: int) -> None:
+    """상세 페이지 원문(압축)과 파싱한 평형 목록 저장."""
+    conn = get_connection()
+    _ensure_detail_schema(conn)
+    with conn:
+        conn.execute(
+            'INSERT OR REPLACE INTO applyhome_detail VALUES (?, ?, ?, ?, ?, ?)',
+            (*key, zlib.compress(html.encode('utf-8')), json.dumps(units, ensure_ascii=False), parser_version, time.time()),
+        )
+
+
+def update_cached_units(key: Tuple[str, str], units: list, parser_version: int) -> None:
+    """저장된 HTML은 그대로 두고 파싱 결과만 갱신."""
+    conn = get_connection()
+    _ensure_detail_schema(conn)
+    with conn:
+        conn.execute(
+            'UPDATE applyhome_detail SET units=?, parser_version=? WHERE house_manage_no=? AND pblanc_no=?',
+            (json.dumps(units, ensure_ascii=False), parser_version, *key),
+        )
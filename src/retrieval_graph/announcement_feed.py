@@ -0,0 +1,177 @@
+"""분양공고 변경 피드.
+
+동기화할 때마다 odcloud 목록 응답 한 건의 내용 해시를 분양공고 URL(PBLANC_URL) 기준으로 보관하고,
+직전 동기화와 비교하여 신규(inserted) / 변경(updated) / 철회(withdrawn) 된 공고만 변경 로그에 남깁니다.
+리포트 사전 생성, 시세 캐시 예열 같은 후속 작업은 지역 전체 대신 consume_changes 로 변경분만 처리합니다.
+
+    python -m retrieval_graph.announcement_feed --consumer report
+"""
+
+# region    '기본 라이브러리'
+import argparse
+import hashlib
+import json
+import logging
+from typing import Callable, Iterable, List, Optional, Tuple
+
+# endregion
+# region    'LangGraph 라이브러리'
+from retrieval_graph.rtms_cache import get_connection
+
+# endregion
+
+
+logger = logging.getLogger(__name__)
+
+INSERTED  = 'inserted'
+UPDATED   = 'updated'
+WITHDRAWN = 'withdrawn'
+
+
+def _ensure_feed_schema(conn) -> None:
+    conn.executescript(
+        '''
+        CREATE TABLE IF NOT EXISTS announcement_hash (
+            pblanc_url      TEXT PRIMARY KEY,
+            sido            TEXT NOT NULL,
+            rcrit_pblanc_de TEXT NOT NULL,
+            content_hash    TEXT NOT NULL,
+            seen_at         REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS announcement_hash_sido ON announcement_hash (sido, rcrit_pblanc_de);
+
+        CREATE TABLE IF NOT EXISTS announcement_change (
+            seq             INTEGER PRIMARY KEY AUTOINCREMENT,
+            pblanc_url      TEXT NOT NULL,
+            sido            TEXT NOT NULL,
+            change          TEXT NOT NULL,
+            content_hash    TEXT,
+            changed_at      REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS announcement_change_sido ON announcement_change (sido, seq);
+
+        CREATE TABLE IF NOT EXISTS announcement_feed_cursor (
+            consumer        TEXT PRIMARY KEY,
+            seq             INTEGER NOT NULL
+        );
+        '''
+    )
+
+
+def content_hash(apt_info: dict) -> str:
+    """목록 응답(odcloud) 한 건의 내용 해시 (키 순서와 무관)."""
+    return hashlib.sha1(json.dumps(apt_info, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def diff_announcements(conn, apt_infos: Iterable[dict]) -> List[Tuple[str, dict]]:
+    """조회한 목록을 저장된 해시와 비교하여 (INSERTED | UPDATED, apt_info) 목록을 반환 (읽기 전용).
+
+    내용이 같은 공고는 반환하지 않으므로 호출 측은 변경분만 상세 조회/저장하면 됩니다.
+    """
+    _ensure_feed_schema(conn)
+
+    changes = []
+    for apt_info in apt_infos:
+        row = conn.execute('SELECT content_hash FROM announcement_hash WHERE pblanc_url=?', (apt_info['PBLANC_URL'],)).fetchone()
+        if row is None:
+            changes.append((INSERTED, apt_info))
+        elif row[0] != content_hash(apt_info):
+            changes.append((UPDATED, apt_info))
+    return changes
+
+
+def record_changes(conn, city: str, apt_infos: Iterable[dict], changes: List[Tuple[str, dict]], synced_at: float) -> None:
+    """조회한 모든 공고의 해시/확인 시각을 갱신하고 변경분을 변경 로그에 기록 (호출 측 트랜잭션 안에서 실행)."""
+    conn.executemany(
+        'INSERT OR REPLACE INTO announcement_hash VALUES (?, ?, ?, ?, ?)',
+        [(apt_info['PBLANC_URL'], city, apt_info['RCRIT_PBLANC_DE'], content_hash(apt_info), synced_at) for apt_info in apt_infos],
+    )
+    conn.executemany(
+        'INSERT INTO announcement_change (pblanc_url, sido, change, content_hash, changed_at) VALUES (?, ?, ?, ?, ?)',
+        [(apt_info['PBLANC_URL'], city, change, content_hash(apt_info), synced_at) for change, apt_info in changes],
+    )
+
+
+def mark_seen(conn, urls: Iterable[str], synced_at: float) -> None:
+    """해시는 그대로 두고 확인 시각만 갱신 (상세 조회에 실패해 다음 동기화에서 다시 처리할 공고가 철회로 잡히지 않도록)."""
+    conn.executemany('UPDATE announcement_hash SET seen_at=? WHERE pblanc_url=?', [(synced_at, url) for url in urls])
+
+
+def withdraw_missing(conn, city: str, since: str, synced_at: float) -> List[str]:
+    """since(YYYY-MM-DD) 이후 모집공고 중 이번 동기화(synced_at)에서 보이지 않은 공고를 철회로 기록하고 URL 목록을 반환.
+
+    since 범위 전체를 빠짐없이 조회한 뒤, 호출 측 트랜잭션 안에서 실행합니다.
+    """
+    urls = [
+        url for (url,) in conn.execute(
+            'SELECT pblanc_url FROM announcement_hash WHERE sido=? AND rcrit_pblanc_de>=? AND seen_at<?',
+            (city, since, synced_at),
+        )
+    ]
+    conn.executemany(
+        'INSERT INTO announcement_change (pblanc_url, sido, change, content_hash, changed_at) VALUES (?, ?, ?, NULL, ?)',
+        [(url, city, WITHDRAWN, synced_at) for url in urls],
+    )
+    conn.executemany('DELETE FROM announcement_hash WHERE pblanc_url=?', [(url,) for url in urls])
+    return urls
+
+
+def read_changes(after_seq: int = 0, city: Optional[str] = None, limit: int = 100) -> List[dict]:
+    """변경 로그 중 seq 가 after_seq 보다 큰 항목을 순서대로 반환."""
+    conn = get_connection()
+    _ensure_feed_schema(conn)
+
+    conditions = ['seq > ?']
+    params     = [int(after_seq)]
+    if city:
+        conditions.append('sido = ?')
+        params.append(city)
+    rows = conn.execute(
+        f'''
+        SELECT seq, pblanc_url, sido, change, changed_at FROM announcement_change
+        WHERE {' AND '.join(conditions)} ORDER BY seq LIMIT ?
+        ''',
+        (*params, int(limit)),
+    ).fetchall()
+    return [
+        {'seq': seq, 'pblanc_url': url, 'sido': sido, 'change': change, 'changed_at': changed_at}
+        for seq, url, sido, change, changed_at in rows
+    ]
+
+
+def consume_changes(consumer: str, handler: Callable[[dict], None], limit: int = 100) -> int:
+    """소비자(consumer)별 커서 이후의 (전체 지역) 변경분을 handler 로 처리하고, 한 건 처리할 때마다 커서를 전진합니다.
+
+    handler 가 예외를 던지면 해당 변경분부터 다음 호출에서 다시 처리합니다. 처리한 건수를 반환합니다.
+    """
+    conn = get_connection()
+    _ensure_feed_schema(conn)
+
+    row   = conn.execute('SELECT seq FROM announcement_feed_cursor WHERE consumer=?', (consumer,)).fetchone()
+    count = 0
+    for change in read_changes(row[0] if row else 0, limit=limit):
+        handler(change)
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO announcement_feed_cursor VALUES (?, ?)', (consumer, change['seq']))
+        count += 1
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """변경 피드 CLI 진입점."""
+    parser = argparse.ArgumentParser(description='분양공고 변경 피드 조회 (consumer 커서 전진)')
+    parser.add_argument('--consumer', type=str, default='cli', help='커서 이름')
+    parser.add_argument('--limit', type=int, default=100)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    count = consume_changes(
+        args.consumer,
+        lambda change: logger.info('#%d %-9s %s %s', change['seq'], change['change'], change['sido'], change['pblanc_url']),
+        limit=args.limit,
+    )
+    logger.info('%d건 처리', count)
+
+
+if __name__ == '__main__':
+    main()
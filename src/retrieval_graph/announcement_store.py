@@ -0,0 +1,345 @@
+"""분양공고 로컬 저장소.
+
+odcloud 분양정보를 모집공고일 기준으로 증분 동기화하여 SQLite 에 주택관리번호 단위로 저장합니다.
+지역/법정동코드/청약일정/평형별 분양가에 인덱스가 있어, "경기 지역 접수 중인 84㎡ 5억 이하 공고" 같은
+질의를 API 조회나 상세 페이지 스크래핑 없이 인덱스 쿼리 한 번으로 처리합니다.
+
+    python -m retrieval_graph.announcement_store --cities 서울,경기
+"""
+
+# region    '기본 라이브러리'
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from itertools import groupby, islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# endregion
+# region    'LangChain 라이브러리'
+from langchain_core.pydantic_v1 import BaseModel, Field
+
+# endregion
+# region    'LangGraph 라이브러리'
+from retrieval_graph.announcement_cache import detail_key
+from retrieval_graph.announcement_feed import (
+    diff_announcements,
+    mark_seen,
+    record_changes,
+    withdraw_missing,
+)
+from retrieval_graph.records import SPECIAL_SUPPLY_COLUMNS, Announcement, to_count
+from retrieval_graph.rtms_cache import get_connection
+from retrieval_graph.tools_apt_list import (
+    build_announcement,
+    fetch_supply_details,
+    iter_announcements,
+)
+
+# endregion
+
+
+logger = logging.getLogger(__name__)
+
+CITIES                = ['서울', '부산', '대구', '인천', '광주', '대전', '울산', '세종', '경기',
+                         '강원', '충북', '충남', '전북', '전남', '경북', '경남', '제주']
+INITIAL_DAYS          = 30            # 처음 동기화할 때 조회할 모집공고일 범위
+OVERLAP_DAYS          = 3             # 늦게 등록되는 공고를 위해 마지막 모집공고일 이전 며칠을 다시 조회
+DEFAULT_SYNC_INTERVAL = 60 * 60       # 조회 시 동기화 최소 간격(초)
+SYNC_BATCH            = 8             # 상세 페이지 동시 조회 단위
+
+
+def _ensure_store_schema(conn) -> None:
+    conn.executescript(
+        '''
+        CREATE TABLE IF NOT EXISTS announcement (
+            house_manage_no    TEXT    PRIMARY KEY,
+            pblanc_no          TEXT    NOT NULL,
+            sido               TEXT    NOT NULL,
+            lawd_cd            INTEGER,
+            house_nm           TEXT    NOT NULL,
+            rcrit_pblanc_de    TEXT    NOT NULL,
+            rcept_bgnde        TEXT,
+            rcept_endde        TEXT,
+            przwner_presnatn_de TEXT,
+            item               TEXT    NOT NULL,
+            synced_at          REAL    NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS announcement_sido_endde ON announcement (sido, rcept_endde);
+        CREATE INDEX IF NOT EXISTS announcement_lawd_endde ON announcement (lawd_cd, rcept_endde);
+        CREATE INDEX IF NOT EXISTS announcement_pblanc_de  ON announcement (rcrit_pblanc_de);
+        CREATE INDEX IF NOT EXISTS announcement_schedule   ON announcement (rcept_bgnde, rcept_endde);
+
+        CREATE TABLE IF NOT EXISTS announcement_unit (
+            house_manage_no   TEXT    NOT NULL,
+            house_type        TEXT    NOT NULL,
+            exclusive_area    INTEGER NOT NULL,                -- 전용면적(㎡) 정수부, 주택형 '084.9900A' → 84
+            supply_area       REAL,                            -- 주택공급면적(㎡)
+            price             INTEGER,                         -- 분양가(최고가 기준, 만원)
+            general_units     INTEGER NOT NULL DEFAULT 0,      -- 일반 공급세대수
+            special_breakdown TEXT    NOT NULL DEFAULT '[]',   -- 특별공급 세부 세대수 JSON 목록 (records.SPECIAL_SUPPLY_COLUMNS 순서, 테이블이 없으면 빈 목록)
+            PRIMARY KEY (house_manage_no, house_type)
+        );
+        CREATE INDEX IF NOT EXISTS announcement_unit_area_price ON announcement_unit (exclusive_area, price);
+        CREATE INDEX IF NOT EXISTS announcement_unit_price      ON announcement_unit (price);
+
+        CREATE TABLE IF NOT EXISTS announcement_sync (
+            sido            TEXT PRIMARY KEY,
+            last_pblanc_de  TEXT,
+            synced_at       REAL NOT NULL
+        );
+        '''
+    )
+    _ensure_unit_counts(conn)
+
+
+def _ensure_unit_counts(conn) -> None:
+    """세대수 컬럼이 없던 이전 저장소는 컬럼을 추가하고, 저장된 분양정보(item)의 평형별 세대수로 한 번 채움."""
+    if 'general_units' in {row[1] for row in conn.execute('PRAGMA table_info(announcement_unit)')}:
+        return
+    with conn:
+        conn.execute('ALTER TABLE announcement_unit ADD COLUMN general_units INTEGER NOT NULL DEFAULT 0')
+        conn.execute("ALTER TABLE announcement_unit ADD COLUMN special_breakdown TEXT NOT NULL DEFAULT '[]'")
+        for house_manage_no, item in conn.execute('SELECT house_manage_no, item FROM announcement').fetchall():
+            for house_type, unit in json.loads(item).get('평형별 공급대상 및 분양가', {}).items():
+                special = unit.get('특별 공급세대수', {})
+                conn.execute(
+                    'UPDATE announcement_unit SET general_units=?, special_breakdown=? WHERE house_manage_no=? AND house_type=?',
+                    (
+                        to_count(unit.get('일반 공급세대수', '')),
+                        json.dumps([to_count(special[column]) for column in SPECIAL_SUPPLY_COLUMNS if column in special]),
+                        house_manage_no,
+                        house_type,
+                    ),
+                )
+
+
+def upsert_announcement(conn, record: Announcement) -> None:
+    """평형 정보가 채워진 분양공고를 주택관리번호 기준으로 저장."""
+    item = record.to_dict()
+    conn.execute(
+        'INSERT OR REPLACE INTO announcement VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (
+            record.house_manage_no,
+            record.pblanc_no,
+            record.sido,
+            record.lawd_cd,
+            record.house_nm,
+            record.rcrit_pblanc_de,
+            record.rcept_bgnde,
+            record.rcept_endde,
+            item['당첨자 발표일'],
+            json.dumps(item, ensure_ascii=False),
+            time.time(),
+        ),
+    )
+    conn.execute('DELETE FROM announcement_unit WHERE house_manage_no=?', (record.house_manage_no,))
+    conn.executemany(
+        'INSERT INTO announcement_unit VALUES (?, ?, ?, ?, ?, ?, ?)',
+        [
+            (record.house_manage_no, unit.house_type, unit.area_m2, unit.supply_area, unit.price, unit.general_units, json.dumps(unit.special_breakdown))
+            for unit in record.units
+        ],
+    )
+
+
+def sync_city(city: str) -> int:
+    """지역의 분양공고를 마지막으로 동기화한 모집공고일 이후만 조회하여, 신규/변경된 공고만 저장합니다.
+
+    조회 범위에서 사라진 공고는 철회로 보고 삭제하며, 변경 내역은 announcement_feed 에 기록됩니다.
+    상세 조회에 실패한 공고는 저장하지 않고 다음 동기화에서 다시 조회합니다. 저장한(신규/변경) 공고 수를 반환합니다.
+    """
+    conn = get_connection()
+    _ensure_store_schema(conn)
+
+    row = conn.execute('SELECT last_pblanc_de FROM announcement_sync WHERE sido=?', (city,)).fetchone()
+    if row and row[0]:
+        since = (datetime.strptime(row[0], '%Y-%m-%d') - timedelta(days=OVERLAP_DAYS)).strftime('%Y-%m-%d')
+    else:
+        since = (datetime.now() - timedelta(days=INITIAL_DAYS)).strftime('%Y-%m-%d')
+
+    count          = 0
+    synced_at      = time.time()
+    last_pblanc_de = row[0] if row else None
+    retry_dates    = []   # 상세 조회에 실패한 공고의 모집공고일
+    announcements  = iter_announcements(city, since=since)
+    while True:
+        batch = list(islice(announcements, SYNC_BATCH))
+        if not batch:
+            break
+
+        # 내용 해시가 같은 공고는 상세 조회/저장을 건너뜀
+        changes = diff_announcements(conn, batch)
+        records = [build_announcement(apt_info) for _, apt_info in changes]
+        details = fetch_supply_details([record.announcement_url for record in records])
+
+        # 상세 조회에 실패한 공고는 저장/해시 기록을 미뤄 다음 동기화에서 다시 조회
+        failed = {record.announcement_url for record, units in zip(records, details) if units is None}
+        with conn:
+            for record, units in zip(records, details):
+                if units is not None:
+                    upsert_announcement(conn, record._replace(units=tuple(units)))
+            record_changes(
+                conn, city,
+                [apt_info for apt_info in batch if apt_info['PBLANC_URL'] not in failed],
+                [(change, apt_info) for change, apt_info in changes if apt_info['PBLANC_URL'] not in failed],
+                synced_at,
+            )
+            mark_seen(conn, failed, synced_at)
+        last_pblanc_de = max([last_pblanc_de or ''] + [apt_info['RCRIT_PBLANC_DE'] for apt_info in batch])
+        retry_dates   += [apt_info['RCRIT_PBLANC_DE'] for _, apt_info in changes if apt_info['PBLANC_URL'] in failed]
+        count         += len(changes) - len(failed)
+
+    # 실패한 공고가 다음 동기화의 조회 범위에 들어오도록 마지막 모집공고일을 당김
+    if retry_dates:
+        last_pblanc_de = min([last_pblanc_de] + retry_dates)
+
+    with conn:
+        for url in withdraw_missing(conn, city, since, synced_at):
+            key = detail_key(url)
+            if key:
+                conn.execute('DELETE FROM announcement WHERE house_manage_no=?', (key[0],))
+                conn.execute('DELETE FROM announcement_unit WHERE house_manage_no=?', (key[0],))
+        conn.execute('INSERT OR REPLACE INTO announcement_sync VALUES (?, ?, ?)', (city, last_pblanc_de, synced_at))
+    return count
+
+
+def sync_if_stale(city: str, interval: Optional[float] = None) -> None:
+    """마지막 동기화 후 interval(초, 기본 ANNOUNCEMENT_SYNC_INTERVAL)이 지났으면 동기화."""
+    interval = int(os.getenv('ANNOUNCEMENT_SYNC_INTERVAL', DEFAULT_SYNC_INTERVAL)) if interval is None else interval
+    conn     = get_connection()
+    _ensure_store_schema(conn)
+
+    row = conn.execute('SELECT synced_at FROM announcement_sync WHERE sido=?', (city,)).fetchone()
+    if row is None or time.time() - row[0] >= interval:
+        sync_city(city)
+
+
+def find_announcements(
+    city: Optional[str] = None,
+    lawd_cd: Optional[int] = None,
+    max_price: Optional[int] = None,
+    exclusive_area: Optional[int] = None,
+    open_on: Optional[str] = None,
+    limit: int = 20,
+) -> List[dict]:
+    """저장된 분양공고 검색 (인덱스 쿼리 1회).
+
+    open_on(YYYY-MM-DD) 기준 청약접수가 끝나지 않은 공고 중 조건에 맞는 평형이 있는 공고를 접수 시작일 순으로 반환하며,
+    각 항목의 '조건에 맞는 주택형' 에 해당 평형 목록을 담습니다.
+    면적/분양가 조건이 없으면 평형 정보가 아직 없는 공고(상세 조회 실패/대기)도 포함합니다.
+    """
+    conditions = ['a.rcept_endde >= ?']
+    params     = [open_on or datetime.now().strftime('%Y-%m-%d')]
+    if city:
+        conditions.append('a.sido = ?')
+        params.append(city)
+    if lawd_cd:
+        conditions.append('a.lawd_cd = ?')
+        params.append(int(lawd_cd))
+    if exclusive_area:
+        conditions.append('u.exclusive_area = ?')
+        params.append(int(exclusive_area))
+    if max_price:
+        conditions.append('u.price <= ?')
+        params.append(int(max_price))
+
+    conn = get_connection()
+    _ensure_store_schema(conn)
+    rows = conn.execute(
+        f'''
+        SELECT a.item, GROUP_CONCAT(u.house_type)
+        FROM announcement a LEFT JOIN announcement_unit u ON u.house_manage_no = a.house_manage_no
+        WHERE {' AND '.join(conditions)}
+        GROUP BY a.house_manage_no
+        ORDER BY a.rcept_bgnde, a.house_manage_no
+        LIMIT ?
+        ''',
+        (*params, int(limit)),
+    ).fetchall()
+
+    ret = []
+    for item, house_types in rows:
+        item = json.loads(item)
+        item['조건에 맞는 주택형'] = sorted(house_types.split(',')) if house_types else []
+        ret.append(item)
+    return ret
+
+
+def iter_open_announcements(open_on: Optional[str] = None) -> Iterator[Tuple[str, str, str, List[Tuple[int, Tuple[int, ...]]]]]:
+    """open_on(YYYY-MM-DD, 기본 오늘) 기준 청약접수가 끝나지 않은 공고 목록.
+
+    각 항목은 (주택관리번호, 단지명, 청약접수종료일, 평형별 (일반 공급세대수, 특별공급 세부 세대수)) 입니다.
+    """
+    conn = get_connection()
+    _ensure_store_schema(conn)
+    rows = conn.execute(
+        '''
+        SELECT a.house_manage_no, a.house_nm, a.rcept_endde, u.general_units, u.special_breakdown
+        FROM announcement a LEFT JOIN announcement_unit u ON u.house_manage_no = a.house_manage_no
+        WHERE a.rcept_endde >= ?
+        ORDER BY a.house_manage_no, u.house_type
+        ''',
+        (open_on or datetime.now().strftime('%Y-%m-%d'),),
+    ).fetchall()
+    for (house_manage_no, house_nm, rcept_endde), units in groupby(rows, key=lambda row: row[:3]):
+        yield house_manage_no, house_nm, rcept_endde, [
+            (general, tuple(json.loads(special))) for *_, general, special in units if general is not None
+        ]
+
+
+# region    'Tool 정의'
+class searchAPTListInput(BaseModel):
+    """분양공고 조건 검색 Tool의 입력 정의."""
+
+    city: str           = Field(default="", description="한국의 시/도 기준 도시명. 예: '서울', '경기', etc.")
+    max_price: int      = Field(default=0, description="최대 분양가(만원), 0이면 제한 없음. 예: 5억 → 50000")
+    exclusive_area: int = Field(default=0, description="전용면적(㎡) 정수, 0이면 제한 없음. 예: 84")
+    limit: int          = Field(default=5, description="최대 조회 건수")
+
+
+def search_apt_list(city: str = "", max_price: int = 0, exclusive_area: int = 0, limit: int = 5) -> dict:
+    """로컬 분양공고 저장소에서 청약접수 중인 공고를 조건(지역, 분양가, 전용면적)으로 검색합니다.
+
+    지역을 지정하면 해당 지역을 먼저 증분 동기화하고, 지정하지 않으면 저장된 전체 공고에서 검색합니다.
+    동기화에 실패하면 저장된 공고로 검색하고 실패 내용을 'sync' 에 담으며, 검색 결과도 없으면 오류를 반환합니다.
+    """
+    sync_error = None
+    if city:
+        try:
+            sync_if_stale(city)
+        except Exception as e:
+            logger.warning('분양공고 동기화 실패: %s (%s)', city, e)
+            sync_error = {'status': 'error', 'message': f'분양공고 동기화 실패: {str(e)}'}
+
+    try:
+        items = find_announcements(city=city or None, max_price=max_price or None, exclusive_area=exclusive_area or None, limit=limit)
+    except sqlite3.Error as e:
+        return {'status': 'error', 'message': f'분양공고 저장소 조회 실패: {str(e)}'}
+
+    if sync_error and not items:
+        return sync_error
+    ret = {'status': 'success', 'count': len(items), 'apt_list': items}
+    if sync_error:
+        ret['sync'] = sync_error
+    return ret
+# endregion
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """분양공고 저장소 동기화 CLI 진입점."""
+    parser = argparse.ArgumentParser(description='분양공고 로컬 저장소 증분 동기화')
+    parser.add_argument('--cities', type=str, default='', help='동기화할 지역 목록 (쉼표 구분, 기본: 전체)')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    cities: Iterable[str] = [city.strip() for city in args.cities.split(',') if city.strip()] or CITIES
+    for city in cities:
+        logger.info('%s: %d건 동기화', city, sync_city(city))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
-import os
 import dotenv
+from functools import cache
 
 from langchain.embeddings import OpenAIEmbeddings
 from langchain.vectorstores.elasticsearch import ElasticsearchStore
@@ -8,9 +8,22 @@ from langchain.chat_models import ChatOpenAI
 from langchain.agents import initialize_agent, AgentType
 from langchain.tools import Tool, tool
 
+from retrieval_graph.es_client import get_es_client
+
 dotenv.load_dotenv('../../.env')
 
 
+@cache
+def policy_retriever():
+    """공용 ES 클라이언트를 쓰는 정책 문서 retriever (프로세스당 한 번 생성)."""
+    vector_store = ElasticsearchStore(
+        es_connection = get_es_client(),
+        index_name    = 'embedding_apply',
+        embedding     = OpenAIEmbeddings(),
+    )
+    return vector_store.as_retriever(search_kwargs={'k': 10})
+
+
 @tool
 def retrievePolicy(query: str) -> str:
     """
@@ -20,16 +33,7 @@ def retrievePolicy(query: str) -> str:
     query (required): question for check.
     """
 
-    embedding = OpenAIEmbeddings()
-
-    vecotr_store = ElasticsearchStore(
-        es_url     = os.environ['ELASTICSEARCH_URL'],
-        es_api_key = os.environ['ELASTICSEARCH_API_KEY'],
-        index_name = 'embedding_apply',
-        embedding  = embedding,
-    )
-
-    retriever = vecotr_store.as_retriever(search_kwargs={'k': 10})
+    retriever = policy_retriever()
 
     docs = retriever.get_relevant_documents(query)
 
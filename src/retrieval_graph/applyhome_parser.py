@@ -0,0 +1,78 @@
+"""청약홈 분양공고 상세 페이지 파서."""
+
+# region    '기본 라이브러리'
+from typing import List
+
+import lxml.html
+
+# endregion
+# region    'LangGraph 라이브러리'
+from retrieval_graph.records import UnitType, to_count, to_int, units_to_dict
+
+# endregion
+
+
+def table_region(html: str) -> str:
+    """<body> 시작부터 마지막 </table> 까지의 구간.
+
+    <head> 와 마지막 테이블 이후의 푸터/스크립트 마크업은 파싱하지 않습니다.
+    (구간 안의 <script> 는 태그째 포함되므로 문자열 속 '<tbody>' 를 테이블로 오인하지 않습니다.)
+    """
+    end = html.rfind('</table>')
+    if end < 0:
+        return ''
+    start = html.find('<body')
+    start = 0 if start < 0 or start > end else start
+    return html[start:end + len('</table>')]
+
+
+def table_rows(html: str) -> List[List[List[str]]]:
+    """모든 <tbody> 의 행별 셀 텍스트 목록 (셀마다 한 번만 추출)."""
+    region = table_region(html)
+    if not region:
+        return []
+
+    root = lxml.html.fromstring(region)
+    return [
+        [[td.text_content().strip() for td in tr.iter('td')] for tr in tbody.iter('tr')]
+        for tbody in root.iter('tbody')
+    ]
+
+
+def parse_unit_types(html: str) -> List[UnitType]:
+    """분양공고 상세 페이지에서 평형별 공급대상 및 분양가 추출 (숫자는 여기서 한 번만 변환).
+
+    tbody 가 6개면 [2] 공급대상, [3] 특별공급, [4] 분양가, 아니면 특별공급 없이 [2] 공급대상, [3] 분양가 입니다.
+    """
+    tables = table_rows(html)
+
+    if len(tables) == 6:
+        supply_all, supply_special, supply_costs = tables[2][:-1], tables[3], tables[4]
+    else:
+        supply_all, supply_special, supply_costs = tables[2][:-1], [], tables[3]
+
+    # region    '공급규모' (colspan 등으로 셀이 모자란 행은 건너뜀)
+    units = {}
+    for cells in supply_all:
+        if len(cells) < 6:
+            continue
+        unit = UnitType.from_cells(*cells[-6:-1])
+        units[unit.house_type] = unit
+    # endregion
+
+    # region    '특별공급 규모'
+    for cells in supply_special:
+        units[cells[0]] = units[cells[0]]._replace(special_breakdown=tuple(map(to_count, cells[1:10])))
+    # endregion
+
+    # region    '분양가' (분양가가 '-' 등으로 비어 있으면 None 으로 두어 평당가 평균에서 제외)
+    for cells in supply_costs:
+        units[cells[0]] = units[cells[0]]._replace(price=to_int(cells[1]))
+    # endregion
+
+    return list(units.values())
+
+
+def parse_supply_detail(html: str) -> dict:
+    """평형별 공급대상 및 분양가를 기존 Tool 응답 형식(한글 키 dict)으로 반환."""
+    return units_to_dict(parse_unit_types(html))
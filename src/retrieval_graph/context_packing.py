@@ -0,0 +1,72 @@
+"""청약 순위 판단 검색 결과 병합 및 프롬프트 컨텍스트 구성."""
+
+# region    '기본 라이브러리'
+import hashlib
+import os
+from functools import cache
+from typing import Callable, Dict, List, Optional, Sequence
+
+# endregion
+
+
+RRF_K                = 60      # Reciprocal Rank Fusion 상수 (순위 차이를 완만하게)
+DEFAULT_TOKEN_BUDGET = 3000    # LLM 프롬프트에 넣을 검색 문서 토큰 상한
+CHUNK_SEPARATOR      = '\n\n'
+CHARS_PER_TOKEN      = 1.5     # tiktoken 을 쓸 수 없을 때 근사치 (한국어 기준 보수적으로)
+
+
+def token_budget() -> int:
+    """프롬프트에 넣을 검색 문서 토큰 상한 (환경변수 RANK_CONTEXT_TOKENS)."""
+    return int(os.getenv('RANK_CONTEXT_TOKENS', DEFAULT_TOKEN_BUDGET))
+
+
+@cache
+def _token_counter(model: str) -> Callable[[str], int]:
+    """모델 토크나이저 기반 토큰 수 계산 함수, 인코딩을 불러올 수 없으면(오프라인 등) 글자 수 근사."""
+    try:
+        import tiktoken
+
+        encoding = tiktoken.encoding_for_model(model)
+        return lambda text: len(encoding.encode(text))
+    except Exception:
+        return lambda text: int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def count_tokens(text: str, model: str = 'gpt-4o-mini') -> int:
+    """모델 토크나이저 기준 토큰 수."""
+    return _token_counter(model)(text)
+
+
+def fuse_hits(hit_lists: Sequence[List[dict]], k: int = RRF_K) -> List[dict]:
+    """질의별 검색 결과를 본문 해시로 중복 제거하고 Reciprocal Rank Fusion 점수(Σ 1 / (k + 순위)) 순으로 정렬.
+
+    여러 질의에서 함께 검색된 청크일수록 앞에 오며, 같은 본문이 다른 _id 로 색인된 경우도 하나로 합칩니다.
+    """
+    scores: Dict[str, float] = {}
+    hits: Dict[str, dict]    = {}
+    for hit_list in hit_lists:
+        seen = set()   # 한 질의 안의 중복은 가장 높은 순위만 반영
+        for rank, hit in enumerate(hit_list, 1):
+            key = hashlib.sha1(hit['_source']['text'].encode('utf-8')).hexdigest()
+            if key in seen:
+                continue
+            seen.add(key)
+            hits.setdefault(key, hit)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+
+    return [hits[key] for key in sorted(scores, key=lambda key: -scores[key])]
+
+
+def pack_chunks(texts: Sequence[str], budget: Optional[int] = None, model: str = 'gpt-4o-mini') -> str:
+    """앞에서부터 토큰 예산 안에 들어가는 청크만 이어 붙임 (예산을 넘는 청크는 건너뛰고 다음 청크 시도)."""
+    budget    = token_budget() if budget is None else budget
+    separator = count_tokens(CHUNK_SEPARATOR, model)
+    packed    = []
+    used      = 0
+    for text in texts:
+        cost = count_tokens(text, model) + (separator if packed else 0)
+        if used + cost > budget:
+            continue
+        packed.append(text)
+        used += cost
+    return CHUNK_SEPARATOR.join(packed)
@@ -0,0 +1,204 @@
+"""검색 질의 임베딩 캐시.
+
+청약 순위 판단 검색은 '신혼부부', '무주택', '다자녀' 처럼 같은 키워드가 반복되므로,
+(모델, 정규화한 질의) 기준으로 임베딩을 2단계로 캐시하여 임베딩 API 왕복을 생략합니다.
+
+- 1단계: 프로세스 내 LRU (EMBEDDING_LRU_SIZE, 기본 1024개)
+- 2단계: RTMS 캐시 디렉터리의 float32 벡터 파일(메모리 매핑) + SQLite 색인 (프로세스 재시작 후에도 유지)
+"""
+
+# region    '기본 라이브러리'
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import cache
+from typing import List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:   # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+
+# endregion
+# region    'LangChain 라이브러리'
+from langchain_openai import OpenAIEmbeddings
+
+# endregion
+# region    'LangGraph 라이브러리'
+from retrieval_graph.rtms_cache import cache_path, get_connection
+
+# endregion
+
+
+DEFAULT_EMBEDDING_MODEL = 'text-embedding-ada-002'
+LRU_SIZE                = int(os.getenv('EMBEDDING_LRU_SIZE', 1024))
+
+_append_lock = threading.Lock()
+_vectors     = {}              # 벡터 파일 경로 → np.memmap (파일이 커지면 다시 매핑)
+_lru         = OrderedDict()   # (모델, 정규화한 질의) → 벡터
+_lru_lock    = threading.Lock()
+
+
+def _ensure_embedding_schema(conn) -> None:
+    conn.execute(
+        '''
+        CREATE TABLE IF NOT EXISTS embedding (
+            model      TEXT    NOT NULL,
+            text       TEXT    NOT NULL,
+            row        INTEGER NOT NULL,   -- 벡터 파일의 행 번호
+            dim        INTEGER NOT NULL,
+            created_at REAL    NOT NULL,
+            PRIMARY KEY (model, text)
+        )
+        '''
+    )
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 질의 정규화 (NFKC, 앞뒤 공백 제거, 연속 공백 축약)."""
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFKC', text)).strip()
+
+
+@cache
+def _embedding_model(model: str) -> OpenAIEmbeddings:
+    """모델별 임베딩 클라이언트 (검색마다 새로 만들지 않음)."""
+    return OpenAIEmbeddings(model=model, api_key=os.getenv('OPENAI_API_KEY'))
+
+
+def _vector_path(model: str, dim: int) -> str:
+    name = re.sub(r'[^0-9A-Za-z_.-]', '_', model)
+    return os.path.join(os.path.dirname(cache_path()) or '.', f'embedding-{name}-{dim}.f32')
+
+
+def _read_vector(path: str, row: int, dim: int) -> Optional[np.ndarray]:
+    vectors = _vectors.get(path)
+    if vectors is None or vectors.shape[0] < (row + 1) * dim:
+        if not os.path.exists(path) or not os.path.getsize(path):
+            return None
+        vectors = _vectors[path] = np.memmap(path, dtype=np.float32, mode='r')
+    if vectors.shape[0] < (row + 1) * dim:
+        return None
+    return vectors[row * dim:(row + 1) * dim]
+
+
+def _lru_get(key: Tuple[str, str]) -> Optional[Tuple[float, ...]]:
+    with _lru_lock:
+        vector = _lru.get(key)
+        if vector is not None:
+            _lru.move_to_end(key)
+        return vector
+
+
+def _lru_put(key: Tuple[str, str], vector: Tuple[float, ...]) -> None:
+    with _lru_lock:
+        _lru[key] = vector
+        _lru.move_to_end(key)
+        while len(_lru) > LRU_SIZE:
+            _lru.popitem(last=False)
+
+
+def _load_embedding(conn, model: str, text: str) -> Optional[Tuple[float, ...]]:
+    row = conn.execute('SELECT row, dim FROM embedding WHERE model=? AND text=?', (model, text)).fetchone()
+    if row is None:
+        return None
+    vector = _read_vector(_vector_path(model, row[1]), *row)
+    return tuple(vector.tolist()) if vector is not None else None
+
+
+@contextmanager
+def _file_lock(f, path: str):
+    """프로세스 간 배타 잠금.
+
+    POSIX 는 벡터 파일에 flock, Windows 는 msvcrt 가 잠근 범위를 다른 프로세스가
+    읽지 못하므로(메모리 매핑 조회) 옆에 둔 '.lock' 파일의 첫 바이트를 잠급니다.
+    """
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+        return
+
+    with open(f'{path}.lock', 'a+b') as lock:
+        lock.seek(0)
+        while True:
+            try:
+                msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)   # 10초 동안 재시도 후 OSError
+                break
+            except OSError:
+                continue
+        try:
+            yield
+        finally:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _store_embeddings(conn, model: str, embedded: List[Tuple[str, List[float]]]) -> List[Tuple[float, ...]]:
+    """벡터 파일 끝에 추가하고 SQLite 색인에 행 번호 기록.
+
+    벡터 파일은 같은 RTMS_CACHE_PATH 를 쓰는 모든 워커 프로세스가 공유하므로, 파일 잠금(_file_lock) 안에서
+    행 번호 계산 → 추가 → INSERT → commit 까지 마쳐 다른 프로세스가 같은 행 번호를 기록하지 않도록 합니다.
+    """
+    vectors = [np.asarray(values, dtype=np.float32) for _, values in embedded]
+    if not vectors:
+        return []
+
+    path = _vector_path(model, vectors[0].size)
+    with _append_lock, open(path, 'ab') as f, _file_lock(f, path):
+        # 중간에 끊긴 쓰기(색인에 기록되지 않은 불완전한 행)는 잘라냄
+        size = f.seek(0, os.SEEK_END)
+        if size % vectors[0].nbytes:
+            f.truncate(size - size % vectors[0].nbytes)
+            size = f.seek(0, os.SEEK_END)
+        row = size // vectors[0].nbytes
+
+        for vector in vectors:
+            f.write(vector.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO embedding VALUES (?, ?, ?, ?, ?)',
+                [(model, text, row + i, vector.size, time.time()) for i, ((text, _), vector) in enumerate(zip(embedded, vectors))],
+            )
+    return [tuple(vector.tolist()) for vector in vectors]
+
+
+def embed_queries(texts: List[str], model: str = DEFAULT_EMBEDDING_MODEL) -> List[List[float]]:
+    """여러 질의 임베딩 (LRU → 벡터 파일 순으로 조회하고, 남은 질의만 embed_documents 한 번으로 요청, float32 정밀도)."""
+    keys    = [normalize_text(text) for text in texts]
+    vectors = {}
+    conn    = None
+    for key in dict.fromkeys(keys):
+        vector = _lru_get((model, key))
+        if vector is None:
+            if conn is None:
+                conn = get_connection()
+                _ensure_embedding_schema(conn)
+            vector = _load_embedding(conn, model, key)
+        if vector is not None:
+            vectors[key] = vector
+
+    misses = [key for key in dict.fromkeys(keys) if key not in vectors]
+    if misses:
+        embedded = _embedding_model(model).embed_documents(misses)
+        vectors.update(zip(misses, _store_embeddings(conn, model, list(zip(misses, embedded)))))
+
+    for key, vector in vectors.items():
+        _lru_put((model, key), vector)
+    return [list(vectors[key]) for key in keys]
+
+
+def embed_query(text: str, model: str = DEFAULT_EMBEDDING_MODEL) -> List[float]:
+    """질의 임베딩 (embed_queries 참고)."""
+    return embed_queries([text], model)[0]
@@ -0,0 +1,138 @@
+"""Elasticsearch 클라이언트/리트리버 공유."""
+
+# region    '기본 라이브러리'
+import hashlib
+import logging
+import os
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from elasticsearch import Elasticsearch
+
+# endregion
+# region    'LangChain 라이브러리'
+from langchain_elasticsearch import ElasticsearchRetriever
+
+# endregion
+
+
+logger = logging.getLogger(__name__)
+
+# region    'Client 설정'
+CONNECTIONS_PER_NODE = int(os.getenv('ES_CONNECTIONS_PER_NODE', 16))   # 노드별 keep-alive 연결 수
+REQUEST_TIMEOUT      = float(os.getenv('ES_REQUEST_TIMEOUT', 10))
+MAX_RETRIES          = 2
+HTTP_COMPRESS        = os.getenv('ES_HTTP_COMPRESS', '1') == '1'        # kNN 질의 벡터가 커서 요청 본문 gzip 압축
+SNIFF                = os.getenv('ES_SNIFF', '0') == '1'               # 자체 운영 클러스터에서만 (Elastic Cloud/프록시 뒤에서는 끔)
+
+_lock       = threading.Lock()
+_clients    = {}   # (url, 인증 해시) → Elasticsearch
+_retrievers = {}   # (url, index, 인증 해시, body_func, content_field) → ElasticsearchRetriever
+# endregion
+
+
+def _connection_params(url: Optional[str], api_key: Optional[str], username: Optional[str], password: Optional[str]) -> Tuple[str, dict]:
+    """인자가 없으면 환경변수(ELASTICSEARCH_URL / ELASTICSEARCH_API_KEY / ELASTICSEARCH_USER / ELASTICSEARCH_PASSWORD) 사용."""
+    url = url or os.getenv('ELASTICSEARCH_URL')
+    if not url:
+        raise ValueError('ELASTICSEARCH_URL 이 설정되지 않았습니다.')
+
+    # 인자로 받은 인증 정보 → 환경변수 순, 각각 API Key 우선
+    if api_key:
+        return url, {'api_key': api_key}
+    if username and password:
+        return url, {'basic_auth': (username, password)}
+    if os.getenv('ELASTICSEARCH_API_KEY'):
+        return url, {'api_key': os.getenv('ELASTICSEARCH_API_KEY')}
+    if os.getenv('ELASTICSEARCH_USER') and os.getenv('ELASTICSEARCH_PASSWORD'):
+        return url, {'basic_auth': (os.getenv('ELASTICSEARCH_USER'), os.getenv('ELASTICSEARCH_PASSWORD'))}
+    return url, {}
+
+
+def _auth_hash(auth: dict) -> str:
+    # 레지스트리 키에 인증 정보 원문을 두지 않음
+    return hashlib.sha256(repr(sorted(auth.items())).encode('utf-8')).hexdigest()[:16]
+
+
+def get_es_client(url: str = None, api_key: str = None, username: str = None, password: str = None) -> Elasticsearch:
+    """(url, 인증) 별 프로세스 공용 Elasticsearch 클라이언트 반환.
+
+    연결 풀(keep-alive)을 스레드 간에 공유하므로 연결 비용은 워커 프로세스당 한 번만 듭니다.
+    """
+    url, auth = _connection_params(url, api_key, username, password)
+    key       = (url, _auth_hash(auth))
+    client    = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = Elasticsearch(
+                hosts                 = [url],
+                connections_per_node  = CONNECTIONS_PER_NODE,
+                request_timeout       = REQUEST_TIMEOUT,
+                max_retries           = MAX_RETRIES,
+                retry_on_timeout      = True,
+                http_compress         = HTTP_COMPRESS,
+                sniff_on_start        = SNIFF,
+                sniff_on_node_failure = SNIFF,
+                **auth,
+            )
+            _clients[key] = client
+    return client
+
+
+def get_retriever(
+    index_name: str,
+    body_func: Callable[[str], Dict],
+    content_field: str = 'text',
+    url: str = None,
+    api_key: str = None,
+    username: str = None,
+    password: str = None,
+) -> ElasticsearchRetriever:
+    """(url, index, 인증, body_func, content_field) 별 공용 ElasticsearchRetriever 반환 (공용 클라이언트 사용)."""
+    url, auth = _connection_params(url, api_key, username, password)
+    key       = (url, index_name, _auth_hash(auth), body_func, content_field)
+    retriever = _retrievers.get(key)
+    if retriever is not None:
+        return retriever
+
+    client = get_es_client(url, api_key, username, password)
+    with _lock:
+        retriever = _retrievers.get(key)
+        if retriever is None:
+            retriever = _retrievers[key] = ElasticsearchRetriever(
+                es_client     = client,
+                index_name    = index_name,
+                body_func     = body_func,
+                content_field = content_field,
+            )
+    return retriever
+
+
+def health_check(url: str = None, api_key: str = None, username: str = None, password: str = None) -> bool:
+    """공용 클라이언트로 클러스터 응답 여부 확인. 실패하면 해당 클라이언트와 retriever 를 버려 다음 호출 때 다시 연결합니다."""
+    client = get_es_client(url, api_key, username, password)
+    if client.ping():
+        return True
+
+    logger.warning('Elasticsearch 응답 없음: %s', url or os.getenv('ELASTICSEARCH_URL'))
+    url, auth = _connection_params(url, api_key, username, password)
+    with _lock:
+        _clients.pop((url, _auth_hash(auth)), None)
+        for key in [key for key in _retrievers if key[0] == url and key[2] == _auth_hash(auth)]:
+            del _retrievers[key]
+    client.close()
+    return False
+
+
+def close_all() -> None:
+    """모든 공용 클라이언트 연결 종료 (워커 종료 시)."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _retrievers.clear()
+    for client in clients:
+        client.close()
@@ -38,8 +38,9 @@ from retrieval_graph import prompts
 
 from retrieval_graph.tools_rank import SearchRankQuery, retrieve_appropriate_rank
 from retrieval_graph.tools_apt_list import getAPTListInput, get_apt_list
-from retrieval_graph.tools_api_sale_price import calcAvgPyungPriceInput, calc_avg_pyung_price
-from retrieval_graph.tools_api_perplexity import QueryPerplexityInput, query_perplexity_tool
+from retrieval_graph.announcement_store import searchAPTListInput, search_apt_list
+from retrieval_graph.tools_api_sale_price import calcAvgPyungPriceInput, calc_avg_pyung_price, calc_market_stats
+from retrieval_graph.tools_api_perplexity import QueryPerplexityInput, query_perplexity_stream_tool
 from retrieval_graph.report_tools import ApartmentReportInput, create_apartment_report_tool
 from retrieval_graph.calendar_tools import EventInput, create_event_tool
 # endregion
@@ -60,15 +61,27 @@ tools = [
         description = "사용자가 확인 요청한 지역의 아파트 분양정보를 조회합니다.",
         args_schema = getAPTListInput
     ),
+    StructuredTool.from_function(
+        name        = "search_apt_list",
+        func        = search_apt_list,
+        description = "청약접수 중인 아파트 분양공고를 지역, 최대 분양가(만원), 전용면적(㎡) 조건으로 검색합니다. (예: 경기 지역 84㎡ 5억 이하)",
+        args_schema = searchAPTListInput
+    ),
     StructuredTool.from_function(
         name        = "calc_avg_pyung_price",
         func        = calc_avg_pyung_price,
         description = "아파트 분양 단지의 법정동 코드와 읍면동 이름을 활용하여 해당지역 최근 3개월 아파트 실거래가 기준 평단가 평균을 조회합니다.",
         args_schema = calcAvgPyungPriceInput
     ),
+    StructuredTool.from_function(
+        name        = "calc_market_stats",
+        func        = calc_market_stats,
+        description = "아파트 분양 단지의 법정동 코드와 읍면동 이름을 활용하여 해당지역 최근 3개월 실거래가 기준 평단가 중앙값, 절사평균, 상하위 10% 가격과 전용면적/건축년도 구간별 시세 통계를 조회합니다.",
+        args_schema = calcAvgPyungPriceInput
+    ),
     StructuredTool.from_function(
         name        = "query_perplexity_tool",
-        func        = query_perplexity_tool,
+        func        = query_perplexity_stream_tool,   # 응답 조각을 custom 스트림으로 전달
         description = "최근 1년간 부동산 정보를 Perplexity를 통해 검색하고, 도시계획, 인프라 현황을 포함해 가치를 분석합니다.",
         args_schema = QueryPerplexityInput
     ),
@@ -6,11 +6,7 @@ and key functions for processing user inputs, generating queries, retrieving
 relevant documents, and formulating responses.
 """
 
-from datetime import datetime, timezone, timedelta
-import requests
 import json
-from bs4 import BeautifulSoup
-import os
 from typing import cast
 
 from langchain_core.documents import Document
@@ -27,7 +23,7 @@ from retrieval_graph.utils import format_docs, get_message_text, load_chat_model
 
 from langchain_core.tools import Tool, tool
 from langchain_core.agents import AgentAction
-from retrieval_graph.constants import AREA_CODE
+from retrieval_graph.tools_apt_list import iter_apt_list
 
 @tool
 def getAPTList(city: str) -> dict:
@@ -38,107 +34,8 @@ def getAPTList(city: str) -> dict:
         city: City names at the city/province level in the Korea. example: '서울', '경기', etc.
     """
 
-    base_url    = 'http://api.odcloud.kr/api'
-    serviceKey  = os.environ['DATA_GO_KR_SERVICE_KEY']
-    perPage     = 100
-    target_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-    today       = datetime.now().strftime('%Y-%m-%d')
-    target_area = city
-
-    url = f'{base_url}/ApplyhomeInfoDetailSvc/v1/getAPTLttotPblancDetail?serviceKey={serviceKey}'
-    url = f'{url}&perPage={perPage}'
-    url = f'{url}&cond[RCRIT_PBLANC_DE::GTE]={target_date}'
-    url = f'{url}&cond[SUBSCRPT_AREA_CODE_NM::EQ]={target_area}'
-    apt_list = requests.get(url).json()['data']
-
-    ret = []
-    for apt_info in apt_list:
-        if apt_info['RCEPT_ENDDE'] < today:
-            continue
-
-        area    = apt_info['HSSPLY_ADRES'].split()
-        area_cd = None
-        if ' '.join(area[:2]) in AREA_CODE.keys():
-            area_cd = AREA_CODE.get(' '.join(area[:2]))
-        elif ' '.join(area[:3]) in AREA_CODE.keys():
-            area_cd = AREA_CODE.get(' '.join(area[:3]))
-
-        item = {
-            '단지명'                     : apt_info['HOUSE_NM'],
-            '공급위치'                   : apt_info['HSSPLY_ADRES'],
-            '법정동코드'                 : area_cd,
-            '공급규모'                   : apt_info['TOT_SUPLY_HSHLDCO'],
-            '문의처'                     : apt_info['MDHS_TELNO'],
-            '모집공고일'                 : apt_info['RCRIT_PBLANC_DE'],
-            '특별공급 청약접수시작'      : apt_info['SPSPLY_RCEPT_BGNDE'],
-            '특별공급 청약접수종료'      : apt_info['SPSPLY_RCEPT_ENDDE'],
-            '1순위 해당지역 청약접수시작': apt_info['GNRL_RNK1_CRSPAREA_RCPTDE'],
-            '1순위 해당지역 청약접수종료': apt_info['GNRL_RNK1_CRSPAREA_ENDDE'],
-            '1순위 기타지역 청약접수시작': apt_info['GNRL_RNK1_ETC_AREA_RCPTDE'],
-            '1순위 기타지역 청약접수종료': apt_info['GNRL_RNK1_ETC_AREA_ENDDE'],
-            '2순위 해당지역 청약접수시작': apt_info['GNRL_RNK2_CRSPAREA_RCPTDE'],
-            '2순위 해당지역 청약접수종료': apt_info['GNRL_RNK2_CRSPAREA_ENDDE'],
-            '2순위 기타지역 청약접수시작': apt_info['GNRL_RNK2_ETC_AREA_RCPTDE'],
-            '2순위 기타지역 청약접수종료': apt_info['GNRL_RNK2_ETC_AREA_ENDDE'],
-            '당첨자 발표일'              : apt_info['PRZWNER_PRESNATN_DE'],
-            '계약 시작'                  : apt_info['CNTRCT_CNCLS_BGNDE'],
-            '계약 종료'                  : apt_info['CNTRCT_CNCLS_ENDDE'],
-            '시행사'                     : apt_info['BSNS_MBY_NM'],
-            '시공사'                     : apt_info['CNSTRCT_ENTRPS_NM'],
-            '아파트 홍보 URL'            : apt_info['HMPG_ADRES'],
-            '분양공고 URL'               : apt_info['PBLANC_URL'],
-            '평형별 공급대상 및 분양가'  : {},
-        }
-
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36'
-        }
-        apt_detail_info = BeautifulSoup(requests.get(apt_info['PBLANC_URL'], headers=headers).text, 'html.parser')
-        tables          = apt_detail_info.find_all('tbody')
-        if len(tables) == 6:
-            supply_all     = tables[2].find_all('tr')[:-1]
-            supply_special = tables[3].find_all('tr')
-            supply_costs   = tables[4].find_all('tr')
-        else:
-            supply_all     = tables[2].find_all('tr')[:-1]
-            supply_special = []
-            supply_costs   = tables[3].find_all('tr')
-
-        for supply_item in supply_all:
-            supply_columns = supply_item.find_all('td')
-            supply_columns = supply_columns[-6:]
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ] = {
-                '주택형'         : supply_columns[0].text.strip(),
-                '주택공급면적'   : supply_columns[1].text.strip(),
-                '전체 공급세대수': supply_columns[4].text.strip(),
-                '특별 공급세대수': {
-                    '전체': supply_columns[3].text.strip(),
-                },
-                '일반 공급세대수': supply_columns[2].text.strip(),
-            }
-
-        for supply_item in supply_special:
-            supply_columns = supply_item.find_all('td')
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['다자녀가구']     = supply_columns[1].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['신혼부부']       = supply_columns[2].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['생애최초']       = supply_columns[3].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['청년']           = supply_columns[4].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['노부모부양']     = supply_columns[5].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['신생아(일반형)'] = supply_columns[6].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['기관추천']       = supply_columns[7].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['이전기관']       = supply_columns[8].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['기타']           = supply_columns[9].text.strip()
-
-        for supply_item in supply_costs:
-            supply_columns = supply_item.find_all('td')
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['분양가(최고가 기준)'] = f'{supply_columns[1].text.strip()} 만원'
-
-        ret.append(item)
-
-    if len(ret):
-        return ret[0]
-    else:
-        return {}
+    record = next(iter_apt_list(city, open_only=True), None)
+    return record.to_dict() if record else {}
 
 tools = [
     Tool(
@@ -178,9 +75,9 @@ def execute_tools(
     outputs = []
     for tool_call in last_message.tool_calls:
         # 정의된 Tool 중에서 해당 Tool을 찾아 실행
-        for tool in tools:
-            if tool.name == tool_call['name']:
-                result = tool.invoke(tool_call['args'])
+        for candidate in tools:
+            if candidate.name == tool_call['name']:
+                result = candidate.invoke(tool_call['args'])
                 outputs.append(
                     ToolMessage(
                         content=json.dumps(result),
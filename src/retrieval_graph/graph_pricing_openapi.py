@@ -7,10 +7,8 @@ relevant documents, and formulating responses.
 """
 
 from datetime import datetime, timezone, timedelta
-import requests
 import json
 from bs4 import BeautifulSoup
-import os
 from typing import cast
 from dateutil.relativedelta import relativedelta
 
@@ -28,67 +26,15 @@ from retrieval_graph.utils import format_docs, get_message_text, load_chat_model
 
 from langchain_core.tools import Tool, tool
 from langchain_core.agents import AgentAction
+from retrieval_graph.address_resolver import resolve_address
 from retrieval_graph.constants import AREA_CODE
+from retrieval_graph.tools_api_sale_price import load_pyung_prices
 
 # import os
 from typing import List
 # import requests
-import xml.etree.ElementTree as ET
 # from langchain.tools import tool
 
-def fetch_api_data(year_month: int, area_code: int, pageNo: int = 1, numOfRows: int = 1000) -> str:
-    base_url = 'http://apis.data.go.kr/1613000/RTMSDataSvcAptTrade'
-    serviceKey = os.environ['DATA_GO_KR_SERVICE_KEY']
-
-    url = f"{base_url}/getRTMSDataSvcAptTrade?serviceKey={serviceKey}"
-    url += f"&LAWD_CD={area_code}"
-    url += f"&DEAL_YMD={year_month}"
-    url += f"&pageNo={pageNo}"
-    url += f"&numOfRows={numOfRows}"
-
-    response = requests.get(url, verify=False)
-    return response.text if response.status_code == 200 else None
-
-def parse_items(xml_text: str, target_umd: str) -> List[float]:
-    root = ET.fromstring(xml_text)
-    items = root.findall(".//item")
-    pyung_prices = []
-
-    for item in items:
-        umdNm = item.findtext("umdNm", "").strip()
-        if umdNm != target_umd:
-            continue
-
-        try:
-            area = float(item.findtext("excluUseAr", "0").strip())
-            amount = int(item.findtext("dealAmount", "0").replace(",", "").strip())
-            pyung_price = amount / (area / 3.3)
-            pyung_prices.append(pyung_price)
-        except (ValueError, ZeroDivisionError):
-            continue
-
-    return pyung_prices
-
-def get_all_items_for_month(year_month: int, area_code: int, target_umd: str) -> List[float]:
-    all_prices = []
-    page = 1
-
-    while True:
-        xml_data = fetch_api_data(year_month, area_code, pageNo=page)
-        if not xml_data:
-            break
-
-        root = ET.fromstring(xml_data)
-        total_count = int(root.findtext(".//totalCount", "0"))
-        prices = parse_items(xml_data, target_umd)
-        all_prices.extend(prices)
-
-        if page * 1000 >= total_count:
-            break
-        page += 1
-
-    return all_prices
-
 @tool
 # def calc_avg_pyung_price(months_yyyymm: List[int], area_code: int, umd_name: str) -> dict:
 def calc_avg_pyung_price(state: State) -> dict:
@@ -112,14 +58,10 @@ def calc_avg_pyung_price(state: State) -> dict:
     umd_name = new_state.calc_avg_pyung_price_input.get("umd_name")
 
     try:
-        all_pyung_prices = []
-
-        for year_month in months_yyyymm:
-            prices = get_all_items_for_month(year_month, area_code, umd_name)
-            all_pyung_prices.extend(prices)
+        all_pyung_prices = load_pyung_prices(months_yyyymm, area_code, umd_name)
 
-        if all_pyung_prices:
-            avg_price = round(sum(all_pyung_prices) / len(all_pyung_prices), 2)
+        if len(all_pyung_prices):
+            avg_price = round(float(all_pyung_prices.mean()), 2)
             print(f"{umd_name}의 평균 평당가: {avg_price:,.0f} 만원")
 
             new_state.calc_avg_pyung_price_output = {"status": "success", "avg_price": avg_price}
@@ -395,8 +337,7 @@ def getAPTList(state: State) -> State:
 
 # ===== 유틸 함수 =====
 def extract_umd_name(location: str) -> str:
-    parts = location.split()
-    return parts[2] if len(parts) >= 3 else ""
+    return resolve_address(location)[1] or ""
 
 def get_recent_months(n=3) -> List[int]:
     now = datetime.now()
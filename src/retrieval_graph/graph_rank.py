@@ -8,7 +8,6 @@ relevant documents, and formulating responses.
 
 from datetime import datetime, timezone
 import json
-import os
 from typing import cast
 
 from langchain_core.documents import Document
@@ -26,15 +25,11 @@ from retrieval_graph.utils import format_docs, get_message_text, load_chat_model
 from langchain_core.tools import Tool, tool
 from langchain_core.agents import AgentAction
 
-from langchain_openai import OpenAIEmbeddings
-from langchain_elasticsearch import ElasticsearchStore, ElasticsearchRetriever
+from retrieval_graph.embedding_cache import embed_query
+from retrieval_graph.es_client import get_retriever
 
 def hybrid_query(search_query: str):
-    embedding_model = OpenAIEmbeddings(
-        model   = 'text-embedding-ada-002',
-        api_key = os.getenv('OPENAI_API_KEY')
-    )
-    query_vector = embedding_model.embed_query(search_query)
+    query_vector = embed_query(search_query)
 
     return {
         "query": {
@@ -75,14 +70,10 @@ def retrieveDocuments(query: str) -> list:
 
     ret = []
 
-    vector_store = ElasticsearchStore.as_retriever()
-
-    retriever = ElasticsearchRetriever.from_es_params(
+    retriever = get_retriever(
         index_name    = 'embedding_apply',
         body_func     = hybrid_query,
         content_field = 'text',
-        url           = os.getenv('ELASTICSEARCH_URL'),
-        api_key       = os.getenv('ELASTICSEARCH_API_KEY'),
     )
     docs = retriever.invoke(query)
     for doc in docs:
@@ -0,0 +1,141 @@
+"""외부 API 공용 HTTP 세션 (연결 재사용, 재시도, 호스트별 타임아웃/동시성 제한)."""
+
+# region    '기본 라이브러리'
+import re
+import threading
+import time
+from contextlib import nullcontext
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# endregion
+
+
+# region    'Client 설정'
+POOL_SIZE       = 32            # 호스트별 keep-alive 연결 수
+MAX_RETRIES     = 3
+BACKOFF_FACTOR  = 0.5           # 0.5s, 1s, 2s ...
+RETRY_STATUSES  = (500, 502, 503, 504)
+DEFAULT_TIMEOUT = (3.05, 30)    # (connect, read) 초
+
+HOST_TIMEOUTS   = {
+    'apis.data.go.kr'    : (3.05, 20),
+    'api.odcloud.kr'     : (3.05, 15),
+    'www.applyhome.co.kr': (3.05, 15),
+    'api.perplexity.ai'  : (3.05, 60),   # 검색 + 리포트 생성까지 응답에 10~20초
+}
+
+# 호스트별 동시 요청 수 상한 (스크래핑 대상 사이트 부하 제한)
+HOST_CONCURRENCY = {
+    'www.applyhome.co.kr': 4,
+}
+
+# data.go.kr 는 오류도 HTTP 200 + XML 오류 응답으로 내려주므로, 일시적인 오류 코드만 재시도
+# 01: APPLICATION_ERROR, 02: DB_ERROR, 04: HTTP_ERROR, 05: SERVICETIMEOUT_ERROR
+TRANSIENT_ERROR_CODES = {'01', '02', '04', '05'}
+ERROR_CODE_PATTERN    = re.compile(r'<(?:resultCode|returnReasonCode)>\s*(\d+)\s*</')
+
+_session       = None
+_session_lock  = threading.Lock()
+_rate_limiters = {}
+_host_slots    = {host: threading.BoundedSemaphore(limit) for host, limit in HOST_CONCURRENCY.items()}
+# endregion
+
+
+class RateLimiter:
+    """호스트별 초당 요청 수 제한 (스레드 간 공유)."""
+
+    def __init__(self, per_second: float):
+        """초당 최대 per_second 회로 제한."""
+        self.interval = 1.0 / per_second
+        self.next_at  = 0.0
+        self.lock     = threading.Lock()
+
+    def wait(self) -> None:
+        """다음 요청 가능 시각까지 대기."""
+        with self.lock:
+            now          = time.monotonic()
+            delay        = max(0.0, self.next_at - now)
+            self.next_at = max(now, self.next_at) + self.interval
+        if delay:
+            time.sleep(delay)
+
+
+def set_rate_limit(host: str, per_second: Optional[float]) -> None:
+    """호스트별 요청 속도 제한 설정 (None 이면 해제)."""
+    if per_second:
+        _rate_limiters[host] = RateLimiter(per_second)
+    else:
+        _rate_limiters.pop(host, None)
+
+
+def get_session() -> requests.Session:
+    """프로세스 공용 Session 반환 (연결 풀 재사용, 5xx 지수 백오프 재시도)."""
+    global _session
+    if _session is not None:
+        return _session
+
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total            = MAX_RETRIES,
+                backoff_factor   = BACKOFF_FACTOR,
+                status_forcelist = RETRY_STATUSES,
+                allowed_methods  = frozenset({'GET', 'HEAD'}),
+                raise_on_status  = False,
+            )
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+    return _session
+
+
+def timeout_for(url: str):
+    """호스트별 (connect, read) 타임아웃."""
+    return HOST_TIMEOUTS.get(urlsplit(url).hostname, DEFAULT_TIMEOUT)
+
+
+def result_code(text: str) -> Optional[str]:
+    """data.go.kr XML 응답의 resultCode / returnReasonCode 반환, 없으면 None."""
+    match = ERROR_CODE_PATTERN.search(text[:2048])
+    return match.group(1) if match else None
+
+
+def transient_error_code(text: str) -> Optional[str]:
+    """data.go.kr XML 오류 응답 중 재시도 가능한 오류 코드 반환, 아니면 None."""
+    code = result_code(text)
+    return code if code in TRANSIENT_ERROR_CODES else None
+
+
+def get(url: str, *, retry_error_envelope: bool = False, **kwargs) -> requests.Response:
+    """공용 Session으로 GET 요청. HOST_CONCURRENCY 에 등록된 호스트는 동시 요청 수를 제한합니다.
+
+    retry_error_envelope=True 이면 data.go.kr 의 일시적인 XML 오류 응답도 지수 백오프로 재시도합니다.
+    """
+    kwargs.setdefault('timeout', timeout_for(url))
+    host    = urlsplit(url).hostname
+    session = get_session()
+    limiter = _rate_limiters.get(host)
+    slot    = _host_slots.get(host) or nullcontext()
+
+    if limiter:
+        limiter.wait()
+    with slot:
+        response = session.get(url, **kwargs)
+    for attempt in range(MAX_RETRIES):
+        if not retry_error_envelope or response.status_code != 200 or not transient_error_code(response.text):
+            break
+        time.sleep(BACKOFF_FACTOR * (2 ** attempt))
+        if limiter:
+            limiter.wait()
+        with slot:
+            response = session.get(url, **kwargs)
+
+    return response
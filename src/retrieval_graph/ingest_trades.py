@@ -0,0 +1,118 @@
+"""전국 시군구 아파트 실거래가 일괄 적재.
+
+constants.AREA_CODE 의 모든 시군구에 대해 최근 N개월 실거래가를 조회하여
+로컬 거래 테이블(trade_table)에 저장합니다. 확정된 월은 다시 조회하지 않고,
+없는 월과 아직 확정되지 않은 월만 조회하므로 중단 후 다시 실행하면 이어서 적재합니다.
+
+    python -m retrieval_graph.ingest_trades --months 6 --rate 5
+"""
+
+# region    '기본 라이브러리'
+import argparse
+import logging
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+import requests
+from dateutil.relativedelta import relativedelta
+
+# endregion
+# region    'LangGraph 라이브러리'
+from retrieval_graph import http_client
+from retrieval_graph.constants import AREA_CODE
+from retrieval_graph.rtms_cache import cache_ttl, is_final_month
+from retrieval_graph.tools_api_sale_price import RtmsApiError, fetch_all_trades
+from retrieval_graph.trade_table import (
+    TradeTable,
+    get_table_fetched_at,
+    put_cached_table,
+)
+
+# endregion
+
+
+logger = logging.getLogger(__name__)
+
+RTMS_HOST         = 'apis.data.go.kr'
+QUOTA_EXCEEDED    = '22'  # LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR
+DEFAULT_MONTHS    = 6
+DEFAULT_RATE      = 5.0   # 초당 요청 수
+
+
+def recent_months(n: int, now: Optional[datetime] = None) -> List[int]:
+    """기준일부터 최근 n개월 (YYYYMM, 최신순)."""
+    now = now or datetime.now()
+    return [int((now - relativedelta(months=i)).strftime('%Y%m')) for i in range(n)]
+
+
+def months_to_fetch(area_code: int, months_yyyymm: Iterable[int], now: Optional[float] = None) -> List[int]:
+    """적재가 필요한 월: 저장된 테이블이 없거나, 미확정 월이면서 TTL이 지난 경우."""
+    now     = time.time() if now is None else now
+    missing = []
+    for year_month in months_yyyymm:
+        fetched_at = get_table_fetched_at(area_code, year_month)
+        if fetched_at is None:
+            missing.append(year_month)
+        elif not is_final_month(year_month, fetched_at) and now - fetched_at >= cache_ttl():
+            missing.append(year_month)
+    return missing
+
+
+def ingest(months: int = DEFAULT_MONTHS, area_codes: Optional[Iterable[int]] = None, rate: float = DEFAULT_RATE) -> dict:
+    """시군구별로 필요한 월만 조회하여 적재합니다.
+
+    일일 호출 한도를 초과하면 즉시 중단하며, 다음 실행 시 남은 시군구부터 이어서 적재합니다.
+    재시도 후에도 남은 네트워크 오류(timeout, 연결 끊김)는 API 오류처럼 해당 시군구만 실패로 세고 계속합니다.
+    """
+    area_codes    = sorted(set(area_codes or AREA_CODE.values()))
+    months_yyyymm = recent_months(months)
+    summary       = {'districts': len(area_codes), 'fetched': 0, 'skipped': 0, 'failed': 0, 'stopped': False}
+
+    http_client.set_rate_limit(RTMS_HOST, rate)
+    try:
+        for i, area_code in enumerate(area_codes, 1):
+            missing = months_to_fetch(area_code, months_yyyymm)
+            summary['skipped'] += len(months_yyyymm) - len(missing)
+            if not missing:
+                continue
+
+            try:
+                for year_month, trades in fetch_all_trades(missing, area_code).items():
+                    put_cached_table(area_code, year_month, TradeTable.from_trades(trades))
+                    summary['fetched'] += 1
+            except RtmsApiError as e:
+                summary['failed'] += len(missing)
+                logger.warning('[%d/%d] %s 적재 실패: %s', i, len(area_codes), area_code, e)
+                if e.code == QUOTA_EXCEEDED:
+                    summary['stopped'] = True
+                    break
+                continue
+            except requests.exceptions.RequestException as e:
+                summary['failed'] += len(missing)
+                logger.warning('[%d/%d] %s 적재 실패: %s', i, len(area_codes), area_code, e)
+                continue
+
+            logger.info('[%d/%d] %s %d개월 적재', i, len(area_codes), area_code, len(missing))
+    finally:
+        http_client.set_rate_limit(RTMS_HOST, None)
+
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """실거래가 일괄 적재 CLI 진입점."""
+    parser = argparse.ArgumentParser(description='전국 시군구 아파트 실거래가 일괄 적재')
+    parser.add_argument('--months', type=int, default=DEFAULT_MONTHS, help='적재할 최근 개월 수')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='data.go.kr 초당 최대 요청 수')
+    parser.add_argument('--areas', type=str, default='', help='적재할 법정동 코드 목록 (쉼표 구분, 기본: 전체)')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    area_codes = [int(code) for code in args.areas.split(',') if code.strip()] or None
+    summary    = ingest(months=args.months, area_codes=area_codes, rate=args.rate)
+    logger.info('%s', summary)
+
+
+if __name__ == '__main__':
+    main()
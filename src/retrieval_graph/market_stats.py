@@ -0,0 +1,77 @@
+"""실거래가 시세 통계 (면적/연식 구간별 평당가 요약)."""
+
+# region    '기본 라이브러리'
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+# endregion
+# region    'LangGraph 라이브러리'
+from retrieval_graph.trade_table import TradeTable
+
+# endregion
+
+
+# region    '구간 정의'
+AREA_EDGES        = [60, 85, 100]                              # 전용면적(㎡) 구간 경계 (경계값은 아래 구간에 포함)
+AREA_LABELS       = ['59㎡형', '84㎡형', '85~100㎡형', '100㎡ 초과']
+BUILD_AGE_EDGES   = [6, 11, 21]                                # 준공 후 경과년수 구간 경계
+BUILD_AGE_LABELS  = ['5년 이내', '6~10년', '11~20년', '20년 초과']
+TRIM_RATIO        = 0.1                                        # 절사평균 시 양쪽에서 제외할 비율
+# endregion
+
+
+def summarize_sorted(prices: np.ndarray) -> Dict[str, float]:
+    """정렬된 평당가 배열의 요약 통계 (건수, 평균, 중앙값, 절사평균, p10/p90)."""
+    count = len(prices)
+    if count == 0:
+        return {'count': 0}
+
+    trim = int(count * TRIM_RATIO)
+    p10, median, p90 = np.percentile(prices, [10, 50, 90])
+    return {
+        'count'       : count,
+        'mean'        : round(float(prices.mean()), 2),
+        'median'      : round(float(median), 2),
+        'trimmed_mean': round(float(prices[trim:count - trim].mean()), 2),
+        'p10'         : round(float(p10), 2),
+        'p90'         : round(float(p90), 2),
+    }
+
+
+def grouped_stats(prices: np.ndarray, bucket_ids: np.ndarray, labels: Sequence[str]) -> Dict[str, Dict[str, float]]:
+    """(구간, 평당가) 기준으로 한 번 정렬한 뒤 구간별로 잘라 통계를 계산합니다."""
+    order      = np.lexsort((prices, bucket_ids))
+    prices     = prices[order]
+    bucket_ids = bucket_ids[order]
+    bounds     = np.searchsorted(bucket_ids, np.arange(len(labels) + 1))
+
+    return {
+        label: summarize_sorted(prices[bounds[i]:bounds[i + 1]])
+        for i, label in enumerate(labels)
+    }
+
+
+def market_stats(table: TradeTable, umd_name: str, current_year: Optional[int] = None) -> dict:
+    """읍면동 실거래가 통계: 전체 요약과 전용면적/건축년도 구간별 요약."""
+    current_year = current_year or datetime.now().year
+
+    mask   = table.umd_mask(umd_name)
+    prices = table.pyung_price()
+    mask  &= ~np.isnan(prices)
+
+    prices     = prices[mask]
+    area       = table.exclu_use_ar[mask]
+    build_year = table.build_year[mask].astype(np.int32)
+
+    # 건축년도 미기재(0) 거래는 가장 오래된 구간으로 분류하지 않도록 별도 제외
+    known_year = build_year > 0
+    build_age  = np.digitize(current_year - build_year[known_year], BUILD_AGE_EDGES)
+
+    return {
+        'umd_name'     : umd_name,
+        'overall'      : summarize_sorted(np.sort(prices)),
+        'by_area'      : grouped_stats(prices, np.digitize(area, AREA_EDGES, right=True), AREA_LABELS),
+        'by_build_year': grouped_stats(prices[known_year], build_age, BUILD_AGE_LABELS),
+    }
@@ -0,0 +1,77 @@
+"""Perplexity 검색 결과 캐시."""
+
+# region    '기본 라이브러리'
+import hashlib
+import json
+import os
+import time
+from typing import Optional, Tuple
+
+# endregion
+# region    'LangGraph 라이브러리'
+from retrieval_graph.embedding_cache import normalize_text
+from retrieval_graph.rtms_cache import get_connection
+
+# endregion
+
+
+# 단지 부동산 정보 분석은 시간 단위로 바뀌지 않으므로 (정규화한 질의, 검색 기간 일수, 프롬프트) 기준으로 보관합니다.
+# 검색 기간은 '오늘부터 365일' 처럼 상대적이므로, 날짜가 바뀌어도 같은 키가 되도록 절대 날짜 대신 일수를 키로 씁니다.
+# 유효시간이 지난 결과는 바로 반환하고 백그라운드에서 갱신하며(stale-while-revalidate),
+# 바로 반환하기에 너무 오래된(PERPLEXITY_CACHE_MAX_STALE) 결과는 다시 조회하되, 조회가 실패(timeout/5xx)하면 대신 반환합니다.
+DEFAULT_TTL       = 3 * 24 * 60 * 60    # 유효시간(초)
+DEFAULT_MAX_STALE = 30 * 24 * 60 * 60   # 갱신을 기다리지 않고 반환할 수 있는 최대 경과 시간(초)
+
+
+def cache_ttl() -> int:
+    """캐시 유효시간(초) (환경변수 PERPLEXITY_CACHE_TTL)."""
+    return int(os.getenv('PERPLEXITY_CACHE_TTL', DEFAULT_TTL))
+
+
+def max_stale() -> int:
+    """만료 후에도 바로 반환할 수 있는 최대 경과 시간(초) (환경변수 PERPLEXITY_CACHE_MAX_STALE)."""
+    return int(os.getenv('PERPLEXITY_CACHE_MAX_STALE', DEFAULT_MAX_STALE))
+
+
+def _ensure_perplexity_schema(conn) -> None:
+    conn.execute(
+        '''
+        CREATE TABLE IF NOT EXISTS perplexity_result (
+            query        TEXT    NOT NULL,   -- 정규화한 질의
+            window_days  INTEGER NOT NULL,   -- 검색 기간(최근 N일)
+            prompt_hash  TEXT    NOT NULL,   -- 모델 + 시스템 프롬프트 해시 (프롬프트가 바뀌면 새로 조회)
+            result       TEXT    NOT NULL,
+            fetched_at   REAL    NOT NULL,
+            PRIMARY KEY (query, window_days, prompt_hash)
+        )
+        '''
+    )
+
+
+def cache_key(query: str, window_days: int, model: str, system_prompt: str) -> Tuple[str, int, str]:
+    """(정규화한 질의, 검색 기간, 모델/프롬프트 해시) 캐시 키."""
+    prompt_hash = hashlib.sha1(f'{model}\n{system_prompt}'.encode()).hexdigest()[:16]
+    return normalize_text(query), int(window_days), prompt_hash
+
+
+def get_cached_result(key: Tuple[str, int, str]) -> Optional[Tuple[dict, float]]:
+    """저장된 (결과, 경과 시간(초)), 없으면 None."""
+    conn = get_connection()
+    _ensure_perplexity_schema(conn)
+    row = conn.execute(
+        'SELECT result, fetched_at FROM perplexity_result WHERE query=? AND window_days=? AND prompt_hash=?', key
+    ).fetchone()
+    if row is None:
+        return None
+    return json.loads(row[0]), time.time() - row[1]
+
+
+def put_cached_result(key: Tuple[str, int, str], result: dict) -> None:
+    """검색 결과 저장 (조회 시각은 현재)."""
+    conn = get_connection()
+    _ensure_perplexity_schema(conn)
+    with conn:
+        conn.execute(
+            'INSERT OR REPLACE INTO perplexity_result VALUES (?, ?, ?, ?, ?)',
+            (*key, json.dumps(result, ensure_ascii=False), time.time()),
+        )
@@ -0,0 +1,175 @@
+"""저장된 신청자 프로필 × 청약접수 중인 분양공고 일괄 매칭.
+
+프로필마다 retrieve_appropriate_rank 를 호출하는 대신, 프로필 키워드에서 뽑은 사실을 사실별 배열로 모아
+rank_rules 의 규칙을 공급유형(특별공급 세부 구분 + 1순위/2순위)별로 한 번씩 벡터 평가하고,
+공고별 공급유형 세대수(announcement_unit 의 특별공급 세부 세대수 / 일반 공급세대수)와 행렬곱으로 프로필 × 공고 지원 가능 세대수를 계산합니다.
+결과는 profile_match 테이블에 저장되어 알림 작업이 조회합니다.
+
+    python -m retrieval_graph.profile_matching --profiles profiles.json   # {"프로필 ID": ["기혼", "무주택", ...]}
+"""
+
+# region    '기본 라이브러리'
+import argparse
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# endregion
+# region    'LangGraph 라이브러리'
+from retrieval_graph.announcement_store import iter_open_announcements
+from retrieval_graph.rank_rules import MAYBE, RULES, extract_facts, facts_table
+from retrieval_graph.records import SPECIAL_SUPPLY_COLUMNS
+from retrieval_graph.rtms_cache import get_connection
+
+# endregion
+
+
+logger = logging.getLogger(__name__)
+
+_rules = dict(RULES)
+
+# (공급유형, 판단 조건, 분양정보의 세대수 컬럼) - '특별 공급세대수' 세부 구분은 records.SPECIAL_SUPPLY_COLUMNS 명칭
+CATEGORIES = (
+    ('특별공급 - 다자녀 가구', _rules['특별공급 - 다자녀 가구'], '다자녀가구'),
+    ('특별공급 - 신혼부부'   , _rules['특별공급 - 신혼부부']   , '신혼부부'),
+    ('특별공급 - 생애최초'   , _rules['특별공급 - 생애최초']   , '생애최초'),
+    ('특별공급 - 청년'       , _rules['특별공급 - 청년']       , '청년'),
+    ('특별공급 - 노부모 부양', _rules['특별공급 - 노부모 부양'], '노부모부양'),
+    ('특별공급 - 신생아'     , _rules['특별공급 - 신생아']     , '신생아(일반형)'),
+    ('특별공급 - 기관추천'   , _rules['특별공급 - 기관추천']   , '기관추천'),
+    ('특별공급 - 이전기관'   , _rules['특별공급 - 이전기관']   , '이전기관'),
+    # 일반공급은 1순위가 아닌 경우에만 2순위
+    ('1순위'                 , _rules['1순위']                 , '일반'),
+    ('2순위'                 , ~_rules['1순위'] & _rules['2순위'], '일반'),
+)
+
+
+def _ensure_match_schema(conn) -> None:
+    conn.executescript(
+        '''
+        CREATE TABLE IF NOT EXISTS profile_match (
+            profile_id      TEXT    NOT NULL,
+            house_manage_no TEXT    NOT NULL,
+            house_nm        TEXT    NOT NULL,
+            rcept_endde     TEXT,
+            categories      TEXT    NOT NULL,   -- 지원 가능한 공급유형 JSON 목록
+            eligible_units  INTEGER NOT NULL,   -- 지원 가능한 공급유형의 세대수 합
+            undecided       TEXT    NOT NULL,   -- 키워드만으로 판단할 수 없는 공급유형 JSON 목록 (추가 정보 필요)
+            matched_at      REAL    NOT NULL,
+            PRIMARY KEY (profile_id, house_manage_no)
+        );
+        CREATE INDEX IF NOT EXISTS profile_match_announcement ON profile_match (house_manage_no);
+        '''
+    )
+
+
+def supply_quotas(units: Sequence[Tuple[int, Tuple[int, ...]]]) -> np.ndarray:
+    """평형별 (일반 공급세대수, 특별공급 세부 세대수)를 합산한 CATEGORIES 순서 세대수 벡터."""
+    special = np.zeros(len(SPECIAL_SUPPLY_COLUMNS), dtype=np.int64)
+    general = 0
+    for general_units, breakdown in units:
+        special[:len(breakdown)] += np.asarray(breakdown, dtype=np.int64)   # 특별공급 테이블이 없으면 빈 튜플
+        general                  += general_units
+    special = dict(zip(SPECIAL_SUPPLY_COLUMNS, special.tolist()))
+    return np.array([general if column == '일반' else special[column] for _, _, column in CATEGORIES], dtype=np.int64)
+
+
+def eligibility(profiles: Sequence[Sequence[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """프로필별 키워드 목록 → (지원 가능, 판단 보류) 프로필 × 공급유형 bool 행렬."""
+    facts  = facts_table([extract_facts(queries) for queries in profiles])
+    truths = np.stack([np.broadcast_to(cond(facts), (len(profiles),)) for _, cond, _ in CATEGORIES], axis=1)
+    return truths == 1, truths == MAYBE
+
+
+def match_profiles(profiles: Dict[str, Sequence[str]], open_on: Optional[str] = None) -> int:
+    """프로필({프로필 ID: 키워드 목록})을 청약접수 중인 전체 공고와 매칭하여 profile_match 에 저장 (해당 프로필의 기존 결과는 교체).
+
+    지원 가능하거나 판단 보류인 공급유형이 하나라도 있는 (프로필, 공고) 쌍만 저장하며, 저장한 행 수를 반환합니다.
+    """
+    profile_ids   = list(profiles)
+    announcements = list(iter_open_announcements(open_on))
+    conn          = get_connection()
+    _ensure_match_schema(conn)
+
+    rows = []
+    if profile_ids and announcements:
+        eligible, undecided = eligibility([profiles[profile_id] for profile_id in profile_ids])
+        quotas              = np.stack([supply_quotas(units) for *_, units in announcements])   # 공고 × 공급유형
+
+        # 공급유형 집합을 비트마스크로 두고 프로필 × 공고 쌍별로 AND (공급유형 목록 JSON 은 마스크별로 한 번만 생성)
+        bits           = 1 << np.arange(len(CATEGORIES), dtype=np.int64)
+        offered_mask   = (quotas > 0) @ bits
+        eligible_mask  = (eligible @ bits)[:, None] & offered_mask[None, :]
+        undecided_mask = (undecided @ bits)[:, None] & offered_mask[None, :]
+        units          = eligible.astype(np.int64) @ quotas.T
+
+        pairs      = np.nonzero(eligible_mask | undecided_mask)
+        labels     = {}
+        matched_at = time.time()
+        for p, a, categories, pending, count in zip(
+            pairs[0].tolist(), pairs[1].tolist(), eligible_mask[pairs].tolist(), undecided_mask[pairs].tolist(), units[pairs].tolist()
+        ):
+            for mask in (categories, pending):
+                if mask not in labels:
+                    labels[mask] = json.dumps([label for c, (label, _, _) in enumerate(CATEGORIES) if mask >> c & 1], ensure_ascii=False)
+            house_manage_no, house_nm, rcept_endde, _ = announcements[a]
+            rows.append((profile_ids[p], house_manage_no, house_nm, rcept_endde, labels[categories], count, labels[pending], matched_at))
+
+    with conn:
+        conn.executemany('DELETE FROM profile_match WHERE profile_id=?', [(profile_id,) for profile_id in profile_ids])
+        conn.executemany('INSERT INTO profile_match VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+    return len(rows)
+
+
+def read_matches(profile_id: Optional[str] = None, house_manage_no: Optional[str] = None) -> List[dict]:
+    """저장된 매칭 결과 조회 (알림 작업용, 지원 가능 세대수가 많은 순)."""
+    conditions, params = [], []
+    if profile_id:
+        conditions.append('profile_id = ?')
+        params.append(profile_id)
+    if house_manage_no:
+        conditions.append('house_manage_no = ?')
+        params.append(house_manage_no)
+
+    conn = get_connection()
+    _ensure_match_schema(conn)
+    rows = conn.execute(
+        f'''
+        SELECT profile_id, house_manage_no, house_nm, rcept_endde, categories, eligible_units, undecided
+        FROM profile_match {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+        ORDER BY eligible_units DESC, profile_id, house_manage_no
+        ''',
+        params,
+    ).fetchall()
+    return [
+        {
+            'profile_id'     : row[0],
+            'house_manage_no': row[1],
+            'house_nm'       : row[2],
+            'rcept_endde'    : row[3],
+            'categories'     : json.loads(row[4]),
+            'eligible_units' : row[5],
+            'undecided'      : json.loads(row[6]),
+        }
+        for row in rows
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """프로필 일괄 매칭 CLI 진입점."""
+    parser = argparse.ArgumentParser(description='저장된 프로필 × 청약접수 중인 분양공고 일괄 매칭')
+    parser.add_argument('--profiles', type=str, required=True, help='{"프로필 ID": ["키워드", ...]} 형식 JSON 파일')
+    parser.add_argument('--open-on', type=str, default=None, help='기준일 (YYYY-MM-DD, 기본: 오늘)')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    with open(args.profiles, encoding='utf-8') as f:
+        profiles = json.load(f)
+    logger.info('%d개 프로필: %d건 매칭', len(profiles), match_profiles(profiles, args.open_on))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""청약 순위 판단 결과 캐시 (색인 버전별)."""
+
+# region    '기본 라이브러리'
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import List, Optional
+
+# endregion
+# region    'LangGraph 라이브러리'
+from retrieval_graph.embedding_cache import normalize_text
+from retrieval_graph.es_client import get_es_client
+from retrieval_graph.rtms_cache import get_connection
+
+# endregion
+
+
+logger = logging.getLogger(__name__)
+
+# 같은 프로필 키워드 집합은 같은 청약 순위 판단을 받으므로, (정규화한 키워드 집합, 정책 색인 버전) 기준으로 결과를 저장합니다.
+# 정책 색인(embedding_apply)을 다시 색인하면 버전이 바뀌어 기존 판단은 더 이상 조회되지 않습니다.
+DEFAULT_DECISION_TTL = 24 * 60 * 60   # 판단 결과 유효시간(초)
+INDEX_VERSION_TTL    = 60             # 색인 버전 조회 결과를 프로세스 안에서 재사용하는 시간(초)
+
+_version_lock = threading.Lock()
+_versions     = {}   # index → (version, 조회 시각)
+
+
+def decision_ttl() -> int:
+    """판단 결과 유효시간(초) (환경변수 RANK_DECISION_TTL)."""
+    return int(os.getenv('RANK_DECISION_TTL', DEFAULT_DECISION_TTL))
+
+
+def _ensure_decision_schema(conn) -> None:
+    conn.execute(
+        '''
+        CREATE TABLE IF NOT EXISTS rank_decision (
+            keywords       TEXT NOT NULL,   -- 정규화·정렬한 키워드 JSON
+            index_version  TEXT NOT NULL,
+            result         TEXT NOT NULL,
+            created_at     REAL NOT NULL,
+            PRIMARY KEY (keywords, index_version)
+        )
+        '''
+    )
+
+
+def canonical_keywords(queries: List[str]) -> str:
+    """순서/중복/공백 차이를 무시한 키워드 집합 키. '기혼, 무주택' 처럼 한 항목에 여러 키워드가 있어도 나눠서 봅니다."""
+    keywords = {normalize_text(keyword) for query in queries for keyword in query.split(',')}
+    return json.dumps(sorted(keyword for keyword in keywords if keyword), ensure_ascii=False)
+
+
+def index_version(index: str) -> Optional[str]:
+    """색인 uuid + 문서 수 + 색인 작업 수의 해시 (다시 색인하면 바뀜). 조회할 수 없으면 None."""
+    now = time.monotonic()
+    with _version_lock:
+        cached = _versions.get(index)
+    if cached and now - cached[1] < INDEX_VERSION_TTL:
+        return cached[0]
+
+    try:
+        stats = get_es_client().indices.stats(index=index, metric='docs,indexing')
+    except Exception as e:
+        logger.warning('정책 색인 버전 조회 실패: %s (%s)', index, e)
+        return None
+
+    parts = []
+    for name, info in sorted(stats['indices'].items()):
+        primaries = info.get('primaries', {})
+        parts.append((
+            name,
+            info.get('uuid'),
+            primaries.get('docs', {}).get('count'),
+            primaries.get('docs', {}).get('deleted'),
+            primaries.get('indexing', {}).get('index_total'),
+        ))
+    version = hashlib.sha1(json.dumps(parts).encode('utf-8')).hexdigest()[:16]
+    with _version_lock:
+        _versions[index] = (version, now)
+    return version
+
+
+def get_decision(keywords: str, version: str) -> Optional[str]:
+    """저장된 판단 결과, 없거나 만료되었으면 None."""
+    conn = get_connection()
+    _ensure_decision_schema(conn)
+    row = conn.execute(
+        'SELECT result, created_at FROM rank_decision WHERE keywords=? AND index_version=?', (keywords, version)
+    ).fetchone()
+    if row is None or time.time() - row[1] >= decision_ttl():
+        return None
+    return row[0]
+
+
+def put_decision(keywords: str, version: str, result: str) -> None:
+    """판단 결과 저장 (다른 색인 버전이나 만료된 결과는 함께 정리)."""
+    conn = get_connection()
+    _ensure_decision_schema(conn)
+    with conn:
+        conn.execute(
+            'DELETE FROM rank_decision WHERE index_version<>? OR created_at<?', (version, time.time() - decision_ttl())
+        )
+        conn.execute('INSERT OR REPLACE INTO rank_decision VALUES (?, ?, ?, ?)', (keywords, version, result, time.time()))
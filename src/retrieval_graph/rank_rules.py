@@ -0,0 +1,214 @@
+"""청약 순위 판단 규칙표.
+
+프로필 키워드에서 뽑은 사실(facts)만으로 결과가 분명한 경우는 검색/LLM 없이 바로 판단합니다.
+사실은 float 로 표현하고(모르는 값은 NaN) 조건은 Kleene 3값 논리로 평가합니다.
+진리값을 참 1.0 / 모름 0.5 / 거짓 0.0 으로 두면 &, |, ~ 가 각각 min, max, 1 - x 가 되므로,
+모르는 사실이 결과를 바꿀 수 있으면 판단을 보류(None)하여 LLM 으로 넘깁니다.
+프로필 1건(float)은 파이썬 연산으로, 여러 건(facts_table 의 1차원 배열)은 numpy 로 같은 규칙을 평가합니다.
+"""
+
+# region    '기본 라이브러리'
+import re
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+# endregion
+
+
+UNKNOWN = np.nan
+MAYBE   = 0.5    # '모름' 진리값
+Facts   = Dict[str, Union[float, np.ndarray]]
+Truth   = Union[float, np.ndarray]
+
+
+# region    '3값 논리 조건'
+class Cond:
+    """사실 표(facts) → 진리값(1.0 / 0.5 / 0.0, 배열 표이면 배열) 로 평가되는 조건."""
+
+    def __init__(self, evaluate):
+        """진리값을 반환하는 evaluate(facts) 로 생성."""
+        self.evaluate = evaluate
+
+    def __call__(self, facts: Facts) -> Truth:
+        """사실 표로 조건 평가."""
+        return self.evaluate(facts)
+
+    def __and__(self, other: 'Cond') -> 'Cond':
+        """논리곱 (min)."""
+        def evaluate(facts):
+            a, b = self(facts), other(facts)
+            return np.minimum(a, b) if isinstance(a, np.ndarray) or isinstance(b, np.ndarray) else min(a, b)
+        return Cond(evaluate)
+
+    def __or__(self, other: 'Cond') -> 'Cond':
+        """논리합 (max)."""
+        def evaluate(facts):
+            a, b = self(facts), other(facts)
+            return np.maximum(a, b) if isinstance(a, np.ndarray) or isinstance(b, np.ndarray) else max(a, b)
+        return Cond(evaluate)
+
+    def __invert__(self) -> 'Cond':
+        """부정 (1 - x)."""
+        return Cond(lambda facts: 1.0 - self(facts))
+
+
+class F:
+    """사실 이름으로 비교 조건 생성. F('homes') == 0 → 무주택 여부 (사실을 모르면 '모름')."""
+
+    def __init__(self, name: str):
+        """사실 이름으로 생성."""
+        self.name = name
+
+    def _compare(self, op) -> Cond:
+        def evaluate(facts):
+            value = facts.get(self.name, UNKNOWN)
+            if isinstance(value, np.ndarray):
+                return np.where(np.isnan(value), MAYBE, op(value).astype(float))
+            return MAYBE if value != value else float(op(value))
+        return Cond(evaluate)
+
+    def __eq__(self, other) -> Cond:  # type: ignore[override]
+        """사실 == other."""
+        return self._compare(lambda value: value == other)
+
+    def __ge__(self, other) -> Cond:
+        """사실 >= other."""
+        return self._compare(lambda value: value >= other)
+
+    def __le__(self, other) -> Cond:
+        """사실 <= other."""
+        return self._compare(lambda value: value <= other)
+
+    def __gt__(self, other) -> Cond:
+        """사실 > other."""
+        return self._compare(lambda value: value > other)
+
+    def __lt__(self, other) -> Cond:
+        """사실 < other."""
+        return self._compare(lambda value: value < other)
+# endregion
+
+
+# region    '규칙표 (Rank.appropriate_rank 후보 순서 = 판단 우선순위)'
+NO_HOME = F('homes') == 0
+# 특별공급은 청약통장 가입 6개월 이상 (생애최초는 1순위 요건인 12개월), 통장이 없으면 모든 특별공급 불가
+ACCOUNT = (F('has_account') == 1) & (F('subscription_months') >= 6)
+SPECIAL = NO_HOME & ACCOUNT
+
+RULES = (
+    ('특별공급 - 다자녀 가구', SPECIAL & (F('children') >= 2)),
+    ('특별공급 - 신혼부부'   , SPECIAL & (F('married') == 1) & (F('marriage_years') <= 7)),
+    ('특별공급 - 생애최초'   , SPECIAL & (F('never_owned') == 1) & (F('household_head') == 1) & (F('subscription_months') >= 12)),
+    ('특별공급 - 청년'       , SPECIAL & (F('married') == 0) & (F('age') >= 19) & (F('age') <= 39)),
+    ('특별공급 - 노부모 부양', SPECIAL & (F('household_head') == 1) & (F('supports_parents') == 1)),
+    ('특별공급 - 신생아'     , SPECIAL & (F('newborn') == 1)),
+    ('특별공급 - 기관추천'   , SPECIAL & (F('institution_recommended') == 1)),
+    ('특별공급 - 이전기관'   , SPECIAL & (F('relocated_institution') == 1)),
+    ('1순위'                 , (F('subscription_months') >= 12) & (F('homes') <= 1)),
+    ('2순위'                 , F('has_account') == 1),
+)
+
+# 키워드에 없으면 해당하지 않는 것으로 보는 신고형 사실 (LLM 도 키워드 외 정보는 알 수 없음)
+DECLARED_FACTS = ('newborn', 'supports_parents', 'institution_recommended', 'relocated_institution')
+# endregion
+
+
+# region    '키워드 → 사실'
+SEP = r'[\s:：]*'
+NUMBER_PATTERNS = (
+    ('marriage_years'     , re.compile(rf'(?:혼인|결혼){SEP}(?:기간)?{SEP}(\d+){SEP}년')),
+    ('homes'              , re.compile(r'(\d+)\s*주택')),
+    ('children'           , re.compile(rf'자녀{SEP}(\d+)')),
+    ('age'                , re.compile(rf'(?:나이|만){SEP}(\d+)|(\d+)\s*세(?!대)')),   # '1세대 1주택' 의 세대 제외
+    ('subscription_months', re.compile(r'(?:청약통장|가입기간|가입)\D*(\d+)\s*개월')),
+)
+SUBSCRIPTION_YEARS = re.compile(r'(?:청약통장|가입기간|가입)\D*(\d+)\s*년')
+# 기관추천 대상일 수 있지만 추천 여부는 알 수 없는 키워드 (추천을 명시하지 않으면 '모름'으로 두어 LLM 판단)
+INSTITUTION_HINTS  = re.compile(r'국가유공|장애인|중소기업|장기복무|북한이탈|다문화')
+# 같은 키워드에 함께 나오면 뒤의 패턴이 우선 ('결혼 여부: 미혼' → 미혼, '세대주 여부: 세대원' → 세대원)
+FLAG_PATTERNS = (
+    ('married'                , 1, re.compile(r'기혼|신혼|결혼|혼인|배우자')),
+    ('married'                , 0, re.compile(r'미혼|비혼|싱글')),
+    ('homes'                  , 0, re.compile(r'무주택')),
+    ('homes'                  , 1, re.compile(r'유주택')),
+    ('children'               , 2, re.compile(r'다자녀')),
+    ('children'               , 0, re.compile(rf'무자녀|자녀{SEP}(?:없음|없|0)')),
+    ('household_head'         , 1, re.compile(r'세대주')),
+    ('household_head'         , 0, re.compile(r'세대원')),
+    ('never_owned'            , 1, re.compile(r'생애\s*최초|주택\s*소유\s*(?:이력|경험)\s*없')),
+    ('never_owned'            , 0, re.compile(r'주택\s*소유\s*(?:이력|경험)\s*있')),
+    ('newborn'                , 1, re.compile(r'신생아|영아|출산|임신')),
+    ('supports_parents'       , 1, re.compile(r'노부모|부모\s*부양')),
+    ('institution_recommended', 1, re.compile(r'기관\s*추천|추천\s*(?:대상|받)')),
+    ('relocated_institution'  , 1, re.compile(r'이전\s*기관')),
+    ('has_account'            , 1, re.compile(r'청약통장\s*(?:있|보유|가입)')),
+    ('has_account'            , 0, re.compile(r'청약통장\s*(?:없|미가입|미보유)')),
+)
+
+
+def extract_facts(queries: Sequence[str]) -> Dict[str, float]:
+    """프로필 키워드 목록에서 규칙 평가에 쓰는 사실 추출 (알 수 없는 사실은 NaN)."""
+    facts = {name: UNKNOWN for name in {name for name, _, _ in FLAG_PATTERNS} | {name for name, _ in NUMBER_PATTERNS}}
+    facts.update({name: 0.0 for name in DECLARED_FACTS})
+
+    hinted = False
+    for keyword in (part.strip() for query in queries for part in query.split(',')):
+        if not keyword:
+            continue
+        hinted = hinted or bool(INSTITUTION_HINTS.search(keyword))
+        for name, value, pattern in FLAG_PATTERNS:
+            if pattern.search(keyword):
+                facts[name] = float(value)
+        for name, pattern in NUMBER_PATTERNS:
+            match = pattern.search(keyword)
+            if match:
+                facts[name] = float(next(group for group in match.groups() if group))
+        match = SUBSCRIPTION_YEARS.search(keyword)
+        if match:
+            facts['subscription_months'] = float(match.group(1)) * 12
+
+    # 파생 사실
+    if hinted and facts['institution_recommended'] == 0:
+        facts['institution_recommended'] = UNKNOWN
+    if facts['homes'] > 0:
+        facts['never_owned'] = 0.0
+    if facts['married'] == 0 and np.isnan(facts['marriage_years']):
+        facts['marriage_years'] = 0.0
+    if not np.isnan(facts['subscription_months']):
+        facts['has_account'] = float(facts['subscription_months'] > 0 or facts['has_account'] == 1)
+    elif facts['has_account'] == 0:
+        facts['subscription_months'] = 0.0
+    return facts
+
+
+def facts_table(profiles: Sequence[Dict[str, float]]) -> Facts:
+    """여러 프로필의 사실을 사실별 1차원 배열로 (벡터화 평가용)."""
+    names = set().union(*profiles) if profiles else set()
+    return {name: np.array([profile.get(name, UNKNOWN) for profile in profiles], dtype=float) for name in names}
+# endregion
+
+
+def decide(facts: Facts) -> Union[Optional[str], List[Optional[str]]]:
+    """규칙표를 우선순위대로 평가하여 처음으로 '참'인 순위를 반환.
+
+    그보다 앞선 규칙 중 '모름'이 있거나 모든 규칙이 거짓/모름이면 None (LLM 판단 필요).
+    facts 가 배열 표(facts_table)이면 프로필별 결과 목록을 반환합니다.
+    """
+    if not any(isinstance(value, np.ndarray) for value in facts.values()):
+        for label, cond in RULES:
+            truth = cond(facts)
+            if truth == 1:
+                return label
+            if truth != 0:
+                return None
+        return None
+
+    shape   = np.shape(next(value for value in facts.values() if isinstance(value, np.ndarray)))
+    result  = np.full(shape, None, dtype=object)
+    pending = np.ones(shape, dtype=bool)   # 아직 앞선 규칙이 모두 '거짓'인 프로필
+    for label, cond in RULES:
+        truth   = np.broadcast_to(cond(facts), shape)
+        result  = np.where(pending & (truth == 1), label, result)
+        pending = pending & (truth == 0)
+    return result.tolist()
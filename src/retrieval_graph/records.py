@@ -0,0 +1,200 @@
+"""분양공고 / 평형 레코드."""
+
+# region    '기본 라이브러리'
+import re
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# endregion
+# region    'LangGraph 라이브러리'
+from retrieval_graph.announcement_cache import detail_key
+
+# endregion
+
+
+# 특별공급 세부 구분 (applyhome 특별공급 테이블의 주택형 다음 컬럼 순서)
+SPECIAL_SUPPLY_COLUMNS = ('다자녀가구', '신혼부부', '생애최초', '청년', '노부모부양', '신생아(일반형)', '기관추천', '이전기관', '기타')
+HOUSE_TYPE_AREA        = re.compile(r'^\s*(\d+(?:\.\d+)?)')
+
+# (Tool 응답 키, odcloud 필드) - 청약 일정
+SCHEDULE_FIELDS = (
+    ('특별공급 청약접수시작'      , 'SPSPLY_RCEPT_BGNDE'),
+    ('특별공급 청약접수종료'      , 'SPSPLY_RCEPT_ENDDE'),
+    ('1순위 해당지역 청약접수시작', 'GNRL_RNK1_CRSPAREA_RCPTDE'),
+    ('1순위 해당지역 청약접수종료', 'GNRL_RNK1_CRSPAREA_ENDDE'),
+    ('1순위 기타지역 청약접수시작', 'GNRL_RNK1_ETC_AREA_RCPTDE'),
+    ('1순위 기타지역 청약접수종료', 'GNRL_RNK1_ETC_AREA_ENDDE'),
+    ('2순위 해당지역 청약접수시작', 'GNRL_RNK2_CRSPAREA_RCPTDE'),
+    ('2순위 해당지역 청약접수종료', 'GNRL_RNK2_CRSPAREA_ENDDE'),
+    ('2순위 기타지역 청약접수시작', 'GNRL_RNK2_ETC_AREA_RCPTDE'),
+    ('2순위 기타지역 청약접수종료', 'GNRL_RNK2_ETC_AREA_ENDDE'),
+    ('당첨자 발표일'              , 'PRZWNER_PRESNATN_DE'),
+    ('계약 시작'                  , 'CNTRCT_CNCLS_BGNDE'),
+    ('계약 종료'                  , 'CNTRCT_CNCLS_ENDDE'),
+)
+
+
+def to_int(text: str) -> Optional[int]:
+    """'1,234' / ' 12 ' 형식의 금액 문자열을 정수로 ('' / '-' 등 숫자가 아니면 None)."""
+    text = text.replace(',', '').strip()
+    return int(text) if text.isdigit() else None
+
+
+def to_count(text: str) -> int:
+    """세대수 문자열을 정수로 ('-' / 빈 칸은 공급세대 없음 = 0)."""
+    return to_int(text) or 0
+
+
+def to_float(text: str) -> float:
+    """쉼표가 포함된 숫자 문자열 변환, 변환할 수 없으면 0.0."""
+    try:
+        return float(text.replace(',', '').strip())
+    except ValueError:
+        return 0.0
+
+
+def format_float(value: float) -> str:
+    """79.3049 → '79.3049', 100.0 → '100'."""
+    return f'{value:f}'.rstrip('0').rstrip('.')
+
+
+class UnitType(NamedTuple):
+    """평형(주택형)별 공급대상 및 분양가. 숫자는 파싱 시점에 한 번만 변환합니다."""
+
+    house_type       : str                      # '084.9900A'
+    exclusive_area   : float                    # 전용면적(㎡), 주택형의 숫자 부분
+    supply_area      : float                    # 주택공급면적(㎡)
+    general_units    : int                      # 일반 공급세대수
+    special_units    : int                      # 특별 공급세대수 (전체)
+    total_units      : int                      # 전체 공급세대수
+    special_breakdown: Tuple[int, ...] = ()     # SPECIAL_SUPPLY_COLUMNS 순서, 특별공급 테이블이 없으면 빈 튜플
+    price            : Optional[int]   = None   # 분양가(최고가 기준, 만원)
+
+    @classmethod
+    def from_cells(cls, house_type: str, supply_area: str, general: str, special: str, total: str) -> 'UnitType':
+        """청약홈 공급세대 표의 한 행에서 생성."""
+        match = HOUSE_TYPE_AREA.match(house_type)
+        return cls(
+            house_type     = house_type,
+            exclusive_area = float(match.group(1)) if match else 0.0,
+            supply_area    = to_float(supply_area),
+            general_units  = to_count(general),
+            special_units  = to_count(special),
+            total_units    = to_count(total),
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> 'UnitType':
+        """JSON 직렬화된 행(list)에서 복원."""
+        return cls(*row[:6], tuple(row[6]), row[7])
+
+    @property
+    def area_m2(self) -> int:
+        """평당가 계산에 쓰는 전용면적(㎡) 정수부 (기존 '주택형'.split('.') 계산과 동일, 평 환산 전)."""
+        return int(self.exclusive_area)
+
+    def to_dict(self) -> dict:
+        """기존 Tool 응답 형식 ('평형별 공급대상 및 분양가' 의 한 항목)."""
+        special = {'전체': str(self.special_units)}
+        special.update(zip(SPECIAL_SUPPLY_COLUMNS, map(str, self.special_breakdown)))
+        ret = {
+            '주택형'         : self.house_type,
+            '주택공급면적'   : format_float(self.supply_area),
+            '전체 공급세대수': str(self.total_units),
+            '특별 공급세대수': special,
+            '일반 공급세대수': str(self.general_units),
+        }
+        if self.price is not None:
+            ret['분양가(최고가 기준)'] = f'{self.price:,} 만원'
+        return ret
+
+
+def units_to_dict(units: Sequence[UnitType]) -> dict:
+    """주택형별 평형 정보 사전 (기존 Tool 응답 형식)."""
+    return {unit.house_type: unit.to_dict() for unit in units}
+
+
+def avg_pyung_price(units: Sequence[UnitType]) -> Optional[int]:
+    """분양가가 있는 평형의 분양가 합 / (전용면적 합 / 3.3), 분양가 정보가 없으면 None."""
+    priced = [unit for unit in units if unit.price is not None]
+    if not priced:
+        return None
+    prices = np.fromiter((unit.price for unit in priced), dtype=np.int64, count=len(priced))
+    areas  = np.fromiter((unit.area_m2 for unit in priced), dtype=np.int64, count=len(priced))
+    if not areas.sum():
+        return None
+    return int(prices.sum() / (areas.sum() / 3.3))
+
+
+class Announcement(NamedTuple):
+    """분양공고 한 건 (odcloud 목록 필드 + 상세 페이지의 평형별 정보)."""
+
+    house_manage_no  : str
+    pblanc_no        : str
+    sido             : str
+    house_nm         : str
+    address          : str
+    lawd_cd          : Optional[int]
+    total_units      : int
+    contact          : str
+    rcrit_pblanc_de  : str
+    rcept_bgnde      : str
+    rcept_endde      : str
+    schedule         : Tuple[str, ...]     # SCHEDULE_FIELDS 순서의 청약 일정
+    developer        : str
+    constructor      : str
+    homepage_url     : str
+    announcement_url : str
+    units            : Tuple[UnitType, ...] = ()
+
+    @classmethod
+    def from_api(cls, apt_info: dict, lawd_cd: Optional[int] = None) -> 'Announcement':
+        """목록 응답(odcloud) 한 건에서 생성 (평형 정보는 상세 페이지 조회 후 _replace(units=...) 로 채움)."""
+        key = detail_key(apt_info['PBLANC_URL']) or ('', '')
+        return cls(
+            house_manage_no  = str(apt_info.get('HOUSE_MANAGE_NO') or key[0]),
+            pblanc_no        = str(apt_info.get('PBLANC_NO') or key[1]),
+            sido             = apt_info.get('SUBSCRPT_AREA_CODE_NM', ''),
+            house_nm         = apt_info['HOUSE_NM'],
+            address          = apt_info['HSSPLY_ADRES'],
+            lawd_cd          = lawd_cd,
+            total_units      = int(apt_info.get('TOT_SUPLY_HSHLDCO') or 0),
+            contact          = apt_info.get('MDHS_TELNO', ''),
+            rcrit_pblanc_de  = apt_info['RCRIT_PBLANC_DE'],
+            rcept_bgnde      = apt_info.get('RCEPT_BGNDE') or '',
+            rcept_endde      = apt_info.get('RCEPT_ENDDE') or '',
+            schedule         = tuple(apt_info.get(api_key) or '' for _, api_key in SCHEDULE_FIELDS),
+            developer        = apt_info.get('BSNS_MBY_NM', ''),
+            constructor      = apt_info.get('CNSTRCT_ENTRPS_NM', ''),
+            homepage_url     = apt_info.get('HMPG_ADRES', ''),
+            announcement_url = apt_info['PBLANC_URL'],
+        )
+
+    @property
+    def avg_pyung_price(self) -> Optional[int]:
+        """평형별 평당 분양가 평균."""
+        return avg_pyung_price(self.units)
+
+    def to_dict(self) -> dict:
+        """기존 Tool 응답 형식 (한글 키 분양정보)."""
+        ret = {
+            '단지명'    : self.house_nm,
+            '공급위치'  : self.address,
+            '법정동코드': self.lawd_cd,
+            '공급규모'  : self.total_units,
+            '문의처'    : self.contact,
+            '모집공고일': self.rcrit_pblanc_de,
+        }
+        ret.update(zip((label for label, _ in SCHEDULE_FIELDS), self.schedule))
+        ret.update({
+            '시행사'                   : self.developer,
+            '시공사'                   : self.constructor,
+            '아파트 홍보 URL'          : self.homepage_url,
+            '분양공고 URL'             : self.announcement_url,
+            '평형별 공급대상 및 분양가': units_to_dict(self.units),
+        })
+        avg_cost = self.avg_pyung_price
+        if avg_cost is not None:
+            ret['단지 평균 평당가'] = f'{avg_cost} 만원'
+        return ret
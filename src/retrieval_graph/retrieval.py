@@ -45,19 +45,22 @@ def make_elastic_retriever(
     """Configure this agent to connect to a specific elastic index."""
     from langchain_elasticsearch import ElasticsearchStore
 
-    connection_options = {}
-    if configuration.retriever_provider == "elastic-local":
-        connection_options = {
-            "es_user": os.environ["ELASTICSEARCH_USER"],
-            "es_password": os.environ["ELASTICSEARCH_PASSWORD"],
-        }
+    from retrieval_graph.es_client import get_es_client
 
+    if configuration.retriever_provider == "elastic-local":
+        es_client = get_es_client(
+            url=os.environ["ELASTICSEARCH_URL"],
+            username=os.environ["ELASTICSEARCH_USER"],
+            password=os.environ["ELASTICSEARCH_PASSWORD"],
+        )
     else:
-        connection_options = {"es_api_key": os.environ["ELASTICSEARCH_API_KEY"]}
+        es_client = get_es_client(
+            url=os.environ["ELASTICSEARCH_URL"],
+            api_key=os.environ["ELASTICSEARCH_API_KEY"],
+        )
 
     vstore = ElasticsearchStore(
-        **connection_options,  # type: ignore
-        es_url=os.environ["ELASTICSEARCH_URL"],
+        es_connection=es_client,
         index_name="embedding_policy", #Todo 하드코딩 방식
         embedding=embedding_model,
     )
@@ -0,0 +1,103 @@
+"""실거래가 API 응답 SQLite 캐시."""
+
+# region    '기본 라이브러리'
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Optional
+
+# endregion
+
+
+# region    'Cache 설정'
+DEFAULT_CACHE_PATH  = os.path.join(os.path.expanduser('~'), '.cache', 'retrieval_graph', 'rtms.sqlite3')
+DEFAULT_TTL_SECONDS = 6 * 60 * 60   # 아직 확정되지 않은 월(당월 등)의 캐시 유효시간
+DEFAULT_SETTLE_DAYS = 30            # 실거래 신고기한(계약일로부터 30일) 이후에는 해당 월 데이터가 변하지 않음
+
+_local = threading.local()
+# endregion
+
+
+def cache_path() -> str:
+    """RTMS 캐시 SQLite 파일 경로 (환경변수 RTMS_CACHE_PATH 로 변경 가능)."""
+    return os.getenv('RTMS_CACHE_PATH', DEFAULT_CACHE_PATH)
+
+
+def cache_ttl() -> int:
+    """미확정 월의 캐시 유효시간(초) (환경변수 RTMS_CACHE_TTL)."""
+    return int(os.getenv('RTMS_CACHE_TTL', DEFAULT_TTL_SECONDS))
+
+
+def settle_days() -> int:
+    """신고기한(일) (환경변수 RTMS_SETTLE_DAYS)."""
+    return int(os.getenv('RTMS_SETTLE_DAYS', DEFAULT_SETTLE_DAYS))
+
+
+def get_connection() -> sqlite3.Connection:
+    """스레드별 SQLite 연결 반환 (경로가 바뀌면 새로 연결)."""
+    path = cache_path()
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and getattr(_local, 'path', None) == path:
+        return conn
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute(
+        '''
+        CREATE TABLE IF NOT EXISTS rtms_page (
+            lawd_cd    INTEGER NOT NULL,
+            deal_ymd   INTEGER NOT NULL,
+            page_no    INTEGER NOT NULL,
+            num_rows   INTEGER NOT NULL,
+            body       BLOB    NOT NULL,
+            fetched_at REAL    NOT NULL,
+            PRIMARY KEY (lawd_cd, deal_ymd, page_no, num_rows)
+        )
+        '''
+    )
+    _local.conn = conn
+    _local.path = path
+    return conn
+
+
+def is_final_month(year_month: int, fetched_at: float) -> bool:
+    """해당 월의 신고기한이 지난 뒤에 조회된 데이터인지 확인 (확정된 월은 만료되지 않음)."""
+    year, month = divmod(int(year_month), 100)
+    if month == 12:
+        year, month = year + 1, 1
+    else:
+        month += 1
+    settled_at = datetime(year, month, 1).timestamp() + settle_days() * 24 * 60 * 60
+    return fetched_at >= settled_at
+
+
+def is_fresh(year_month: int, fetched_at: float, now: Optional[float] = None) -> bool:
+    """확정된 월이거나 유효시간이 지나지 않은 캐시인지 확인."""
+    now = time.time() if now is None else now
+    return is_final_month(year_month, fetched_at) or now - fetched_at < cache_ttl()
+
+
+def get_cached_page(area_code: int, year_month: int, page_no: int, num_rows: int) -> Optional[str]:
+    """캐시된 실거래가 페이지 조회, 없거나 만료되었으면 None."""
+    row = get_connection().execute(
+        'SELECT body, fetched_at FROM rtms_page WHERE lawd_cd=? AND deal_ymd=? AND page_no=? AND num_rows=?',
+        (int(area_code), int(year_month), int(page_no), int(num_rows)),
+    ).fetchone()
+    if row is None or not is_fresh(year_month, row[1]):
+        return None
+    return zlib.decompress(row[0]).decode('utf-8')
+
+
+def put_cached_page(area_code: int, year_month: int, page_no: int, num_rows: int, text: str) -> None:
+    """실거래가 페이지를 압축하여 저장."""
+    conn = get_connection()
+    with conn:
+        conn.execute(
+            'INSERT OR REPLACE INTO rtms_page VALUES (?, ?, ?, ?, ?, ?)',
+            (int(area_code), int(year_month), int(page_no), int(num_rows),
+             zlib.compress(text.encode('utf-8')), time.time()),
+        )
@@ -0,0 +1,74 @@
+"""실거래가 API 응답 XML 파서."""
+
+# region    '기본 라이브러리'
+import io
+import xml.etree.ElementTree as ET
+from typing import List, NamedTuple, Tuple
+
+# endregion
+
+
+class Trade(NamedTuple):
+    """실거래가 1건 (숫자 필드는 파싱 시 한 번만 변환)."""
+
+    umd_nm      : str    # 읍면동 이름
+    deal_amount : int    # 거래금액 (만원)
+    exclu_use_ar: float  # 전용면적 (㎡)
+    build_year  : int    # 건축년도 (미기재 시 0)
+    floor       : int    # 층 (미기재 시 0)
+
+
+ITEM_FIELDS = {'umdNm', 'dealAmount', 'excluUseAr', 'buildYear', 'floor'}
+
+
+def _to_int(text: str) -> int:
+    text = (text or '').replace(',', '').strip()
+    return int(text) if text else 0
+
+
+def parse_page(xml_text: str) -> Tuple[int, List[Trade]]:
+    """실거래가 응답 XML을 한 번만 순회하여 (totalCount, 거래목록)을 반환합니다.
+
+    처리한 <item> 요소는 즉시 비워서 전체 DOM 트리를 만들지 않습니다.
+    """
+    total_count = 0
+    trades      = []
+    fields      = {}
+    parent      = None
+
+    for event, elem in ET.iterparse(io.BytesIO(xml_text.encode('utf-8')), events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == 'items':
+                parent = elem
+            continue
+
+        if tag in ITEM_FIELDS:
+            fields[tag] = elem.text
+        elif tag == 'item':
+            try:
+                trades.append(Trade(
+                    umd_nm       = (fields.get('umdNm') or '').strip(),
+                    deal_amount  = _to_int(fields.get('dealAmount')),
+                    exclu_use_ar = float((fields.get('excluUseAr') or '0').strip()),
+                    build_year   = _to_int(fields.get('buildYear')),
+                    floor        = _to_int(fields.get('floor')),
+                ))
+            except ValueError:
+                pass
+            fields.clear()
+            if parent is not None:
+                parent.clear()
+        elif tag == 'totalCount':
+            total_count = _to_int(elem.text)
+
+    return total_count, trades
+
+
+def pyung_prices(trades: List[Trade], target_umd: str) -> List[float]:
+    """특정 읍면동 거래의 평당가(만원) 목록."""
+    return [
+        trade.deal_amount / (trade.exclu_use_ar / 3.3)
+        for trade in trades
+        if trade.umd_nm == target_umd and trade.exclu_use_ar > 0
+    ]
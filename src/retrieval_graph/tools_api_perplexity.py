@@ -1,46 +1,31 @@
 # region 기본 라이브러리
 import requests
 import json
+import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Tuple
 # endregion
 
 # region LangChain 라이브러리
 from langchain_core.pydantic_v1 import BaseModel, Field
 # endregion
 
+# region LangGraph 라이브러리
+from langgraph.config import get_stream_writer
+from retrieval_graph.http_client import get_session, timeout_for
+from retrieval_graph.perplexity_cache import cache_key, cache_ttl, get_cached_result, max_stale, put_cached_result
+# endregion
 
-class QueryPerplexityInput(BaseModel):
-    query: str = Field(description="청약 신청 지역 부동산 정보 질문 (예: '서울 구로구 고척동 고척 푸르지오 힐스테이트')")
-    # apply_price: int = Field(description="청약 분양가 평당 가격, 단위 만원 (예: 3300)")
-    # avg_sale_price: int = Field(description="평균 실거래가 평당 가격, 단위 만원 (예: 3500)")
-
-
-def query_perplexity_tool(query: QueryPerplexityInput) -> dict:
-    """
-    Name: 부동산 정보 검색 (Perplexity)
-    Description: 최근 1년간 부동산 정보를 Perplexity를 통해 검색하고, 도시계획, 인프라 현황을 포함해 가치를 분석합니다.
-
-    Parameters:
-    - query (str, required): 지역 부동산 정보 질문
-
-    Returns:
-    - dict: {'status': 'success', 'result': str} 또는 {'status': 'error', 'message': str}
-    """
-    url = "https://api.perplexity.ai/chat/completions"
-    api_key = os.environ["PERPLEXITY_API_KEY"]
 
-    one_year_ago = (datetime.now() - timedelta(days=365)).strftime("%m/%d/%Y")
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
+logger = logging.getLogger(__name__)
 
-    payload = {
-        "model": "sonar",
-        "messages": [
-            {
-                "role": "system",
-                "content": """당신은 대한민국 부동산 투자 전문가 AI입니다. 
+PERPLEXITY_URL     = "https://api.perplexity.ai/chat/completions"
+PERPLEXITY_MODEL   = "sonar"
+SEARCH_WINDOW_DAYS = 365   # 최근 1년
+SYSTEM_PROMPT      = """당신은 대한민국 부동산 투자 전문가 AI입니다. 
                         아래와 같은 구조와 스타일로 부동산 가치 평가 리포트를 작성하세요.
 
                         - 결과는 반드시 아래 예시와 동일한 형식, 항목, 스타일(이모지, 등급, 한글, 강조 포함)로 작성하세요.
@@ -73,57 +58,249 @@ def query_perplexity_tool(query: QueryPerplexityInput) -> dict:
                         - 결과는 반드시 위 구조, 항목, 스타일을 그대로 따르세요.
                         - 결과는 한글로 작성하고, 이모지와 등급, 강조를 반드시 포함하세요.
                         """
+
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='perplexity-refresh')
+_refresh_lock     = threading.Lock()
+_refreshing       = set()   # 백그라운드 갱신 중인 캐시 키
+
+
+class QueryPerplexityInput(BaseModel):
+    query: str = Field(description="청약 신청 지역 부동산 정보 질문 (예: '서울 구로구 고척동 고척 푸르지오 힐스테이트')")
+    # apply_price: int = Field(description="청약 분양가 평당 가격, 단위 만원 (예: 3300)")
+    # avg_sale_price: int = Field(description="평균 실거래가 평당 가격, 단위 만원 (예: 3500)")
+
+
+def build_payload(query: str, stream: bool = False) -> dict:
+    """Perplexity chat/completions 요청 본문 (최근 SEARCH_WINDOW_DAYS 일 검색)."""
+    search_after = (datetime.now() - timedelta(days=SEARCH_WINDOW_DAYS)).strftime("%m/%d/%Y")
+    payload = {
+        "model": PERPLEXITY_MODEL,
+        "messages": [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
             },
             {
                 "role": "user",
                 "content": query
             }
         ],
-        "search_after_date_filter": one_year_ago
+        "search_after_date_filter": search_after
     }
+    if stream:
+        payload["stream"] = True
+    return payload
+
+
+def parse_references(result: dict) -> list:
+    """응답의 citations / search_results 를 참고 정보 목록으로."""
+    references = []
+    for citation in result.get("citations", []):
+        references.append({
+            "type": "citation",
+            "url": citation
+        })
+
+    for search_result in result.get("search_results", []):
+        references.append({
+            "type": "search_result",
+            "title": search_result.get("title", ""),
+            "url": search_result.get("url", ""),
+            "date": search_result.get("date", "")
+        })
+    return references
+
 
+def _headers() -> dict:
+    return {
+        "Authorization": f"Bearer {os.environ['PERPLEXITY_API_KEY']}",
+        "Content-Type": "application/json"
+    }
+
+
+def fetch_perplexity(query: str) -> Tuple[dict, bool]:
+    """Perplexity 호출. (Tool 응답, 일시적 장애 여부(timeout / 연결 오류 / 5xx)) 반환."""
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        response = get_session().post(PERPLEXITY_URL, json=build_payload(query), headers=_headers(), timeout=timeout_for(PERPLEXITY_URL))
 
         if response.status_code != 200:
-            return {"status": "error", "message": f"API 요청 실패: {response.status_code} - {response.text}"}
+            return {"status": "error", "message": f"API 요청 실패: {response.status_code} - {response.text}"}, response.status_code >= 500
 
         result = response.json()
         if "choices" not in result or not result["choices"]:
-            return {"status": "error", "message": "API 응답에 'choices'가 없습니다."}
+            return {"status": "error", "message": "API 응답에 'choices'가 없습니다."}, False
 
-        message = result["choices"][0]["message"]["content"]
-        
-        # 참고 정보 추출
-        references = []
-        if "citations" in result:
-            for citation in result["citations"]:
-                references.append({
-                    "type": "citation",
-                    "url": citation
-                })
-                
-        if "search_results" in result:
-            for result in result["search_results"]:
-                references.append({
-                    "type": "search_result",
-                    "title": result.get("title", ""),
-                    "url": result.get("url", ""),
-                    "date": result.get("date", "")
-                })
-        
         return {
-            "status": "success", 
-            "perplexity_result": message,
-            "perplexity_references": references
-        }
+            "status": "success",
+            "perplexity_result": result["choices"][0]["message"]["content"],
+            "perplexity_references": parse_references(result)
+        }, False
 
+    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+        return {"status": "error", "message": f"요청 오류: {str(e)}"}, True
     except requests.exceptions.RequestException as e:
-        return {"status": "error", "message": f"요청 오류: {str(e)}"}
+        return {"status": "error", "message": f"요청 오류: {str(e)}"}, False
     except json.JSONDecodeError as e:
-        return {"status": "error", "message": f"JSON 파싱 오류: {str(e)}"}
+        return {"status": "error", "message": f"JSON 파싱 오류: {str(e)}"}, False
     except Exception as e:
-        return {"status": "error", "message": f"예상치 못한 오류: {str(e)}"}
+        return {"status": "error", "message": f"예상치 못한 오류: {str(e)}"}, False
+
+
+def stream_perplexity(query: str, on_delta: Callable[[str], None]) -> Tuple[dict, bool]:
+    """Perplexity SSE(stream: true) 호출. 응답 조각마다 on_delta(추가된 텍스트)를 호출하고, fetch_perplexity 와 같은 형식을 반환합니다.
+
+    SSE 가 아닌 JSON 응답(프록시 등)이 오면 한 번에 전달합니다.
+    스트림 도중 연결이 끊기거나 조각이 잘리면 일시적 장애로 보고 저장된 결과로 대체할 수 있게 합니다.
+    """
+    streaming = False
+    try:
+        response = get_session().post(
+            PERPLEXITY_URL, json=build_payload(query, stream=True), headers=_headers(), timeout=timeout_for(PERPLEXITY_URL), stream=True
+        )
+        with response:
+            if response.status_code != 200:
+                return {"status": "error", "message": f"API 요청 실패: {response.status_code} - {response.text}"}, response.status_code >= 500
+
+            if "text/event-stream" not in response.headers.get("Content-Type", ""):
+                chunks = [response.json()]
+                deltas = [chunk["choices"][0]["message"]["content"] for chunk in chunks if chunk.get("choices")]
+                for delta in deltas:
+                    on_delta(delta)
+            else:
+                chunks, deltas    = [], []
+                streaming         = True
+                response.encoding = response.encoding or "utf-8"   # SSE 는 항상 UTF-8 (charset 이 없으면 bytes 로 읽힘)
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    chunks.append(chunk)
+                    delta = (chunk.get("choices") or [{}])[0].get("delta", {}).get("content")
+                    if delta:
+                        deltas.append(delta)
+                        on_delta(delta)
+
+        if not deltas:
+            return {"status": "error", "message": "API 응답에 'choices'가 없습니다."}, False
+
+        # 참고 정보는 조각마다 누적된 목록이 오므로 마지막 값을 사용
+        last = {}
+        for chunk in chunks:
+            last.update({name: chunk[name] for name in ("citations", "search_results") if name in chunk})
+        return {
+            "status": "success",
+            "perplexity_result": "".join(deltas),
+            "perplexity_references": parse_references(last)
+        }, False
+
+    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+        return {"status": "error", "message": f"요청 오류: {str(e)}"}, True
+    except requests.exceptions.RequestException as e:
+        return {"status": "error", "message": f"요청 오류: {str(e)}"}, False
+    except json.JSONDecodeError as e:
+        return {"status": "error", "message": f"JSON 파싱 오류: {str(e)}"}, streaming
+    except Exception as e:
+        return {"status": "error", "message": f"예상치 못한 오류: {str(e)}"}, False
+
+
+def _refresh(key: tuple, query: str) -> None:
+    try:
+        result, _ = fetch_perplexity(query)
+        if result["status"] == "success":
+            put_cached_result(key, result)
+        else:
+            logger.warning("Perplexity 캐시 갱신 실패: %s (%s)", query, result['message'])
+    finally:
+        with _refresh_lock:
+            _refreshing.discard(key)
+
+
+def refresh_in_background(key: tuple, query: str) -> None:
+    """같은 키의 갱신이 진행 중이 아니면 백그라운드 갱신 예약."""
+    with _refresh_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    _refresh_executor.submit(_refresh, key, query)
+
+
+def _query_with_cache(query: str, fetch: Callable[[str], Tuple[dict, bool]]) -> dict:
+    """캐시 조회 → (없거나 너무 오래됐으면) fetch 호출. 일시적 장애면 오래된 결과라도 반환."""
+    # region    '캐시 조회 (유효시간이 지났으면 저장된 결과를 반환하고 백그라운드 갱신)'
+    key    = cache_key(query, SEARCH_WINDOW_DAYS, PERPLEXITY_MODEL, SYSTEM_PROMPT)
+    cached = get_cached_result(key)
+    if cached is not None:
+        result, age = cached
+        if age < cache_ttl():
+            return result
+        if age < max_stale():
+            refresh_in_background(key, query)
+            return result
+    # endregion
+
+    result, transient = fetch(query)
+    if result["status"] == "success":
+        put_cached_result(key, result)
+        return result
+
+    # 일시적 장애면 오래된 결과라도 반환
+    if transient and cached is not None:
+        logger.warning("Perplexity 응답 실패, 저장된 결과 사용: %s (%s)", query, result['message'])
+        return cached[0]
+    return result
+
+
+def query_perplexity_tool(query: QueryPerplexityInput) -> dict:
+    """
+    Name: 부동산 정보 검색 (Perplexity)
+    Description: 최근 1년간 부동산 정보를 Perplexity를 통해 검색하고, 도시계획, 인프라 현황을 포함해 가치를 분석합니다.
+
+    Parameters:
+    - query (str, required): 지역 부동산 정보 질문
+
+    Returns:
+    - dict: {'status': 'success', 'result': str} 또는 {'status': 'error', 'message': str}
+    """
+    return _query_with_cache(query, fetch_perplexity)
+
+
+def _stream_writer() -> Callable[[dict], None]:
+    """LangGraph custom 스트림 writer (그래프 밖에서 호출되면 아무것도 하지 않음)."""
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        return lambda _: None
+
+
+def query_perplexity_stream_tool(query: QueryPerplexityInput) -> dict:
+    """query_perplexity_tool 의 스트리밍 버전.
+
+    Perplexity 응답 조각을 LangGraph custom 스트림 이벤트({'type': 'perplexity', 'query', 'delta'})로 바로 전달하고,
+    완료되면 {'done': True} 이벤트 후 같은 형식의 결과를 반환합니다. 캐시된 결과는 전체 텍스트를 한 번에 전달하고,
+    도중에 실패하면 저장된 결과로 교체({'replace'})하거나 오류({'error'})를 전달합니다.
+    (graph.stream(..., stream_mode=['custom', ...]) / astream(...) 으로 수신)
+    """
+    writer  = _stream_writer()
+    emitted = []
+
+    def on_delta(delta: str) -> None:
+        emitted.append(delta)
+        writer({"type": "perplexity", "query": query, "delta": delta})
+
+    result = _query_with_cache(query, lambda q: stream_perplexity(q, on_delta))
+    if result["status"] == "success" and not emitted:
+        writer({"type": "perplexity", "query": query, "delta": result["perplexity_result"]})
+    elif result["status"] == "success" and "".join(emitted) != result["perplexity_result"]:
+        # 스트리밍 도중 실패하여 저장된 결과로 대체된 경우 전달한 텍스트 교체
+        writer({"type": "perplexity", "query": query, "replace": result["perplexity_result"]})
+    elif result["status"] == "error" and emitted:
+        # 일부 텍스트를 전달한 뒤 실패했고 대체할 결과도 없으면 done 전에 오류 전달
+        writer({"type": "perplexity", "query": query, "error": result["message"]})
+    writer({"type": "perplexity", "query": query, "done": True})
+    return result
 
 
 # 테스트
@@ -1,23 +1,51 @@
 # region    '기본 라이브러리'
 import os
-from typing import List
-import requests
-import xml.etree.ElementTree as ET
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
+import numpy as np
 # endregion
 
 # region    'LangChain 라이브러리'
 from langchain_core.pydantic_v1 import BaseModel, Field
 # endregion
 
+# region    'LangGraph 라이브러리'
+from retrieval_graph import http_client
+from retrieval_graph.rtms_cache import get_cached_page, put_cached_page
+from retrieval_graph.rtms_parser import Trade, parse_page, pyung_prices
+from retrieval_graph.trade_table import TradeTable, get_cached_table, put_cached_table
+from retrieval_graph.market_stats import market_stats
+# endregion
+
+
+NUM_OF_ROWS         = 1000
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_AGE     = 2 * 24 * 60 * 60   # 일괄 적재된 미확정 월 테이블을 조회에 그대로 사용할 최대 경과시간
+SUCCESS_CODES       = {'00', '000', '03'}  # 03: NODATA_ERROR (거래 없음)
+
 
 class calcAvgPyungPriceInput(BaseModel):
     area_code: int = Field(default=0, description="분양단지의 법정동 코드 (예: 11110)")
     umd_name: str  = Field(default="", description="분양단지의 공급위치 상 읍면동 이름 (예: '서울특별시 송파구 잠실동' → '잠실동')")
 
 
+class RtmsApiError(Exception):
+    """실거래가 API 오류 응답 (HTTP 오류 또는 data.go.kr XML 오류 코드)."""
+
+    def __init__(self, code: str, message: str = ''):
+        """오류 코드(resultCode 또는 HTTP 상태)와 메시지로 생성."""
+        super().__init__(f'실거래가 API 오류 ({code}) {message}'.strip())
+        self.code = code
+
 def fetch_api_data(year_month: int, area_code: int, pageNo: int = 1, numOfRows: int = 1000) -> str:
+    """실거래가 페이지 조회, 캐시에 있으면 로컬에서 반환하고 없으면 API 호출 후 캐시에 저장."""
+    cached = get_cached_page(area_code, year_month, pageNo, numOfRows)
+    if cached is not None:
+        return cached
+
     base_url = 'http://apis.data.go.kr/1613000/RTMSDataSvcAptTrade'
     serviceKey = os.environ['DATA_GO_KR_SERVICE_KEY']
 
@@ -27,48 +55,83 @@ def fetch_api_data(year_month: int, area_code: int, pageNo: int = 1, numOfRows:
     url += f"&pageNo={pageNo}"
     url += f"&numOfRows={numOfRows}"
 
-    response = requests.get(url, verify=False)
-    return response.text if response.status_code == 200 else None
+    response = http_client.get(url, retry_error_envelope=True)
+    if response.status_code != 200:
+        raise RtmsApiError(str(response.status_code))
 
-def parse_items(xml_text: str, target_umd: str) -> List[float]:
-    root = ET.fromstring(xml_text)
-    items = root.findall(".//item")
-    pyung_prices = []
+    code = http_client.result_code(response.text)
+    if code not in SUCCESS_CODES:
+        raise RtmsApiError(code or 'unknown', response.text[:200])
 
-    for item in items:
-        umdNm = item.findtext("umdNm", "").strip()
-        if umdNm != target_umd:
-            continue
+    put_cached_page(area_code, year_month, pageNo, numOfRows, response.text)
+    return response.text
 
-        try:
-            area = float(item.findtext("excluUseAr", "0").strip())
-            amount = int(item.findtext("dealAmount", "0").replace(",", "").strip())
-            pyung_price = amount / (area / 3.3)
-            pyung_prices.append(pyung_price)
-        except (ValueError, ZeroDivisionError):
-            continue
+def parse_items(xml_text: str, target_umd: str) -> List[float]:
+    return pyung_prices(parse_page(xml_text)[1], target_umd)
+
+def fetch_all_trades(months_yyyymm: List[int], area_code: int, max_workers: int = None) -> Dict[int, List[Trade]]:
+    """여러 월의 실거래가 페이지를 동시에 조회하여 월별 거래목록을 반환합니다.
 
-    return pyung_prices
+    각 월의 1페이지로 totalCount를 확인한 뒤, 나머지 페이지를 한 번에 병렬 조회합니다.
+    각 페이지는 한 번만 파싱합니다.
+    """
+    max_workers = max_workers or int(os.getenv('RTMS_MAX_WORKERS', DEFAULT_MAX_WORKERS))
+    trades      = {year_month: [] for year_month in months_yyyymm}
+
+    def fetch_page(year_month: int, page: int):
+        xml_data = fetch_api_data(year_month, area_code, page, NUM_OF_ROWS)
+        return parse_page(xml_data) if xml_data else None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # region    '1페이지 조회 및 전체 페이지 수 확인'
+        first_pages = executor.map(lambda year_month: fetch_page(year_month, 1), months_yyyymm)
+
+        remaining = []
+        for year_month, parsed in zip(months_yyyymm, first_pages):
+            if not parsed:
+                continue
+            total_count, page_trades = parsed
+            trades[year_month].extend(page_trades)
+
+            last_page  = math.ceil(total_count / NUM_OF_ROWS)
+            remaining += [(year_month, page) for page in range(2, last_page + 1)]
+        # endregion
+
+        # region    '나머지 페이지 병렬 조회'
+        futures = [executor.submit(fetch_page, year_month, page) for year_month, page in remaining]
+        for (year_month, _), future in zip(remaining, futures):
+            parsed = future.result()
+            if parsed:
+                trades[year_month].extend(parsed[1])
+        # endregion
+
+    return trades
 
 def get_all_items_for_month(year_month: int, area_code: int, target_umd: str) -> List[float]:
-    all_prices = []
-    page = 1
+    return load_pyung_prices([year_month], area_code, target_umd).tolist()
+
+def load_trade_tables(months_yyyymm: List[int], area_code: int) -> Dict[int, TradeTable]:
+    """시군구의 월별 실거래가 테이블을 반환합니다.
 
-    while True:
-        xml_data = fetch_api_data(year_month, area_code, pageNo=page)
-        if not xml_data:
-            break
+    저장된 테이블이 있으면 그대로 사용하고, 없는 월만 한 번에 조회하여 읍면동 구분 없이 전체를 저장합니다.
+    미확정 월도 RTMS_TABLE_MAX_AGE 이내에 적재된 테이블이면 로컬 데이터로 응답합니다 (ingest_trades 참고).
+    """
+    max_age = int(os.getenv('RTMS_TABLE_MAX_AGE', DEFAULT_MAX_AGE))
+    tables  = {year_month: get_cached_table(area_code, year_month, max_age=max_age) for year_month in months_yyyymm}
+    missing = [year_month for year_month, table in tables.items() if table is None]
 
-        root = ET.fromstring(xml_data)
-        total_count = int(root.findtext(".//totalCount", "0"))
-        prices = parse_items(xml_data, target_umd)
-        all_prices.extend(prices)
+    if missing:
+        for year_month, trades in fetch_all_trades(missing, area_code).items():
+            tables[year_month] = TradeTable.from_trades(trades)
+            put_cached_table(area_code, year_month, tables[year_month])
 
-        if page * 1000 >= total_count:
-            break
-        page += 1
+    return tables
 
-    return all_prices
+def load_pyung_prices(months_yyyymm: List[int], area_code: int, umd_name: str) -> np.ndarray:
+    """시군구 테이블에서 읍면동 거래만 골라 평당가(만원) 배열을 반환합니다."""
+    table  = TradeTable.concat(list(load_trade_tables(months_yyyymm, area_code).values()))
+    prices = table.pyung_price()[table.umd_mask(umd_name)]
+    return prices[~np.isnan(prices)]
 
 def calc_avg_pyung_price(area_code: int, umd_name: str) -> dict:
     """
@@ -83,17 +146,13 @@ def calc_avg_pyung_price(area_code: int, umd_name: str) -> dict:
     - dict: {'status': 'success', 'avg_price': float} 또는 {'status': 'error', 'message': str}
     """
     try:
-        all_pyung_prices = []
-
         now = datetime.now()
         months_yyyymm = [int((now - relativedelta(months=i)).strftime("%Y%m")) for i in range(3)]
 
-        for year_month in months_yyyymm:
-            prices = get_all_items_for_month(year_month, area_code, umd_name)
-            all_pyung_prices.extend(prices)
+        all_pyung_prices = load_pyung_prices(months_yyyymm, area_code, umd_name)
 
-        if all_pyung_prices:
-            avg_price = round(sum(all_pyung_prices) / len(all_pyung_prices), 2)
+        if len(all_pyung_prices):
+            avg_price = round(float(all_pyung_prices.mean()), 2)
             print(f"{umd_name}의 평균 평당가: {avg_price:,.0f} 만원")
             return {"status": "success", "avg_price": avg_price}
         else:
@@ -102,6 +161,33 @@ def calc_avg_pyung_price(area_code: int, umd_name: str) -> dict:
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+def calc_market_stats(area_code: int, umd_name: str) -> dict:
+    """
+    Name: 실거래가 시세 통계 조회
+    Description: 특정 읍면동의 최근 3개월 아파트 실거래가 기준 평단가 통계(중앙값, 절사평균, p10/p90, 건수)와
+                 전용면적(59/84/85~100㎡형, 100㎡ 초과) 및 건축년도 구간별 통계를 조회합니다.
+
+    Parameters:
+    - area_code (int, required): 지역코드 (예: 11110)
+    - umd_name (str, required): 읍면동 이름 (예: "신사동")
+
+    Returns:
+    - dict: {'status': 'success', 'stats': dict} 또는 {'status': 'error', 'message': str}
+    """
+    try:
+        now = datetime.now()
+        months_yyyymm = [int((now - relativedelta(months=i)).strftime("%Y%m")) for i in range(3)]
+
+        table = TradeTable.concat(list(load_trade_tables(months_yyyymm, area_code).values()))
+        stats = market_stats(table, umd_name, current_year=now.year)
+
+        if stats['overall']['count']:
+            return {"status": "success", "stats": stats}
+        else:
+            return {"status": "error", "message": f"{umd_name}의 거래 데이터를 찾을 수 없습니다."}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
 if __name__ == "__main__":
     # 테스트용 파라미터 설정
     test_area_code = 11110  # 예: 종로구
@@ -1,9 +1,12 @@
 # region    '기본 라이브러리'
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-import requests
-import json
-from bs4 import BeautifulSoup
 import os
+import logging
+from itertools import islice
+from typing import Iterator, List, Optional
+
+import requests
 # endregion
 
 # region    'LangChain 라이브러리'
@@ -11,10 +14,17 @@ from langchain_core.pydantic_v1 import BaseModel, Field
 # endregion
 
 # region    'LangGraph 라이브러리'
-from retrieval_graph.constants import AREA_CODE
+from retrieval_graph import http_client
+from retrieval_graph.address_resolver import resolve_address
+from retrieval_graph.announcement_cache import detail_key, get_cached_html, get_cached_units, put_cached_detail, update_cached_units
+from retrieval_graph.applyhome_parser import parse_unit_types
+from retrieval_graph.records import Announcement, UnitType
 # endregion
 
 
+logger = logging.getLogger(__name__)
+
+
 class getAPTListInput(BaseModel):
     """
     아파트 분양정보 조회 Tool의 입력 정의
@@ -23,138 +33,142 @@ class getAPTListInput(BaseModel):
     city: str = Field(default="", description="한국의 시/도 기준 도시명. 예: '서울', '경기', etc.")
 
 
-def get_apt_list(city: str) -> dict:
+DEFAULT_MAX_WORKERS = 8
+PAGE_SIZE           = 100
+PARSER_VERSION      = 2  # parse_unit_types 결과 형식이 바뀌면 증가 (캐시된 HTML 재파싱)
+REQUEST_HEADERS     = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36'
+}
+
+
+def download_detail(url: str) -> str:
+    """청약홈 분양공고 상세 페이지 HTML."""
+    response = http_client.get(url, headers=REQUEST_HEADERS)
+    response.raise_for_status()
+    return response.text
+
+
+def fetch_supply_detail(url: str) -> List[UnitType]:
+    """분양공고 상세 페이지 조회 및 평형별 공급대상 및 분양가 추출.
+
+    게시된 공고는 바뀌지 않으므로 (houseManageNo, pblancNo) 기준으로 영구 캐시하고,
+    파서 버전이 바뀐 경우에는 저장된 HTML을 다시 파싱합니다.
     """
-    사용자가 요청한 지역의 아파트 분양정보를 조회합니다.
+    key = detail_key(url)
+    if key is None:
+        return parse_unit_types(download_detail(url))
+
+    rows = get_cached_units(key, PARSER_VERSION)
+    if rows is not None:
+        return [UnitType.from_row(row) for row in rows]
+
+    html = get_cached_html(key)
+    if html is not None:
+        units = parse_unit_types(html)
+        update_cached_units(key, units, PARSER_VERSION)
+        return units
+
+    html  = download_detail(url)
+    units = parse_unit_types(html)
+    put_cached_detail(key, html, units, PARSER_VERSION)
+    return units
+
+
+def fetch_supply_details(urls: List[str], max_workers: int = None) -> List[Optional[List[UnitType]]]:
+    """여러 분양공고 상세 페이지를 동시에 조회하고, 도착하는 순서대로 파싱합니다.
+
+    호스트별 동시 요청 수는 http_client.HOST_CONCURRENCY 로 제한되며, 결과는 urls 순서를 유지합니다.
+    조회/파싱에 실패한 공고는 None 으로 반환합니다 (평형 정보가 없는 공고의 빈 목록과 구분).
     """
+    max_workers = max_workers or int(os.getenv('APPLYHOME_MAX_WORKERS', DEFAULT_MAX_WORKERS))
+    details     = [None for _ in urls]
+    if not urls:
+        return details
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        futures = {executor.submit(fetch_supply_detail, url): i for i, url in enumerate(urls)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                details[i] = future.result()
+            except (requests.RequestException, IndexError, KeyError, TypeError, ValueError) as e:
+                logger.warning('분양공고 상세 조회 실패: %s (%s)', urls[i], e)
+
+    return details
 
+
+def iter_announcements(city: str, since: str = None, page_size: int = PAGE_SIZE) -> Iterator[dict]:
+    """분양정보 목록(odcloud)을 페이지 단위로 필요한 만큼만 조회하여 한 건씩 반환합니다.
+
+    since(YYYY-MM-DD) 이후 모집공고만 조회하며, 기본값은 최근 30일입니다.
+    """
     # region    'Parameter Setting'
     base_url    = 'http://api.odcloud.kr/api'
     serviceKey  = os.environ['DATA_GO_KR_SERVICE_KEY']
-    perPage     = 100
-    target_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-    today       = datetime.now().strftime('%Y-%m-%d')
+    target_date = since or (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
     target_area = city
     # endregion
 
-    # region    '분양정보 조회'
-    url      = f'{base_url}/ApplyhomeInfoDetailSvc/v1/getAPTLttotPblancDetail?serviceKey={serviceKey}'
-    url      = f'{url}&perPage={perPage}'
-    url      = f'{url}&cond[RCRIT_PBLANC_DE::GTE]={target_date}'
-    url      = f'{url}&cond[SUBSCRPT_AREA_CODE_NM::EQ]={target_area}'
-    apt_list = requests.get(url).json()['data']
+    # region    '분양정보 페이지 조회'
+    page = 1
+    while True:
+        url      = f'{base_url}/ApplyhomeInfoDetailSvc/v1/getAPTLttotPblancDetail?serviceKey={serviceKey}'
+        url      = f'{url}&page={page}&perPage={page_size}'
+        url      = f'{url}&cond[RCRIT_PBLANC_DE::GTE]={target_date}'
+        url      = f'{url}&cond[SUBSCRPT_AREA_CODE_NM::EQ]={target_area}'
+        response = http_client.get(url).json()
+        apt_list = response.get('data') or []
+
+        yield from apt_list
+
+        match_count = response.get('matchCount', response.get('totalCount', 0))
+        if not apt_list or page * page_size >= match_count:
+            break
+        page += 1
     # endregion
 
-    # region    '분양정보 구조화'
-    ret = []
-    for apt_info in apt_list:
-        # region    '청약접수 종료일이 이미 지났으면 가져오지 않도록 설정, 단 시연을 위해 생략'
-        # if apt_info['RCEPT_ENDDE'] < today:
-        #     continue
-        # endregion
 
-        # region    '법정동 코드 매핑'
-        area    = apt_info['HSSPLY_ADRES'].split()
-        area_cd = None
-        if ' '.join(area[:2]) in AREA_CODE.keys():
-            area_cd = AREA_CODE.get(' '.join(area[:2]))
-        elif ' '.join(area[:3]) in AREA_CODE.keys():
-            area_cd = AREA_CODE.get(' '.join(area[:3]))
-        # endregion
+def area_code_of(address: str):
+    """공급위치 주소의 시군구 법정동 코드, 매핑되지 않으면 None."""
+    return resolve_address(address)[0]
 
-        # region    '기본 정보 저장'
-        item = {
-            '단지명'                     : apt_info['HOUSE_NM'],
-            '공급위치'                   : apt_info['HSSPLY_ADRES'],
-            '법정동코드'                 : area_cd,
-            '공급규모'                   : apt_info['TOT_SUPLY_HSHLDCO'],
-            '문의처'                     : apt_info['MDHS_TELNO'],
-            '모집공고일'                 : apt_info['RCRIT_PBLANC_DE'],
-            '특별공급 청약접수시작'      : apt_info['SPSPLY_RCEPT_BGNDE'],
-            '특별공급 청약접수종료'      : apt_info['SPSPLY_RCEPT_ENDDE'],
-            '1순위 해당지역 청약접수시작': apt_info['GNRL_RNK1_CRSPAREA_RCPTDE'],
-            '1순위 해당지역 청약접수종료': apt_info['GNRL_RNK1_CRSPAREA_ENDDE'],
-            '1순위 기타지역 청약접수시작': apt_info['GNRL_RNK1_ETC_AREA_RCPTDE'],
-            '1순위 기타지역 청약접수종료': apt_info['GNRL_RNK1_ETC_AREA_ENDDE'],
-            '2순위 해당지역 청약접수시작': apt_info['GNRL_RNK2_CRSPAREA_RCPTDE'],
-            '2순위 해당지역 청약접수종료': apt_info['GNRL_RNK2_CRSPAREA_ENDDE'],
-            '2순위 기타지역 청약접수시작': apt_info['GNRL_RNK2_ETC_AREA_RCPTDE'],
-            '2순위 기타지역 청약접수종료': apt_info['GNRL_RNK2_ETC_AREA_ENDDE'],
-            '당첨자 발표일'              : apt_info['PRZWNER_PRESNATN_DE'],
-            '계약 시작'                  : apt_info['CNTRCT_CNCLS_BGNDE'],
-            '계약 종료'                  : apt_info['CNTRCT_CNCLS_ENDDE'],
-            '시행사'                     : apt_info['BSNS_MBY_NM'],
-            '시공사'                     : apt_info['CNSTRCT_ENTRPS_NM'],
-            '아파트 홍보 URL'            : apt_info['HMPG_ADRES'],
-            '분양공고 URL'               : apt_info['PBLANC_URL'],
-            '평형별 공급대상 및 분양가'  : {},
-        }
-        # endregion
 
-        # region    '공급규모 & 공급가 조회'
-        headers         = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36'
-        }
-        apt_detail_info = BeautifulSoup(requests.get(apt_info['PBLANC_URL'], headers=headers).text, 'html.parser')
-        tables          = apt_detail_info.find_all('tbody')
-
-        if len(tables) == 6:
-            supply_all     = tables[2].find_all('tr')[:-1]
-            supply_special = tables[3].find_all('tr')
-            supply_costs   = tables[4].find_all('tr')
-        else:
-            supply_all     = tables[2].find_all('tr')[:-1]
-            supply_special = []
-            supply_costs   = tables[3].find_all('tr')
-        # endregion
+def build_announcement(apt_info: dict) -> Announcement:
+    """목록 API 응답 한 건을 분양공고 레코드로 변환 (상세 페이지 정보 제외)."""
+    return Announcement.from_api(apt_info, area_code_of(apt_info['HSSPLY_ADRES']))
 
-        # region    '공급규모 저장'
-        for supply_item in supply_all:
-            supply_columns = supply_item.find_all('td')
-            supply_columns = supply_columns[-6:]
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ] = {
-                '주택형'         : supply_columns[0].text.strip(),
-                '주택공급면적'   : supply_columns[1].text.strip(),
-                '전체 공급세대수': supply_columns[4].text.strip(),
-                '특별 공급세대수': {
-                    '전체': supply_columns[3].text.strip(),
-                },
-                '일반 공급세대수': supply_columns[2].text.strip(),
-            }
-        # endregion
 
-        # region    '특별공급 규모 저장'
-        for supply_item in supply_special:
-            supply_columns = supply_item.find_all('td')
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['다자녀가구']     = supply_columns[1].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['신혼부부']       = supply_columns[2].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['생애최초']       = supply_columns[3].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['청년']           = supply_columns[4].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['노부모부양']     = supply_columns[5].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['신생아(일반형)'] = supply_columns[6].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['기관추천']       = supply_columns[7].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['이전기관']       = supply_columns[8].text.strip()
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['특별 공급세대수']['기타']           = supply_columns[9].text.strip()
-        # endregion
+def iter_apt_list(city: str, open_only: bool = False, batch_size: int = 1, page_size: int = PAGE_SIZE) -> Iterator[Announcement]:
+    """지역 분양공고를 평형 정보까지 채워 한 건씩 반환합니다.
 
-        # region    '분양가 저장 및 평당가 계산'
-        total_cost = 0
-        total_size = 0
-        for supply_item in supply_costs:
-            supply_columns = supply_item.find_all('td')
-            item['평형별 공급대상 및 분양가'][ supply_columns[0].text.strip() ]['분양가(최고가 기준)'] = f'{supply_columns[1].text.strip()} 만원'
-            total_cost += int(supply_columns[1].text.strip().replace(',', ''))
-            total_size += int(supply_columns[0].text.strip().split('.', 1)[0])
+    목록 필드(청약접수 종료일 등)로 먼저 거른 뒤, 실제로 꺼내는 항목의 상세 페이지만 조회합니다.
+    batch_size 개씩 묶어 상세 페이지를 동시에 조회하므로, 여러 건을 소비할 때는 batch_size 를 늘립니다.
+    """
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    announcements = iter_announcements(city, page_size=page_size)
+    if open_only:
+        announcements = (apt_info for apt_info in announcements if apt_info['RCEPT_ENDDE'] >= today)
+
+    records = map(build_announcement, announcements)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
 
-        item['단지 평균 평당가'] = f'{int(total_cost / (total_size / 3.3))} 만원'
+        # region    '공급규모 & 공급가 조회'
+        details = fetch_supply_details([record.announcement_url for record in batch])
+        yield from (record._replace(units=tuple(units or ())) for record, units in zip(batch, details))
         # endregion
 
-        ret.append(item)
-    # endregion
 
-    # region    '개발 및 시연을 위해 최상단 1개만 가져옴'
-    if len(ret):
-        return ret[0]
-    else:
-        return {}
+def get_apt_list(city: str) -> dict:
+    """
+    사용자가 요청한 지역의 아파트 분양정보를 조회합니다.
+    """
+
+    # region    '개발 및 시연을 위해 최상단 1개만 가져옴 (상세 페이지도 1건만 조회)'
+    # 청약접수 종료일이 이미 지났으면 가져오지 않도록 open_only=True 로 설정, 단 시연을 위해 생략
+    record = next(iter_apt_list(city), None)
+    return record.to_dict() if record else {}
     # endregion
@@ -1,24 +1,32 @@
 # region    '기본 라이브러리'
 from datetime import datetime, timezone
-import os
+import logging
 from typing import List
 # endregion
 
 # region    'LangChain 라이브러리'
 from langchain_core.messages import HumanMessage
 from langchain_core.pydantic_v1 import BaseModel, Field
-from langchain_openai import OpenAIEmbeddings
-from langchain_elasticsearch import ElasticsearchStore, ElasticsearchRetriever
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 # endregion
 
 # region    'LangGraph 라이브러리'
+from retrieval_graph.context_packing import fuse_hits, pack_chunks
+from retrieval_graph.embedding_cache import embed_queries, embed_query
+from retrieval_graph.es_client import get_es_client
+from retrieval_graph.rank_cache import canonical_keywords, get_decision, index_version, put_decision
+from retrieval_graph.rank_rules import decide, extract_facts
 from retrieval_graph.utils import format_docs
 from retrieval_graph.prompts import RESPONSE_SYSTEM_PROMPT, RANK_PROMPT
 # endregion
 
 
+logger = logging.getLogger(__name__)
+
+
+RANK_INDEX = 'embedding_apply'
+
 
 class SearchRankQuery(BaseModel):
     """
@@ -36,12 +44,11 @@ class Rank(BaseModel):
 
 
 def hybrid_query(search_query: str):
-    embedding_model = OpenAIEmbeddings(
-        model   = 'text-embedding-ada-002',
-        api_key = os.getenv('OPENAI_API_KEY')
-    )
-    query_vector = embedding_model.embed_query(search_query)
+    return hybrid_body(search_query, embed_query(search_query))
+
 
+def hybrid_body(search_query: str, query_vector: List[float]) -> dict:
+    """BM25(text) + kNN(embedding) 하이브리드 검색 요청 본문."""
     return {
         "query": {
             "bool": {
@@ -73,18 +80,41 @@ def retrieve_appropriate_rank(queries: List[str]) -> dict:
     사용자의 개인정보와 관련된 청약순위(특별공급, 1순위, 2순위) 판단 관련문서 검색
     """
 
-    retriever = ElasticsearchRetriever.from_es_params(
-        index_name    = 'embedding_apply',
-        body_func     = hybrid_query,
-        content_field = 'text',
-        url           = os.getenv('ELASTICSEARCH_URL'),
-        api_key       = os.getenv('ELASTICSEARCH_API_KEY'),
-    )
-    docs = []
-    for query in queries:
-        items = retriever.invoke(query)
-        for item in items:
-            docs.append(item.page_content)
+    # region    '키워드만으로 결과가 분명하면 규칙표로 바로 판단 (검색/LLM 생략)'
+    rank = decide(extract_facts(queries))
+    if rank is not None:
+        return Rank(appropriate_rank=rank).json()
+    # endregion
+
+    # region    '같은 키워드 집합 + 같은 정책 색인 버전의 판단 결과 재사용'
+    keywords = canonical_keywords(queries)
+    version  = index_version(RANK_INDEX)
+    if version is not None:
+        cached = get_decision(keywords, version)
+        if cached is not None:
+            return cached
+    # endregion
+
+    # region    '관련문서 검색 (임베딩 1회 + _msearch 1회)'
+    hit_lists = []
+    if queries:
+        es_client = get_es_client()
+        searches = []
+        for query, query_vector in zip(queries, embed_queries(queries)):
+            searches.extend([{'index': RANK_INDEX}, hybrid_body(query, query_vector)])
+        responses = es_client.msearch(searches=searches)['responses']
+
+        for query, response in zip(queries, responses):
+            if 'error' in response:
+                logger.warning('순위 판단 문서 검색 실패: %s (%s)', query, response['error'])
+                continue
+            hit_lists.append(response['hits']['hits'])
+    # endregion
+
+    # region    '중복 제거 + 질의 간 순위 융합(RRF) + 토큰 예산 안에서 상위 청크만 사용'
+    hits           = fuse_hits(hit_lists)
+    retrieved_docs = pack_chunks([hit['_source']['text'] for hit in hits])
+    # endregion
 
     llm = ChatOpenAI(temperature=0, model='gpt-4o-mini').with_structured_output(
         Rank
@@ -106,10 +136,13 @@ def retrieve_appropriate_rank(queries: List[str]) -> dict:
     message_value = prompt.invoke(
         {
             "messages": messages,
-            "retrieved_docs": '\n\n'.join(docs),
+            "retrieved_docs": retrieved_docs,
             "system_time": datetime.now(tz=timezone.utc).isoformat(),
         }
     )
     response = llm.invoke(message_value)
 
-    return response.json()
+    result = response.json()
+    if version is not None:
+        put_decision(keywords, version, result)
+    return result
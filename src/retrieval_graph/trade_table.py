@@ -0,0 +1,193 @@
+"""시군구 × 년월 단위 실거래가 컬럼형 테이블 (메모리 + SQLite 2단계 캐시)."""
+
+# region    '기본 라이브러리'
+import io
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# endregion
+# region    'LangGraph 라이브러리'
+from retrieval_graph.rtms_cache import get_connection, is_final_month, is_fresh
+from retrieval_graph.rtms_parser import Trade
+
+# endregion
+
+
+MEMORY_TABLES = 64  # 메모리에 유지할 (시군구, 년월) 테이블 수
+
+
+@dataclass
+class TradeTable:
+    """시군구 단위 실거래가 컬럼형 테이블.
+
+    읍면동은 umd_names 사전의 인덱스(umd_id)로 저장하여, 읍면동 필터/집계를 벡터 연산으로 처리합니다.
+    """
+
+    umd_names   : List[str]
+    deal_amount : np.ndarray  # int64, 만원
+    exclu_use_ar: np.ndarray  # float64, ㎡
+    umd_id      : np.ndarray  # int32
+    build_year  : np.ndarray  # int16
+    floor       : np.ndarray  # int16
+
+    def __len__(self) -> int:
+        """거래 건수."""
+        return len(self.deal_amount)
+
+    @classmethod
+    def from_trades(cls, trades: Sequence[Trade]) -> 'TradeTable':
+        """거래 목록에서 생성."""
+        umd_index = {}
+        umd_ids   = [umd_index.setdefault(trade.umd_nm, len(umd_index)) for trade in trades]
+        return cls(
+            umd_names    = list(umd_index),
+            deal_amount  = np.fromiter((trade.deal_amount for trade in trades), dtype=np.int64, count=len(trades)),
+            exclu_use_ar = np.fromiter((trade.exclu_use_ar for trade in trades), dtype=np.float64, count=len(trades)),
+            umd_id       = np.asarray(umd_ids, dtype=np.int32),
+            build_year   = np.fromiter((trade.build_year for trade in trades), dtype=np.int16, count=len(trades)),
+            floor        = np.fromiter((trade.floor for trade in trades), dtype=np.int16, count=len(trades)),
+        )
+
+    @classmethod
+    def concat(cls, tables: Sequence['TradeTable']) -> 'TradeTable':
+        """여러 월의 테이블을 하나로 합침 (읍면동 사전은 통합하여 umd_id 재매핑)."""
+        umd_index = {}
+        umd_ids   = []
+        for table in tables:
+            remap = np.asarray([umd_index.setdefault(name, len(umd_index)) for name in table.umd_names], dtype=np.int32)
+            umd_ids.append(remap[table.umd_id] if len(table) else table.umd_id)
+
+        def stack(column: str, dtype) -> np.ndarray:
+            return np.concatenate([getattr(table, column) for table in tables]) if tables else np.empty(0, dtype=dtype)
+
+        return cls(
+            umd_names    = list(umd_index),
+            deal_amount  = stack('deal_amount', np.int64),
+            exclu_use_ar = stack('exclu_use_ar', np.float64),
+            umd_id       = np.concatenate(umd_ids) if umd_ids else np.empty(0, dtype=np.int32),
+            build_year   = stack('build_year', np.int16),
+            floor        = stack('floor', np.int16),
+        )
+
+    def umd_mask(self, umd_nm: str) -> np.ndarray:
+        """특정 읍면동 거래 여부 마스크 (사전에 없으면 전부 False)."""
+        try:
+            return self.umd_id == self.umd_names.index(umd_nm)
+        except ValueError:
+            return np.zeros(len(self), dtype=bool)
+
+    def pyung_price(self) -> np.ndarray:
+        """거래별 평당가(만원), 전용면적이 0인 거래는 NaN."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.exclu_use_ar > 0, self.deal_amount / (self.exclu_use_ar / 3.3), np.nan)
+
+    def to_bytes(self) -> bytes:
+        """npz(압축) 직렬화."""
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            umd_names    = np.asarray(self.umd_names, dtype=str),
+            deal_amount  = self.deal_amount,
+            exclu_use_ar = self.exclu_use_ar,
+            umd_id       = self.umd_id,
+            build_year   = self.build_year,
+            floor        = self.floor,
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'TradeTable':
+        """to_bytes 결과에서 복원."""
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            return cls(
+                umd_names    = arrays['umd_names'].tolist(),
+                deal_amount  = arrays['deal_amount'],
+                exclu_use_ar = arrays['exclu_use_ar'],
+                umd_id       = arrays['umd_id'],
+                build_year   = arrays['build_year'],
+                floor        = arrays['floor'],
+            )
+
+
+# region    '테이블 저장소 (메모리 LRU + SQLite)'
+_memory      = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _ensure_table_schema(conn) -> None:
+    conn.execute(
+        '''
+        CREATE TABLE IF NOT EXISTS rtms_table (
+            lawd_cd    INTEGER NOT NULL,
+            deal_ymd   INTEGER NOT NULL,
+            body       BLOB    NOT NULL,
+            fetched_at REAL    NOT NULL,
+            PRIMARY KEY (lawd_cd, deal_ymd)
+        )
+        '''
+    )
+
+
+def get_cached_table(area_code: int, year_month: int, max_age: Optional[float] = None) -> Optional[TradeTable]:
+    """(시군구, 년월) 테이블 조회. 메모리 → SQLite 순으로 확인하고, 없거나 만료되었으면 None.
+
+    max_age(초)를 지정하면 미확정 월은 TTL 대신 해당 경과시간 기준으로 만료를 판단합니다.
+    """
+    key = (int(area_code), int(year_month))
+    with _memory_lock:
+        entry = _memory.get(key)
+        if entry is not None and _is_usable(year_month, entry[1], max_age):
+            _memory.move_to_end(key)
+            return entry[0]
+
+    conn = get_connection()
+    _ensure_table_schema(conn)
+    row = conn.execute('SELECT body, fetched_at FROM rtms_table WHERE lawd_cd=? AND deal_ymd=?', key).fetchone()
+    if row is None or not _is_usable(year_month, row[1], max_age):
+        return None
+
+    table = TradeTable.from_bytes(row[0])
+    _remember(key, table, row[1])
+    return table
+
+
+def get_table_fetched_at(area_code: int, year_month: int) -> Optional[float]:
+    """저장된 (시군구, 년월) 테이블의 조회 시각, 없으면 None."""
+    conn = get_connection()
+    _ensure_table_schema(conn)
+    row = conn.execute(
+        'SELECT fetched_at FROM rtms_table WHERE lawd_cd=? AND deal_ymd=?', (int(area_code), int(year_month))
+    ).fetchone()
+    return row[0] if row else None
+
+
+def put_cached_table(area_code: int, year_month: int, table: TradeTable, fetched_at: Optional[float] = None) -> None:
+    """테이블 저장 (메모리 + SQLite)."""
+    key        = (int(area_code), int(year_month))
+    fetched_at = time.time() if fetched_at is None else fetched_at
+
+    conn = get_connection()
+    _ensure_table_schema(conn)
+    with conn:
+        conn.execute('INSERT OR REPLACE INTO rtms_table VALUES (?, ?, ?, ?)', (*key, table.to_bytes(), fetched_at))
+    _remember(key, table, fetched_at)
+
+
+def _is_usable(year_month: int, fetched_at: float, max_age: Optional[float]) -> bool:
+    if max_age is None:
+        return is_fresh(year_month, fetched_at)
+    return is_final_month(year_month, fetched_at) or time.time() - fetched_at < max_age
+
+
+def _remember(key, table: TradeTable, fetched_at: float) -> None:
+    with _memory_lock:
+        _memory[key] = (table, fetched_at)
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_TABLES:
+            _memory.popitem(last=False)
+# endregion
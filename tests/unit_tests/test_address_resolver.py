@@ -0,0 +1,11 @@
+from retrieval_graph.address_resolver import resolve_address
+
+
+def test_resolve_address_handles_aliases_and_umd_name() -> None:
+    assert resolve_address("경기도 평택시 진위면 갈곶리 239-60번지 일원") == (41220, "진위면")
+    assert resolve_address("경기 평택시 고덕동") == (41220, "고덕동")
+    assert resolve_address("수원 장안구 정자동") == (41111, "정자동")
+    assert resolve_address("세종 나성동") == (36110, "나성동")
+    assert resolve_address("서울특별시 강남구 테헤란로 1") == (11680, None)
+    # 시/도 없이 여러 곳에 있는 시군구(강서구)는 판단하지 않음
+    assert resolve_address("강서구 화곡동") == (None, None)
@@ -0,0 +1,122 @@
+from retrieval_graph import announcement_store
+from retrieval_graph.records import Announcement, UnitType
+
+
+def record(no: int, sido: str, endde: str, prices: dict) -> Announcement:
+    apt_info = {
+        "HOUSE_MANAGE_NO": str(no), "PBLANC_NO": str(no), "SUBSCRPT_AREA_CODE_NM": sido, "HOUSE_NM": f"단지{no}",
+        "HSSPLY_ADRES": "경기도 평택시 진위면 갈곶리", "RCRIT_PBLANC_DE": "2025-06-05", "RCEPT_BGNDE": "2025-06-16", "RCEPT_ENDDE": endde,
+        "PBLANC_URL": f"https://www.applyhome.co.kr/detail?houseManageNo={no}&pblancNo={no}",
+    }
+    units = [UnitType.from_cells(house_type, "112.5", "10", "5", "15")._replace(price=price) for house_type, price in prices.items()]
+    return Announcement.from_api(apt_info, 41220)._replace(units=tuple(units))
+
+
+def test_find_announcements_filters_by_region_area_and_price(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("RTMS_CACHE_PATH", str(tmp_path / "store.sqlite3"))
+    conn = announcement_store.get_connection()
+    announcement_store._ensure_store_schema(conn)
+    with conn:
+        announcement_store.upsert_announcement(conn, record(1, "경기", "2025-06-18", {"084.9900A": 48000, "059.7537A": 35000}))
+        announcement_store.upsert_announcement(conn, record(2, "경기", "2025-06-18", {"084.9800A": 61000}))
+        announcement_store.upsert_announcement(conn, record(3, "경기", "2025-06-01", {"084.9900A": 40000}))
+        announcement_store.upsert_announcement(conn, record(4, "서울", "2025-06-18", {"084.9900A": 45000}))
+        announcement_store.upsert_announcement(conn, record(5, "경기", "2025-06-20", {}))   # 평형 정보 없음
+        # 같은 주택관리번호는 갱신
+        announcement_store.upsert_announcement(conn, record(1, "경기", "2025-06-18", {"084.9900A": 49000}))
+
+    found = announcement_store.find_announcements(city="경기", max_price=50000, exclusive_area=84, open_on="2025-06-10")
+
+    assert [apt["단지명"] for apt in found] == ["단지1"]
+    assert found[0]["조건에 맞는 주택형"] == ["084.9900A"]
+    assert found[0]["평형별 공급대상 및 분양가"]["084.9900A"]["분양가(최고가 기준)"] == "49,000 만원"
+    # 면적/분양가 조건이 없으면 평형 정보가 없는 공고도 포함
+    assert [apt["단지명"] for apt in announcement_store.find_announcements(city="경기", open_on="2025-06-10")] == ["단지1", "단지2", "단지5"]
+
+
+def test_sync_city_stores_only_changes_and_feeds_deltas(tmp_path, monkeypatch) -> None:
+    from retrieval_graph import announcement_feed
+
+    monkeypatch.setenv("RTMS_CACHE_PATH", str(tmp_path / "store.sqlite3"))
+    listing = {
+        no: {
+            "HOUSE_MANAGE_NO": str(no), "PBLANC_NO": str(no), "SUBSCRPT_AREA_CODE_NM": "경기", "HOUSE_NM": f"단지{no}",
+            "HSSPLY_ADRES": "경기도 평택시 고덕동", "RCRIT_PBLANC_DE": "2999-06-05", "RCEPT_BGNDE": "2999-06-16", "RCEPT_ENDDE": "2999-06-18",
+            "PBLANC_URL": f"https://www.applyhome.co.kr/detail?houseManageNo={no}&pblancNo={no}",
+        }
+        for no in (1, 2)
+    }
+    scraped = []
+    monkeypatch.setattr(announcement_store, "iter_announcements", lambda city, since: iter(list(listing.values())))
+    monkeypatch.setattr(announcement_store, "fetch_supply_details", lambda urls: scraped.extend(urls) or [[] for _ in urls])
+
+    assert announcement_store.sync_city("경기") == 2
+    assert announcement_store.sync_city("경기") == 0
+    assert len(scraped) == 2
+
+    # 1번 변경, 2번 철회, 3번 신규
+    listing[1] = {**listing[1], "RCEPT_ENDDE": "2999-06-20"}
+    listing[3] = {**listing[2], "HOUSE_MANAGE_NO": "3", "PBLANC_NO": "3", "HOUSE_NM": "단지3",
+                  "PBLANC_URL": "https://www.applyhome.co.kr/detail?houseManageNo=3&pblancNo=3"}
+    del listing[2]
+    assert announcement_store.sync_city("경기") == 2
+
+    changes = []
+    assert announcement_feed.consume_changes("test", changes.append) == 5
+    assert [(change["change"], change["pblanc_url"][-1]) for change in changes[2:]] == [
+        ("updated", "1"), ("inserted", "3"), ("withdrawn", "2"),
+    ]
+    assert announcement_feed.consume_changes("test", changes.append) == 0
+    conn = announcement_store.get_connection()
+    assert [no for (no,) in conn.execute("SELECT house_manage_no FROM announcement ORDER BY 1")] == ["1", "3"]
+
+
+def test_sync_city_retries_announcements_whose_detail_fetch_failed(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("RTMS_CACHE_PATH", str(tmp_path / "store.sqlite3"))
+    listing = [
+        {
+            "HOUSE_MANAGE_NO": str(no), "PBLANC_NO": str(no), "SUBSCRPT_AREA_CODE_NM": "경기", "HOUSE_NM": f"단지{no}",
+            "HSSPLY_ADRES": "경기도 평택시 고덕동", "RCRIT_PBLANC_DE": f"2999-06-0{no}", "RCEPT_BGNDE": "2999-06-16", "RCEPT_ENDDE": "2999-06-18",
+            "PBLANC_URL": f"https://www.applyhome.co.kr/detail?houseManageNo={no}&pblancNo={no}",
+        }
+        for no in (1, 2)
+    ]
+    calls = []
+    down  = {"applyhome": True}
+    unit  = UnitType.from_cells("084.9900A", "112.5", "10", "5", "15")._replace(price=48000)
+    monkeypatch.setattr(announcement_store, "iter_announcements", lambda city, since=None: calls.append(since) or iter(listing))
+    # 1번 공고 상세 조회가 일시적으로 실패
+    monkeypatch.setattr(
+        announcement_store, "fetch_supply_details",
+        lambda urls: [None if down["applyhome"] and url.endswith("=1") else [unit] for url in urls],
+    )
+
+    assert announcement_store.sync_city("경기") == 1
+    assert [apt["단지명"] for apt in announcement_store.find_announcements(city="경기", open_on="2999-06-10")] == ["단지2"]
+
+    # 다음 동기화의 조회 범위에 실패한 공고가 포함되고, 해시가 기록되지 않았으므로 다시 조회하여 저장
+    down["applyhome"] = False
+    assert announcement_store.sync_city("경기") == 1
+    assert calls[1] <= "2999-06-01"
+    assert [apt["단지명"] for apt in announcement_store.find_announcements(city="경기", open_on="2999-06-10")] == ["단지1", "단지2"]
+    assert announcement_store.sync_city("경기") == 0
+
+
+def test_search_apt_list_falls_back_to_local_store_when_sync_fails(tmp_path, monkeypatch) -> None:
+    import requests
+
+    monkeypatch.setenv("RTMS_CACHE_PATH", str(tmp_path / "store.sqlite3"))
+    conn = announcement_store.get_connection()
+    announcement_store._ensure_store_schema(conn)
+    with conn:
+        announcement_store.upsert_announcement(conn, record(1, "경기", "2999-06-18", {"084.9900A": 48000}))
+
+    def fail(city):
+        raise requests.ConnectionError("odcloud down")
+
+    monkeypatch.setattr(announcement_store, "sync_if_stale", fail)
+
+    found = announcement_store.search_apt_list(city="경기")
+    assert found["status"] == "success" and found["count"] == 1
+    assert found["sync"]["status"] == "error" and "odcloud down" in found["sync"]["message"]
+    assert announcement_store.search_apt_list(city="서울")["status"] == "error"
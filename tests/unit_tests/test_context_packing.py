@@ -0,0 +1,22 @@
+from retrieval_graph.context_packing import fuse_hits, pack_chunks
+
+
+def hit(doc_id: str, text: str) -> dict:
+    return {"_index": "embedding_apply", "_id": doc_id, "_source": {"text": text}}
+
+
+def test_fuse_hits_dedupes_and_ranks_shared_chunks_first() -> None:
+    newlywed = [hit("a", "신혼부부"), hit("b", "생애최초"), hit("c", "무주택")]
+    homeless = [hit("c", "무주택"), hit("d", "다자녀"), hit("c2", "무주택")]
+
+    fused = fuse_hits([newlywed, homeless])
+
+    assert [h["_source"]["text"] for h in fused] == ["무주택", "신혼부부", "생애최초", "다자녀"]
+
+
+def test_pack_chunks_respects_token_budget(monkeypatch) -> None:
+    from retrieval_graph import context_packing
+
+    monkeypatch.setattr(context_packing, "count_tokens", lambda text, model="": len(text))
+    assert pack_chunks(["aaaa", "bbbbbbbb", "cc"], budget=8) == "aaaa\n\ncc"
+    assert pack_chunks(["aaaa"], budget=3) == ""
@@ -0,0 +1,91 @@
+from retrieval_graph import embedding_cache
+
+
+def test_embed_query_caches_in_memory_and_on_disk(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("RTMS_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    calls = []
+
+    class FakeEmbeddings:
+        def embed_documents(self, texts: list) -> list:
+            calls.append(texts)
+            return [[float(len(text)), 0.5, -1.0] for text in texts]
+
+    monkeypatch.setattr(embedding_cache, "_embedding_model", lambda model: FakeEmbeddings())
+    embedding_cache._lru.clear()
+
+    assert embedding_cache.embed_query("신혼부부") == [4.0, 0.5, -1.0]
+    assert embedding_cache.embed_query("  신혼부부 ") == [4.0, 0.5, -1.0]
+    assert embedding_cache.embed_query("무주택 세대주") == [7.0, 0.5, -1.0]
+    assert calls == [["신혼부부"], ["무주택 세대주"]]
+
+    # 여러 질의는 캐시에 없는 것만 한 번에 요청
+    assert embedding_cache.embed_queries(["다자녀", "신혼부부", "다자녀 ", "청년"]) == [
+        [3.0, 0.5, -1.0], [4.0, 0.5, -1.0], [3.0, 0.5, -1.0], [2.0, 0.5, -1.0],
+    ]
+    assert calls[2:] == [["다자녀", "청년"]]
+
+    # 프로세스 재시작 (LRU 비움) 후에는 벡터 파일에서 읽음
+    embedding_cache._lru.clear()
+    embedding_cache._vectors.clear()
+    assert embedding_cache.embed_query("무주택  세대주") == [7.0, 0.5, -1.0]
+    assert embedding_cache.embed_query("신혼부부") == [4.0, 0.5, -1.0]
+    assert len(calls) == 3
+    embedding_cache._lru.clear()
+
+
+class _LengthEmbeddings:
+    def embed_documents(self, texts: list) -> list:
+        return [[float(len(text)), float(sum(map(ord, text)) % 1000), 1.0] for text in texts]
+
+
+def _embed_in_worker(path: str, worker: int) -> None:
+    import os
+
+    os.environ["RTMS_CACHE_PATH"] = path
+    embedding_cache._embedding_model = lambda model: _LengthEmbeddings()
+    for i in range(200):
+        embedding_cache.embed_query(f"워커{worker} 질의{i}")
+
+
+def test_concurrent_worker_processes_do_not_share_vector_rows(tmp_path, monkeypatch) -> None:
+    import multiprocessing
+
+    path = str(tmp_path / "cache.sqlite3")
+    processes = [multiprocessing.get_context("fork").Process(target=_embed_in_worker, args=(path, worker)) for worker in range(8)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    # 다른 프로세스가 쓴 행도 자기 질의의 벡터로 읽힘
+    monkeypatch.setenv("RTMS_CACHE_PATH", path)
+    monkeypatch.setattr(embedding_cache, "_embedding_model", lambda model: None)
+    embedding_cache._lru.clear()
+    embedding_cache._vectors.clear()
+    texts = [f"워커{worker} 질의{i}" for worker in range(8) for i in range(200)]
+    assert embedding_cache.embed_queries(texts) == _LengthEmbeddings().embed_documents(texts)
+    embedding_cache._lru.clear()
+
+
+def test_module_imports_and_locks_without_fcntl(tmp_path) -> None:
+    import subprocess
+    import sys
+
+    # fcntl 이 없는 환경(Windows)에서는 msvcrt 로 '.lock' 파일을 잠금
+    script = f"""
+import importlib, os, sys, types
+from retrieval_graph import embedding_cache
+sys.modules["fcntl"] = None
+calls = []
+sys.modules["msvcrt"] = types.SimpleNamespace(LK_LOCK=1, LK_UNLCK=0, locking=lambda fd, mode, size: calls.append((mode, size)))
+importlib.reload(embedding_cache)
+del sys.modules["msvcrt"]
+assert embedding_cache.fcntl is None
+os.environ["RTMS_CACHE_PATH"] = {str(tmp_path / "cache.sqlite3")!r}
+embedding_cache._embedding_model = lambda model: type("E", (), {{"embed_documents": lambda self, texts: [[1.0, 2.0] for _ in texts]}})()
+assert embedding_cache.embed_query("무주택") == [1.0, 2.0]
+assert calls == [(1, 1), (0, 1)], calls
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)
+    assert any(path.name.endswith(".f32.lock") for path in tmp_path.iterdir())
@@ -0,0 +1,21 @@
+from retrieval_graph import es_client
+
+
+def test_clients_and_retrievers_are_shared_per_url_and_auth(monkeypatch) -> None:
+    monkeypatch.setenv("ELASTICSEARCH_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("ELASTICSEARCH_API_KEY", "key-a")
+    es_client.close_all()
+
+    def body(query: str) -> dict:
+        return {"query": {"match": {"text": query}}}
+
+    client = es_client.get_es_client()
+    assert es_client.get_es_client() is client
+    assert es_client.get_es_client(api_key="key-b") is not client
+    assert es_client.get_retriever("embedding_apply", body) is es_client.get_retriever("embedding_apply", body)
+    assert es_client.get_retriever("embedding_policy", body) is not es_client.get_retriever("embedding_apply", body)
+
+    # 응답하지 않는 클러스터는 레지스트리에서 제거되어 다음 호출 때 다시 연결
+    assert not es_client.health_check()
+    assert es_client.get_es_client() is not client
+    es_client.close_all()
@@ -0,0 +1,42 @@
+from retrieval_graph import http_client
+
+ERROR_ENVELOPE = (
+    "<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>"
+    "<returnAuthMsg>SERVICETIMEOUT_ERROR</returnAuthMsg><returnReasonCode>05</returnReasonCode>"
+    "</cmmMsgHeader></OpenAPI_ServiceResponse>"
+)
+OK_RESPONSE = "<response><header><resultCode>000</resultCode></header></response>"
+
+
+class FakeResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.status_code = 200
+
+
+class FakeSession:
+    def __init__(self, texts) -> None:
+        self.texts = list(texts)
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(kwargs)
+        return FakeResponse(self.texts.pop(0))
+
+
+def test_transient_error_code() -> None:
+    assert http_client.transient_error_code(ERROR_ENVELOPE) == "05"
+    assert http_client.transient_error_code(OK_RESPONSE) is None
+    assert http_client.transient_error_code("<returnReasonCode>22</returnReasonCode>") is None
+
+
+def test_get_retries_error_envelope(monkeypatch) -> None:
+    session = FakeSession([ERROR_ENVELOPE, OK_RESPONSE])
+    monkeypatch.setattr(http_client, "_session", session)
+    monkeypatch.setattr(http_client.time, "sleep", lambda seconds: None)
+
+    response = http_client.get("http://apis.data.go.kr/1613000/x", retry_error_envelope=True)
+
+    assert response.text == OK_RESPONSE
+    assert len(session.calls) == 2
+    assert session.calls[0]["timeout"] == http_client.HOST_TIMEOUTS["apis.data.go.kr"]
@@ -0,0 +1,124 @@
+from retrieval_graph import tools_api_perplexity
+
+
+def test_stale_results_are_served_while_refreshing_and_kept_on_outage(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("RTMS_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    calls = []
+    outcome = {"result": ({"status": "success", "perplexity_result": "v1", "perplexity_references": []}, False)}
+    monkeypatch.setattr(tools_api_perplexity, "fetch_perplexity", lambda query: calls.append(query) or outcome["result"])
+    monkeypatch.setattr(tools_api_perplexity, "refresh_in_background", lambda key, query: tools_api_perplexity._refresh(key, query))
+
+    assert tools_api_perplexity.query_perplexity_tool("서울 영등포구 신길동 서울대방 신혼희망타운")["perplexity_result"] == "v1"
+    # 공백 차이는 같은 키, 유효시간 안에서는 재호출 없음
+    assert tools_api_perplexity.query_perplexity_tool(" 서울 영등포구  신길동 서울대방 신혼희망타운")["perplexity_result"] == "v1"
+    assert len(calls) == 1
+
+    # 유효시간이 지나면 저장된 결과를 먼저 반환하고 갱신
+    monkeypatch.setenv("PERPLEXITY_CACHE_TTL", "0")
+    outcome["result"] = ({"status": "success", "perplexity_result": "v2", "perplexity_references": []}, False)
+    assert tools_api_perplexity.query_perplexity_tool("서울 영등포구 신길동 서울대방 신혼희망타운")["perplexity_result"] == "v1"
+    assert tools_api_perplexity.query_perplexity_tool("서울 영등포구 신길동 서울대방 신혼희망타운")["perplexity_result"] == "v2"
+
+    # 최대 보관기간이 지나면 다시 조회하되, 5xx/timeout 이면 저장된 결과 사용
+    monkeypatch.setenv("PERPLEXITY_CACHE_MAX_STALE", "0")
+    outcome["result"] = ({"status": "error", "message": "API 요청 실패: 503 - "}, True)
+    assert tools_api_perplexity.query_perplexity_tool("서울 영등포구 신길동 서울대방 신혼희망타운")["perplexity_result"] == "v2"
+    outcome["result"] = ({"status": "error", "message": "API 요청 실패: 401 - "}, False)
+    assert tools_api_perplexity.query_perplexity_tool("서울 영등포구 신길동 서울대방 신혼희망타운")["status"] == "error"
+
+
+def test_stream_tool_forwards_sse_deltas_as_custom_events(tmp_path, monkeypatch) -> None:
+    import io
+    import json
+    from typing import TypedDict
+
+    import requests
+    from langgraph.graph import StateGraph
+
+    monkeypatch.setenv("RTMS_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setenv("PERPLEXITY_API_KEY", "test")
+    chunks = [
+        {"choices": [{"delta": {"content": "부동산 "}}], "citations": ["https://a"]},
+        {"choices": [{"delta": {"content": "가치 평가"}}], "citations": ["https://a", "https://b"]},
+    ]
+
+    class Session:
+        def post(self, url, **kwargs):
+            assert kwargs["json"]["stream"] is True
+            response = requests.Response()
+            response.status_code = 200
+            response.headers["Content-Type"] = "text/event-stream"
+            response.raw = io.BytesIO("".join(f"data: {json.dumps(c)}\n\n" for c in chunks).encode("utf-8") + b"data: [DONE]\n\n")
+            return response
+
+    monkeypatch.setattr(tools_api_perplexity, "get_session", lambda: Session())
+
+    class State(TypedDict):
+        result: dict
+
+    builder = StateGraph(State)
+    builder.add_node("tool", lambda state: {"result": tools_api_perplexity.query_perplexity_stream_tool("신길동 서울대방 신혼희망타운")})
+    builder.add_edge("__start__", "tool")
+    events = list(builder.compile().stream({"result": {}}, stream_mode=["custom", "values"]))
+
+    deltas = [event["delta"] for mode, event in events if mode == "custom" and "delta" in event]
+    result = [event for mode, event in events if mode == "values"][-1]["result"]
+    assert deltas == ["부동산 ", "가치 평가"]
+    assert result["perplexity_result"] == "부동산 가치 평가"
+    assert [ref["url"] for ref in result["perplexity_references"]] == ["https://a", "https://b"]
+    # 캐시된 결과는 그래프 밖에서도 같은 형식으로 반환
+    assert tools_api_perplexity.query_perplexity_stream_tool("신길동 서울대방 신혼희망타운") == result
+
+
+def test_stream_tool_falls_back_or_reports_error_when_stream_breaks(tmp_path, monkeypatch) -> None:
+    import json
+    from typing import TypedDict
+
+    import requests
+    from langgraph.graph import StateGraph
+    from urllib3.exceptions import ProtocolError
+
+    monkeypatch.setenv("RTMS_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setenv("PERPLEXITY_API_KEY", "test")
+    query = "신길동 서울대방 신혼희망타운"
+
+    class Raw:
+        # 첫 조각을 보낸 뒤 연결이 끊기는 스트림 (requests 가 ChunkedEncodingError 로 변환)
+        def stream(self, chunk_size, decode_content=True):
+            yield f"data: {json.dumps({'choices': [{'delta': {'content': '부동산 '}}]})}\n\n".encode("utf-8")
+            raise ProtocolError("Connection broken: IncompleteRead")
+
+        def close(self):
+            pass
+
+    class Session:
+        def post(self, url, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            response.headers["Content-Type"] = "text/event-stream"
+            response.raw = Raw()
+            return response
+
+    monkeypatch.setattr(tools_api_perplexity, "get_session", lambda: Session())
+
+    class State(TypedDict):
+        result: dict
+
+    builder = StateGraph(State)
+    builder.add_node("tool", lambda state: {"result": tools_api_perplexity.query_perplexity_stream_tool(query)})
+    builder.add_edge("__start__", "tool")
+    graph = builder.compile()
+
+    # 저장된 결과가 없으면 전달한 조각 뒤에 오류, 그 다음 done
+    events = [event for mode, event in graph.stream({"result": {}}, stream_mode=["custom"])]
+    assert [next(k for k in ("delta", "error", "done") if k in event) for event in events] == ["delta", "error", "done"]
+    assert events[1]["error"].startswith("요청 오류")
+
+    # 너무 오래된 결과라도 있으면 일시적 장애로 보고 저장된 결과로 교체
+    key = tools_api_perplexity.cache_key(query, tools_api_perplexity.SEARCH_WINDOW_DAYS, tools_api_perplexity.PERPLEXITY_MODEL, tools_api_perplexity.SYSTEM_PROMPT)
+    tools_api_perplexity.put_cached_result(key, {"status": "success", "perplexity_result": "저장된 분석", "perplexity_references": []})
+    monkeypatch.setenv("PERPLEXITY_CACHE_TTL", "0")
+    monkeypatch.setenv("PERPLEXITY_CACHE_MAX_STALE", "0")
+    events = [event for mode, event in graph.stream({"result": {}}, stream_mode=["custom"])]
+    assert [event.get("replace") for event in events if "replace" in event] == ["저장된 분석"]
+    assert not any("error" in event for event in events)
@@ -0,0 +1,50 @@
+from retrieval_graph import announcement_store, profile_matching
+from retrieval_graph.records import Announcement, UnitType
+
+
+def announcement(no: int, endde: str, special: tuple) -> Announcement:
+    apt_info = {
+        "HOUSE_MANAGE_NO": str(no), "PBLANC_NO": str(no), "SUBSCRPT_AREA_CODE_NM": "경기", "HOUSE_NM": f"단지{no}",
+        "HSSPLY_ADRES": "경기도 평택시 고덕동", "RCRIT_PBLANC_DE": "2025-06-05", "RCEPT_BGNDE": "2025-06-16", "RCEPT_ENDDE": endde,
+        "PBLANC_URL": f"https://www.applyhome.co.kr/detail?houseManageNo={no}&pblancNo={no}",
+    }
+    unit = UnitType.from_cells("084.9900A", "112.5", "40", str(sum(special)), str(40 + sum(special)))
+    return Announcement.from_api(apt_info, 41220)._replace(units=(unit._replace(special_breakdown=special),))
+
+
+def test_match_profiles_counts_eligible_units_per_announcement(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("RTMS_CACHE_PATH", str(tmp_path / "store.sqlite3"))
+    conn = announcement_store.get_connection()
+    announcement_store._ensure_store_schema(conn)
+    with conn:
+        #                                                 다자녀 신혼 생애최초 청년 노부모 신생아 기관 이전 기타
+        announcement_store.upsert_announcement(conn, announcement(1, "2025-06-18", (10, 20, 0, 0, 3, 0, 5, 0, 0)))
+        announcement_store.upsert_announcement(conn, announcement(2, "2025-06-18", (0, 0, 15, 0, 0, 0, 0, 0, 0)))
+        announcement_store.upsert_announcement(conn, announcement(3, "2025-06-01", (10, 20, 0, 0, 0, 0, 0, 0, 0)))
+        announcement_store.upsert_announcement(conn, announcement(4, "2025-06-20", ()))   # 특별공급 테이블 없음
+
+    profiles = {
+        "a": ["기혼", "혼인 3년", "무주택", "자녀 2", "세대주", "청약통장 24개월"],
+        "b": ["2주택", "청약통장 6개월"],
+        "c": ["무주택", "세대주"],
+        # 유주택자는 기관추천 대상 키워드가 있어도 일반공급만, 청약통장이 없으면 지원 가능한 공급유형 없음
+        "d": ["2주택", "장애인", "청약통장 24개월"],
+        "e": ["무주택", "자녀 3명", "청약통장 없음"],
+    }
+    # 접수가 끝난 3번 공고는 제외
+    assert profile_matching.match_profiles(profiles, open_on="2025-06-10") == 12
+
+    matches = {(m["profile_id"], m["house_manage_no"]): m for m in profile_matching.read_matches()}
+    assert matches[("a", "1")]["categories"] == ["특별공급 - 다자녀 가구", "특별공급 - 신혼부부", "1순위"]
+    assert matches[("a", "1")]["eligible_units"] == 10 + 20 + 40
+    assert matches[("a", "2")]["eligible_units"] == 40
+    assert matches[("b", "1")]["categories"] == ["2순위"]
+    assert matches[("d", "1")]["categories"] == ["2순위"] and matches[("d", "1")]["undecided"] == []
+    assert matches[("a", "4")]["eligible_units"] == 40
+    assert not any(profile_id == "e" for profile_id, _ in matches)
+    # 키워드만으로 알 수 없는 공급유형은 보류로 남김
+    assert matches[("c", "2")]["categories"] == [] and "특별공급 - 생애최초" in matches[("c", "2")]["undecided"]
+
+    # 다시 매칭하면 해당 프로필의 결과만 교체
+    assert profile_matching.match_profiles({"b": ["미혼"]}, open_on="2025-06-10") == 3
+    assert [m["house_manage_no"] for m in profile_matching.read_matches(profile_id="a")] == ["1", "2", "4"]
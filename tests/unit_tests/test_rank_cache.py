@@ -0,0 +1,19 @@
+from retrieval_graph import rank_cache
+
+
+def test_decisions_are_keyed_by_keyword_set_and_index_version(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("RTMS_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    keywords = rank_cache.canonical_keywords(["기혼", "무주택, 자녀 2", "세대주"])
+
+    assert keywords == rank_cache.canonical_keywords(["세대주 ", "자녀  2", "무주택", "기혼", "기혼"])
+    assert rank_cache.get_decision(keywords, "v1") is None
+
+    rank_cache.put_decision(keywords, "v1", '{"appropriate_rank": "특별공급 - 다자녀 가구"}')
+    assert rank_cache.get_decision(keywords, "v1") == '{"appropriate_rank": "특별공급 - 다자녀 가구"}'
+    # 다시 색인하면(버전 변경) 기존 판단은 조회되지 않고 정리됨
+    assert rank_cache.get_decision(keywords, "v2") is None
+    rank_cache.put_decision(rank_cache.canonical_keywords(["청년"]), "v2", "{}")
+    assert rank_cache.get_decision(keywords, "v1") is None
+
+    monkeypatch.setenv("RANK_DECISION_TTL", "0")
+    assert rank_cache.get_decision(rank_cache.canonical_keywords(["청년"]), "v2") is None
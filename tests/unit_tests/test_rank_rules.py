@@ -0,0 +1,49 @@
+import math
+
+from retrieval_graph.rank_rules import MAYBE, RULES, decide, extract_facts, facts_table
+
+
+def test_clear_profiles_are_decided_and_ambiguous_ones_deferred() -> None:
+    assert decide(extract_facts(["기혼", "무주택", "자녀 2", "세대주", "청약통장 2년"])) == "특별공급 - 다자녀 가구"
+    assert decide(extract_facts(["기혼, 혼인 3년, 무주택, 자녀 없음, 세대주, 청약통장 12개월"])) == "특별공급 - 신혼부부"
+    assert decide(extract_facts(["1주택", "청약통장 3년", "결혼 여부: 미혼"])) == "1순위"
+    # 유주택자는 생애최초 불가, 청약통장 정보가 없으면 순위를 알 수 없음
+    assert decide(extract_facts(["유주택", "생애최초"])) is None
+    # 나이를 모르면 청년 특공 해당 여부가 갈리므로 LLM 판단
+    assert decide(extract_facts(["미혼", "무주택", "세대주"])) is None
+    # 특별공급은 청약통장이 필요: 없거나 가입기간이 짧으면 불가(거짓), 모르면 LLM 판단(모름)
+    many_children = dict(RULES)["특별공급 - 다자녀 가구"]
+    assert many_children(extract_facts(["무주택", "자녀 3명", "청약통장 없음"])) == 0
+    assert many_children(extract_facts(["무주택", "자녀 3명", "청약통장 3개월"])) == 0
+    assert many_children(extract_facts(["무주택", "자녀 3명"])) == MAYBE
+    assert decide(extract_facts(["무주택", "자녀 3명", "청약통장 없음"])) is None
+
+
+def test_vectorized_decisions_match_single_profile() -> None:
+    profiles = [
+        ["기혼", "무주택", "자녀 2", "청약통장 1년"],
+        ["나이: 28세", "미혼", "무주택", "세대원", "자녀 없음", "청약통장 6개월"],
+        ["2주택", "청약통장 24개월", "기혼", "자녀 없음"],
+        ["기혼", "무주택"],
+    ]
+    facts = [extract_facts(profile) for profile in profiles]
+
+    assert decide(facts_table(facts)) == [decide(fact) for fact in facts]
+    assert decide(facts_table(facts)) == ["특별공급 - 다자녀 가구", "특별공급 - 청년", "2순위", None]
+
+
+def test_institution_supply_requires_no_home_and_an_explicit_recommendation() -> None:
+    # 장애인/중소기업/국가유공 언급만으로는 기관추천 대상이 아니며, 유주택자는 기관추천/이전기관 불가
+    assert decide(extract_facts(["2주택", "장애인", "청약통장 24개월"])) == "2순위"
+    assert decide(extract_facts(["유주택", "중소기업 재직", "이전기관 종사자", "청약통장 없음"])) is None
+    for profile in (["2주택", "장애인"], ["유주택", "중소기업 재직"], ["1주택", "국가유공자 자녀"], ["2주택", "기관추천"]):
+        assert decide(extract_facts(profile)) != "특별공급 - 기관추천"
+    # 추천 여부를 명시하지 않으면 '모름'으로 두어 LLM 판단
+    assert math.isnan(extract_facts(["무주택", "장애인"])["institution_recommended"])
+    assert extract_facts(["장애인", "기관추천"])["institution_recommended"] == 1
+
+
+def test_household_count_is_not_read_as_age() -> None:
+    facts = extract_facts(["1세대 1주택", "미혼", "청약통장 3년"])
+    assert math.isnan(facts["age"]) and facts["homes"] == 1
+    assert extract_facts(["만 34세"])["age"] == 34 and extract_facts(["28세 미혼"])["age"] == 28
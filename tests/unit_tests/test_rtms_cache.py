@@ -0,0 +1,41 @@
+import time
+
+from retrieval_graph import rtms_cache
+
+
+def test_page_roundtrip(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("RTMS_CACHE_PATH", str(tmp_path / "rtms.sqlite3"))
+    assert rtms_cache.get_cached_page(11110, 202401, 1, 1000) is None
+
+    rtms_cache.put_cached_page(11110, 202401, 1, 1000, "<response>잠실동</response>")
+    assert rtms_cache.get_cached_page(11110, 202401, 1, 1000) == "<response>잠실동</response>"
+    assert rtms_cache.get_cached_page(11110, 202401, 2, 1000) is None
+
+
+def test_final_month_never_expires(monkeypatch) -> None:
+    monkeypatch.setenv("RTMS_CACHE_TTL", "60")
+    now = time.time()
+
+    # 신고기한이 지난 뒤 조회된 과거 월은 TTL과 무관하게 유효
+    assert rtms_cache.is_fresh(202401, fetched_at=now - 86400, now=now)
+    # 당월 데이터는 TTL이 지나면 만료
+    current = int(time.strftime("%Y%m"))
+    assert rtms_cache.is_fresh(current, fetched_at=now - 30, now=now)
+    assert not rtms_cache.is_fresh(current, fetched_at=now - 120, now=now)
+
+
+def test_ingest_continues_after_network_error(tmp_path, monkeypatch) -> None:
+    import requests
+
+    from retrieval_graph import ingest_trades
+
+    monkeypatch.setenv("RTMS_CACHE_PATH", str(tmp_path / "rtms.sqlite3"))
+
+    def fetch_all_trades(months, area_code):
+        if area_code == 11110:
+            raise requests.exceptions.ConnectionError("Connection reset by peer")
+        return {month: [] for month in months}
+
+    monkeypatch.setattr(ingest_trades, "fetch_all_trades", fetch_all_trades)
+    summary = ingest_trades.ingest(months=2, area_codes=[11110, 11140])
+    assert summary["failed"] == 2 and summary["fetched"] == 2 and not summary["stopped"]
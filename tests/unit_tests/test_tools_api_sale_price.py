@@ -0,0 +1,94 @@
+from collections import OrderedDict
+
+from retrieval_graph import tools_api_sale_price, trade_table
+from retrieval_graph.rtms_parser import Trade, parse_page, pyung_prices
+
+
+def _page(total_count: int, umd_nm: str = "잠실동") -> str:
+    return (
+        "<response><header><resultCode>000</resultCode></header><body><items>"
+        f"<item><buildYear>2008</buildYear><dealAmount>115,000</dealAmount><excluUseAr>84.858</excluUseAr>"
+        f"<floor>-1</floor><umdNm> {umd_nm} </umdNm></item>"
+        "<item><dealAmount>abc</dealAmount><excluUseAr>59.9</excluUseAr><umdNm>잠실동</umdNm></item>"
+        f"</items><numOfRows>1000</numOfRows><pageNo>1</pageNo><totalCount>{total_count}</totalCount></body></response>"
+    )
+
+
+def test_parse_page_single_pass() -> None:
+    total_count, trades = parse_page(_page(2500))
+
+    assert total_count == 2500
+    assert trades == [Trade("잠실동", 115000, 84.858, 2008, -1)]
+    assert pyung_prices(trades, "잠실동") == [115000 / (84.858 / 3.3)]
+    assert pyung_prices(trades, "신천동") == []
+
+
+def test_fetch_all_trades_fans_out_over_months_and_pages(monkeypatch) -> None:
+    totals = {202401: 2500, 202402: 10, 202403: 0}
+    calls = []
+
+    def fake_fetch(year_month, area_code, pageNo=1, numOfRows=1000):
+        calls.append((year_month, pageNo))
+        return _page(totals[year_month])
+
+    monkeypatch.setattr(tools_api_sale_price, "fetch_api_data", fake_fetch)
+    trades = tools_api_sale_price.fetch_all_trades([202401, 202402, 202403], 11710, max_workers=4)
+
+    assert sorted(calls) == [(202401, 1), (202401, 2), (202401, 3), (202402, 1), (202403, 1)]
+    assert [len(trades[ym]) for ym in (202401, 202402, 202403)] == [3, 1, 1]
+
+
+def test_trade_table_serves_every_umd_from_one_fetch(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("RTMS_CACHE_PATH", str(tmp_path / "rtms.sqlite3"))
+    monkeypatch.setattr(trade_table, "_memory", OrderedDict())
+    calls = []
+
+    def fake_fetch_all_trades(months_yyyymm, area_code, max_workers=None):
+        calls.append(tuple(months_yyyymm))
+        return {
+            ym: [Trade("잠실동", 100000, 84.0, 2008, 10), Trade("신천동", 50000, 59.0, 1990, 3), Trade("잠실동", 0, 0.0, 0, 0)]
+            for ym in months_yyyymm
+        }
+
+    monkeypatch.setattr(tools_api_sale_price, "fetch_all_trades", fake_fetch_all_trades)
+    months = [209901, 209902]
+
+    jamsil = tools_api_sale_price.load_pyung_prices(months, 11710, "잠실동")
+    sincheon = tools_api_sale_price.load_pyung_prices(months, 11710, "신천동")
+
+    assert calls == [(209901, 209902)]
+    assert jamsil.tolist() == [100000 / (84.0 / 3.3)] * 2
+    assert sincheon.tolist() == [50000 / (59.0 / 3.3)] * 2
+    assert len(tools_api_sale_price.load_pyung_prices(months, 11710, "가락동")) == 0
+
+
+def test_trade_table_roundtrip() -> None:
+    TradeTable = trade_table.TradeTable
+    table = TradeTable.concat([
+        TradeTable.from_trades([Trade("잠실동", 100000, 84.0, 2008, 10)]),
+        TradeTable.from_trades([Trade("신천동", 50000, 59.0, 1990, -1), Trade("잠실동", 90000, 84.0, 2008, 2)]),
+    ])
+    restored = TradeTable.from_bytes(table.to_bytes())
+
+    assert restored.umd_names == ["잠실동", "신천동"]
+    assert restored.umd_mask("잠실동").tolist() == [True, False, True]
+    assert restored.floor.tolist() == [10, -1, 2]
+
+
+def test_market_stats_buckets() -> None:
+    from retrieval_graph.market_stats import market_stats
+
+    trades = [Trade("잠실동", price, 84.0, 2022, 5) for price in range(100000, 110000, 1000)]
+    trades += [Trade("잠실동", 50000, 59.0, 1990, 3), Trade("잠실동", 900000, 120.0, 0, 40), Trade("잠실동", 150000, 95.0, 2023, 7)]
+    trades += [Trade("신천동", 70000, 84.0, 2000, 1)]
+
+    stats = market_stats(trade_table.TradeTable.from_trades(trades), "잠실동", current_year=2025)
+
+    assert stats["overall"]["count"] == 13
+    assert stats["overall"]["median"] < stats["overall"]["mean"]
+    assert stats["overall"]["trimmed_mean"] < stats["overall"]["mean"]
+    # 95㎡ 는 85~100㎡형 구간
+    assert [stats["by_area"][label]["count"] for label in ("59㎡형", "84㎡형", "85~100㎡형", "100㎡ 초과")] == [1, 10, 1, 1]
+    assert stats["by_build_year"]["5년 이내"]["count"] == 11
+    assert stats["by_build_year"]["20년 초과"]["count"] == 1
+    assert stats["by_build_year"]["6~10년"] == {"count": 0}
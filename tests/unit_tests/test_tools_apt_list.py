@@ -0,0 +1,140 @@
+import threading
+import time
+
+import requests
+
+from retrieval_graph import tools_apt_list
+from retrieval_graph.records import UnitType
+
+
+def test_fetch_supply_details_keeps_order_and_runs_concurrently(monkeypatch) -> None:
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def fake_fetch(url: str) -> list:
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.05 if url.endswith("0") else 0.01)
+        with lock:
+            active["now"] -= 1
+        if url.endswith("3"):
+            raise requests.ConnectionError("boom")
+        return [url]
+
+    monkeypatch.setattr(tools_apt_list, "fetch_supply_detail", fake_fetch)
+    urls = [f"https://www.applyhome.co.kr/detail?pblancNo={i}" for i in range(6)]
+
+    details = tools_apt_list.fetch_supply_details(urls, max_workers=4)
+
+    assert details == [[urls[0]], [urls[1]], [urls[2]], None, [urls[4]], [urls[5]]]
+    assert active["max"] > 1
+
+
+def test_fetch_supply_detail_is_cached_by_announcement(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("RTMS_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    downloads = []
+    parses = []
+
+    def fake_download(url: str) -> str:
+        downloads.append(url)
+        return "<html>상세</html>"
+
+    unit = UnitType("084.9900A", 84.99, 112.1, 10, 5, 15, (1, 2, 2), 52300)
+
+    def fake_parse(html: str) -> list:
+        parses.append(html)
+        return [unit]
+
+    monkeypatch.setattr(tools_apt_list, "download_detail", fake_download)
+    monkeypatch.setattr(tools_apt_list, "parse_unit_types", fake_parse)
+    url = "https://www.applyhome.co.kr/ai/aia/selectAPTLttotPblancDetail.do?houseManageNo=2025000199&pblancNo=2025000199"
+
+    first = tools_apt_list.fetch_supply_detail(url)
+    second = tools_apt_list.fetch_supply_detail(url)
+    assert first == second == [unit]
+    assert len(downloads) == 1 and len(parses) == 1
+
+    # 파서 버전이 바뀌면 네트워크 없이 저장된 HTML을 다시 파싱
+    monkeypatch.setattr(tools_apt_list, "PARSER_VERSION", tools_apt_list.PARSER_VERSION + 1)
+    tools_apt_list.fetch_supply_detail(url)
+    assert len(downloads) == 1 and parses == ["<html>상세</html>"] * 2
+
+
+def test_parse_supply_detail_without_special_supply_table() -> None:
+    from retrieval_graph.applyhome_parser import parse_supply_detail, parse_unit_types
+    from retrieval_graph.records import avg_pyung_price
+
+    html = (
+        "<html><body><script>var x = '<tbody>';</script>"
+        "<table><tbody><tr><td>위치</td></tr></tbody></table>"
+        "<table><tbody><tr><td>일정</td></tr></tbody></table>"
+        "<table><tbody>"
+        "<tr><td>민영</td><td>01</td><td>084.9900A</td><td>112.1</td><td>10</td><td>5</td><td>15</td><td>01</td></tr>"
+        "<tr><td>민영</td><td>02</td><td>059.9800A</td><td>80.2</td><td>-</td><td>3</td><td>3</td><td>02</td></tr>"
+        "<tr><td colspan='6'>※ 공급세대수는 변경될 수 있습니다.</td></tr>"
+        "<tr><td>합계</td><td></td><td></td><td></td><td>10</td><td>5</td><td>15</td><td></td></tr>"
+        "</tbody></table>"
+        "<table><tbody><tr><td>084.9900A</td><td> 52,300 </td></tr><tr><td>059.9800A</td><td>-</td></tr></tbody></table>"
+        "<table><tbody><tr><td>기타</td></tr></tbody></table>"
+        "</body></html>"
+    )
+
+    assert parse_supply_detail(html) == {
+        "084.9900A": {
+            "주택형": "084.9900A",
+            "주택공급면적": "112.1",
+            "전체 공급세대수": "15",
+            "특별 공급세대수": {"전체": "5"},
+            "일반 공급세대수": "10",
+            "분양가(최고가 기준)": "52,300 만원",
+        },
+        "059.9800A": {
+            "주택형": "059.9800A",
+            "주택공급면적": "80.2",
+            "전체 공급세대수": "3",
+            "특별 공급세대수": {"전체": "3"},
+            "일반 공급세대수": "0",
+        },
+    }
+    # 분양가가 '-' 인 평형은 0원이 아니라 평당가 평균에서 제외
+    units = parse_unit_types(html)
+    assert [unit.price for unit in units] == [52300, None]
+    assert avg_pyung_price(units) == avg_pyung_price(units[:1])
+
+
+def test_iter_apt_list_pages_lazily_and_scrapes_only_consumed_items(monkeypatch) -> None:
+    monkeypatch.setenv("DATA_GO_KR_SERVICE_KEY", "test")
+    rows = [
+        {
+            "HOUSE_NM": f"단지{i}", "HSSPLY_ADRES": "경기도 평택시 진위면 갈곶리", "TOT_SUPLY_HSHLDCO": 10,
+            "MDHS_TELNO": "", "RCRIT_PBLANC_DE": "2025-06-05", "RCEPT_ENDDE": "2000-01-01" if i == 0 else "2999-01-01",
+            "PBLANC_URL": f"https://www.applyhome.co.kr/detail?houseManageNo={i}&pblancNo={i}",
+        }
+        for i in range(5)
+    ]
+    pages = []
+
+    class FakeResponse:
+        def __init__(self, payload) -> None:
+            self.payload = payload
+
+        def json(self):
+            return self.payload
+
+    def fake_get(url, **kwargs):
+        page = int(url.split("&page=", 1)[1].split("&", 1)[0])
+        pages.append(page)
+        return FakeResponse({"data": rows[(page - 1) * 2:page * 2], "matchCount": len(rows)})
+
+    scraped = []
+    monkeypatch.setattr(tools_apt_list.http_client, "get", fake_get)
+    monkeypatch.setattr(tools_apt_list, "fetch_supply_details", lambda urls: scraped.extend(urls) or [[] for _ in urls])
+
+    first = next(tools_apt_list.iter_apt_list("경기", open_only=True, page_size=2))
+    assert first.house_nm == "단지1" and first.lawd_cd == 41220
+    assert pages == [1] and scraped == [rows[1]["PBLANC_URL"]]
+
+    names = [record.house_nm for record in tools_apt_list.iter_apt_list("경기", page_size=2, batch_size=3)]
+    assert names == [f"단지{i}" for i in range(5)]
+    assert pages[1:] == [1, 2, 3]